@@ -6,16 +6,60 @@ de le trianguler, puis de renvoyer la représentation binaire des triangles.
 
 from __future__ import annotations
 
-from flask import Flask, request, jsonify, Response
-import urllib.request
-import urllib.error
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from itertools import chain
+from flask import Flask, g, has_request_context, request, jsonify, Response
+from typing import Optional
 import logging
+import time
+import uuid
 
+from triangulator.cache import TriangulationCache, content_key
+from triangulator.client import PointSetManagerClient, PointSetManagerError
+from triangulator.content_encoding import (
+    ENCODINGS,
+    DecompressingReader,
+    UnsupportedEncodingError,
+    compress,
+    iter_compress,
+    negotiate,
+)
+from triangulator.compute import (
+    ComputeExecutor,
+    ComputeTimeoutError,
+    QueueFullError,
+    triangulate_buffers,
+)
+from triangulator.disk_cache import DiskTriangulationCache, iter_mmap
+from triangulator.jobs import DONE, FAILED, JobQueue
+from triangulator.locate import locate_points
+from triangulator.mesh import PointSet
+from triangulator.metrics import CONTENT_TYPE, SIZE_BUCKETS, MetricsRegistry
+from triangulator.profiling import (
+    ProfileStore,
+    default_profile_dir,
+    server_timing_header,
+)
+from triangulator.singleflight import SingleFlight
 from triangulator.serialisation import (
-    binary_to_pointset,
-    triangles_to_binary,
+    TRIANGLE_INDEX_FORMATS,
+    PointSetTooLargeError,
+    binary_to_coords,
+    binary_to_triangle_buffers,
+    frame_header,
+    frame_to_binary,
+    iter_triangle_buffers_binary,
+    locations_to_binary,
+    read_pointset_stream,
+    triangle_buffers_to_binary,
+    triangle_buffers_to_compact_binary,
+    triangles_binary_size,
+    typed_triangle_buffers,
 )
-from triangulator.triangulation import simple_triangulation
+from triangulator.triangulation import METHODS, simple_triangulation
 
 # Logging minimal
 logging.basicConfig(level=logging.INFO)
@@ -23,31 +67,683 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Configuration surchargeable par variables d'environnement
+# (ex. FLASK_TRIANGULATOR_DISK_CACHE_DIR=/var/cache/triangulator).
+app.config.from_prefixed_env()
+
+# PointSetManager : URL, délais (secondes) et nombre de nouvelles tentatives.
+app.config.setdefault("TRIANGULATOR_PSM_URL", "http://localhost:8000")
+app.config.setdefault("TRIANGULATOR_PSM_CONNECT_TIMEOUT", 2.0)
+app.config.setdefault("TRIANGULATOR_PSM_READ_TIMEOUT", 10.0)
+app.config.setdefault("TRIANGULATOR_PSM_RETRIES", 2)
+
+# Limites appliquées aux PointSet envoyés directement en binaire.
+# Elles sont vérifiées sur l'en-tête, avant toute lecture du corps.
+app.config.setdefault("TRIANGULATOR_MAX_POINTS", 10_000_000)
+app.config.setdefault("TRIANGULATOR_MAX_BYTES", 4 + 10_000_000 * 8)
+
+# Pool de processus pour la triangulation : nombre de processus (None :
+# nombre de cœurs, 0 : désactivé), calculs confiés au pool en même temps,
+# délai par calcul (secondes) et taille (en points) en dessous de laquelle
+# le calcul reste dans le thread de la requête.
+app.config.setdefault("TRIANGULATOR_WORKERS", None)
+app.config.setdefault("TRIANGULATOR_MAX_PENDING", 32)
+app.config.setdefault("TRIANGULATOR_COMPUTE_TIMEOUT", 120.0)
+app.config.setdefault("TRIANGULATOR_INLINE_THRESHOLD", 5000)
+
+# Cache des réponses Triangles encodées (budget en octets, TTL en secondes).
+app.config.setdefault("TRIANGULATOR_CACHE_BYTES", 256 * 1024 * 1024)
+app.config.setdefault("TRIANGULATOR_CACHE_TTL", 300.0)
+
+# Cache disque optionnel, partagé entre workers et persistant (None : désactivé).
+app.config.setdefault("TRIANGULATOR_DISK_CACHE_DIR", None)
+app.config.setdefault("TRIANGULATOR_DISK_CACHE_BYTES", 1024 ** 3)
+
+# Traitement par lot : nombre de PointSet traités en même temps et nombre
+# maximal d'identifiants par requête.
+app.config.setdefault("TRIANGULATOR_BATCH_FANOUT", 8)
+app.config.setdefault("TRIANGULATOR_BATCH_MAX_IDS", 1000)
+
+# Travaux asynchrones : threads d'exécution, travaux en attente au plus et
+# durée de conservation d'un résultat (secondes).
+app.config.setdefault("TRIANGULATOR_JOB_WORKERS", 2)
+app.config.setdefault("TRIANGULATOR_JOB_MAX_PENDING", 64)
+app.config.setdefault("TRIANGULATOR_JOB_TTL", 600.0)
+
+# Durée (secondes) pendant laquelle les caches HTTP (CDN, clients) peuvent
+# resservir une réponse de GET /triangulation/<id> sans revalidation.
+app.config.setdefault("TRIANGULATOR_HTTP_MAX_AGE", 300)
+
+# Compression des réponses binaires selon Accept-Encoding (voir
+# triangulator.content_encoding) : taille minimale en octets (None :
+# jamais compressées) et niveau (None : niveau par défaut du codage).
+# Les réponses en flux de taille inconnue sont toujours compressées.
+# Sur des Triangles, le niveau 1 compresse presque autant que le niveau
+# par défaut de zlib, pour un temps cinq fois moindre.
+app.config.setdefault("TRIANGULATOR_COMPRESS_MIN_BYTES", 1024)
+app.config.setdefault("TRIANGULATOR_COMPRESS_LEVEL", 1)
+
+# Mode debug (désactivé par défaut). Une fois activé, une requête portant
+# l'en-tête X-Triangulator-Debug reçoit un en-tête Server-Timing ; avec la
+# valeur "profile", sa triangulation est aussi profilée (cProfile) et le
+# profil conservé dans un répertoire borné (None : répertoire temporaire).
+# Seule une proportion des demandes de profil est honorée (tirage).
+app.config.setdefault("TRIANGULATOR_DEBUG", False)
+app.config.setdefault("TRIANGULATOR_PROFILE_DIR", None)
+app.config.setdefault("TRIANGULATOR_PROFILE_MAX_FILES", 100)
+app.config.setdefault("TRIANGULATOR_PROFILE_SAMPLE_RATE", 1.0)
+
 
 # ---------------------------------------------------------------------------
 #                             CLIENT POINTSETMANAGER
 # ---------------------------------------------------------------------------
 
-class PointSetManagerClient:
+# Client global (connexions keep-alive partagées entre les requêtes)
+pointset_client = PointSetManagerClient(
+    app.config["TRIANGULATOR_PSM_URL"],
+    connect_timeout=app.config["TRIANGULATOR_PSM_CONNECT_TIMEOUT"],
+    read_timeout=app.config["TRIANGULATOR_PSM_READ_TIMEOUT"],
+    max_retries=app.config["TRIANGULATOR_PSM_RETRIES"],
+    max_points=app.config["TRIANGULATOR_MAX_POINTS"],
+    max_bytes=app.config["TRIANGULATOR_MAX_BYTES"],
+)
+
+
+# ---------------------------------------------------------------------------
+#                              POOL DE CALCUL
+# ---------------------------------------------------------------------------
+
+executor = ComputeExecutor(
+    max_workers=app.config["TRIANGULATOR_WORKERS"],
+    max_pending=app.config["TRIANGULATOR_MAX_PENDING"],
+    timeout=app.config["TRIANGULATOR_COMPUTE_TIMEOUT"],
+    inline_threshold=app.config["TRIANGULATOR_INLINE_THRESHOLD"],
+)
+
+
+# ---------------------------------------------------------------------------
+#                                   CACHES
+# ---------------------------------------------------------------------------
+
+# Cache mémoire des résultats : clé ("id", pointset_id, méthode) pour le cas
+# JSON, ("body", empreinte du PointSet, méthode) pour le cas binaire.
+result_cache = TriangulationCache(
+    max_bytes=app.config["TRIANGULATOR_CACHE_BYTES"],
+    ttl=app.config["TRIANGULATOR_CACHE_TTL"],
+)
+
+# Cache disque : clé "<méthode>-<empreinte du PointSet>" dans les deux cas.
+disk_cache = None
+if app.config["TRIANGULATOR_DISK_CACHE_DIR"]:
+    disk_cache = DiskTriangulationCache(
+        app.config["TRIANGULATOR_DISK_CACHE_DIR"],
+        max_bytes=app.config["TRIANGULATOR_DISK_CACHE_BYTES"],
+    )
+
+
+# Regroupement des requêtes concurrentes portant sur la même clé de cache
+inflight = SingleFlight()
+
+
+# ---------------------------------------------------------------------------
+#                            TRAVAUX ASYNCHRONES
+# ---------------------------------------------------------------------------
+
+jobs = JobQueue(
+    workers=app.config["TRIANGULATOR_JOB_WORKERS"],
+    max_pending=app.config["TRIANGULATOR_JOB_MAX_PENDING"],
+    ttl=app.config["TRIANGULATOR_JOB_TTL"],
+)
+
+
+# ---------------------------------------------------------------------------
+#                              MODE DEBUG
+# ---------------------------------------------------------------------------
+
+DEBUG_HEADER = "X-Triangulator-Debug"
+
+profile_store = ProfileStore(
+    app.config["TRIANGULATOR_PROFILE_DIR"] or default_profile_dir(),
+    max_files=app.config["TRIANGULATOR_PROFILE_MAX_FILES"],
+    sample_rate=app.config["TRIANGULATOR_PROFILE_SAMPLE_RATE"],
+)
+
+
+def _profilage() -> bool:
+    """True si la requête en cours demande un profil de sa triangulation."""
+    return has_request_context() and g.get("profiler", False)
+
+
+# ---------------------------------------------------------------------------
+#                                 MÉTRIQUES
+# ---------------------------------------------------------------------------
+
+# Exposées au format Prometheus sur GET /metrics. Les étapes du pipeline
+# portent le nom de la fonction mesurée ; l'encodage en flux des grosses
+# réponses a lieu pendant l'envoi et n'est pas compté dans
+# "triangles_to_binary".
+metrics = MetricsRegistry()
+
+stage_seconds = metrics.histogram(
+    "triangulator_stage_seconds",
+    "Durée de chaque étape du pipeline de triangulation (secondes).",
+    ("stage",),
+)
+request_seconds = metrics.histogram(
+    "triangulator_request_seconds",
+    "Durée de traitement des requêtes HTTP, jusqu'au début de la réponse.",
+    ("endpoint",),
+)
+requests_total = metrics.counter(
+    "triangulator_requests_total",
+    "Requêtes HTTP traitées, par route et code de statut.",
+    ("endpoint", "status"),
+)
+errors_total = metrics.counter(
+    "triangulator_errors_total",
+    "Échecs du pipeline, par branche d'erreur.",
+    ("branch",),
+)
+input_points = metrics.histogram(
+    "triangulator_input_points",
+    "Nombre de points des PointSet décodés.",
+    buckets=SIZE_BUCKETS,
+)
+input_bytes = metrics.histogram(
+    "triangulator_input_bytes",
+    "Taille des PointSet binaires reçus (PSM ou corps de requête), en octets.",
+    buckets=SIZE_BUCKETS,
+)
+output_triangles = metrics.histogram(
+    "triangulator_output_triangles",
+    "Nombre de triangles calculés.",
+    buckets=SIZE_BUCKETS,
+)
+output_bytes = metrics.histogram(
+    "triangulator_output_bytes",
+    "Taille des réponses Triangles calculées, en octets.",
+    buckets=SIZE_BUCKETS,
+)
+requests_in_flight = metrics.gauge(
+    "triangulator_requests_in_flight",
+    "Requêtes HTTP en cours de traitement, par route.",
+    ("endpoint",),
+)
+metrics.gauge(
+    "triangulator_triangulations_in_flight",
+    "Triangulations en cours (une par clé de cache, requêtes regroupées).",
+    fonction=inflight.in_flight,
+)
+metrics.gauge(
+    "triangulator_compute_pending",
+    "Calculs confiés au pool de processus et non terminés.",
+    fonction=lambda: executor.stats()["pending"],
+)
+metrics.gauge(
+    "triangulator_jobs_pending",
+    "Travaux asynchrones en attente d'exécution.",
+    fonction=lambda: jobs.stats()["pending"],
+)
+metrics.gauge(
+    "triangulator_cache_bytes",
+    "Octets occupés par le cache mémoire des résultats.",
+    fonction=lambda: result_cache.stats()["bytes"],
+)
+
+
+@contextmanager
+def _etape(nom: str):
+    """
+    Mesure une étape du pipeline : histogramme des étapes et, en mode
+    debug, en-tête Server-Timing de la requête en cours.
+    """
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        duree = time.perf_counter() - debut
+        stage_seconds.observe(duree, (nom,))
+        if has_request_context() and g.get("server_timing") is not None:
+            g.server_timing.append((nom, duree))
+
+
+@app.before_request
+def _debut_mesure():
+    g.debut_requete = time.perf_counter()
+    g.route = request.endpoint or "unknown"
+    requests_in_flight.inc((g.route,))
+
+    debug = request.headers.get(DEBUG_HEADER, "").lower()
+    if debug and app.config["TRIANGULATOR_DEBUG"]:
+        g.server_timing = []
+        g.profiler = "profile" in debug and profile_store.sampled()
+
+
+@app.after_request
+def _fin_mesure(reponse):
+    route = g.get("route", "unknown")
+    requests_total.inc((route, str(reponse.status_code)))
+    if "debut_requete" in g:
+        duree = time.perf_counter() - g.debut_requete
+        request_seconds.observe(duree, (route,))
+
+        if g.get("server_timing") is not None:
+            reponse.headers["Server-Timing"] = server_timing_header(
+                g.server_timing + [("total", duree)]
+            )
+            if g.get("profil"):
+                reponse.headers["X-Profile"] = g.profil
+    return reponse
+
+
+@app.teardown_request
+def _fin_requete(_):
+    if "route" in g:
+        requests_in_flight.dec((g.route,))
+
+
+# ---------------------------------------------------------------------------
+#                         PIPELINE DE TRIANGULATION
+# ---------------------------------------------------------------------------
+
+class RequestError(Exception):
+    """Erreur à renvoyer au client sous forme JSON avec un code HTTP."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _echec(branche: str, status: int, message: str) -> RequestError:
+    """Compte un échec du pipeline et retourne l'erreur à lever."""
+    errors_total.inc((branche,))
+    return RequestError(status, message)
+
+
+class TriangulationResult:
+    """
+    Résultat partageable entre requêtes regroupées. Selon sa taille, il est
+    soit déjà encodé (`data`), soit sur le cache disque (`cle_disque`),
+    soit à encoder en flux depuis les tampons (`coords`, `indices`).
+    """
+
+    def __init__(self, cache_status: str, data=None, cle_disque=None,
+                 coords=None, indices=None):
+        self.cache_status = cache_status
+        self.data = data
+        self.cle_disque = cle_disque
+        self.coords = coords
+        self.indices = indices
+
+
+def _fetch_coords(pointset_id: str):
+    """Récupère et décode un PointSet auprès du PointSetManager."""
+    try:
+        with _etape("fetch_pointset"):
+            data = pointset_client.fetch_pointset(pointset_id)
+    except PointSetManagerError as e:
+        if e.status == 404:
+            raise _echec("psm_not_found", 404, "PointSet introuvable")
+        if isinstance(e.__cause__, PointSetTooLargeError):
+            raise _echec("psm_too_large", 413, "PointSet trop volumineux")
+        raise _echec("psm_error", 503, "Erreur PSM")
+    except Exception:
+        raise _echec("psm_unavailable", 503, "Erreur PSM")
+
+    try:
+        with _etape("binary_to_pointset"):
+            coords = binary_to_coords(data)
+    except Exception:
+        raise _echec("pointset_decode", 400, "Erreur conversion pointset")
+
+    input_bytes.observe(len(data))
+    input_points.observe(len(coords) // 2)
+    return coords
+
+
+def _compute(cle, coords, method: str) -> TriangulationResult:
+    """
+    Triangule un PointSet décodé, en passant par le cache disque, et
+    mémorise le résultat encodé.
+    """
+    # Cache disque (clé : contenu du PointSet), sauf profil demandé
+    cle_disque = f"{method}-{content_key(coords)}"
+    profiler = _profilage()
+    if disk_cache is not None and not profiler:
+        contenu = disk_cache.get(cle_disque)
+        if contenu is not None:
+            if not result_cache.accepts(len(contenu)):
+                contenu.close()
+                return TriangulationResult("HIT-DISK", cle_disque=cle_disque)
+            binary_output = contenu[:]
+            contenu.close()
+            result_cache.put(cle, binary_output)
+            return TriangulationResult("HIT-DISK", data=binary_output)
+
+    try:
+        with _etape("simple_triangulation"):
+            if profiler:
+                indices = _profile_triangulation(cle_disque, coords, method)
+            else:
+                indices = triangulate_buffers(
+                    executor, coords, method, fonction=simple_triangulation
+                )
+    except QueueFullError:
+        raise _echec("compute_queue_full", 503, "File de calcul pleine")
+    except ComputeTimeoutError:
+        raise _echec("compute_timeout", 504, "Délai de triangulation dépassé")
+    except BrokenProcessPool:
+        # Processus de calcul arrêté (ex. mémoire) : pool remplacé, la
+        # requête peut être renvoyée
+        raise _echec("compute_worker_lost", 503,
+                     "Processus de calcul interrompu")
+    except OverflowError:
+        # Indices négatifs ou hors uint32 renvoyés par le moteur
+        raise _echec("triangles_encode", 500, "Erreur conversion triangles")
+    except Exception:
+        raise _echec("triangulation", 500, "Erreur triangulation")
+
+    # Réponse assez petite pour le cache : encodée d'un bloc et mémorisée.
+    taille = triangles_binary_size(len(coords) // 2, len(indices) // 3)
+    output_triangles.observe(len(indices) // 3)
+    output_bytes.observe(taille)
+    if result_cache.accepts(taille):
+        with _etape("triangles_to_binary"):
+            binary_output = triangle_buffers_to_binary(coords, indices)
+        result_cache.put(cle, binary_output)
+        if disk_cache is not None:
+            disk_cache.put(cle_disque, binary_output)
+        return TriangulationResult("MISS", data=binary_output)
+
+    # Sinon, le flux est écrit sur le cache disque puis relu par mmap, ou
+    # encodé en flux au moment de la réponse.
+    if disk_cache is not None and disk_cache.put(
+        cle_disque, iter_triangle_buffers_binary(coords, indices)
+    ):
+        return TriangulationResult("MISS", cle_disque=cle_disque)
+
+    return TriangulationResult("MISS", coords=coords, indices=indices)
+
+
+def _profile_triangulation(cle_disque: str, coords, method: str):
+    """
+    Triangulation profilée, dans le thread de la requête (cProfile ne
+    suit pas le pool de processus) ; le nom du profil, qui contient
+    l'empreinte du PointSet, est renvoyé dans l'en-tête X-Profile.
+    """
+    triangles, g.profil = profile_store.profile(
+        cle_disque, simple_triangulation, PointSet(coords), method
+    )
+    return array("I", chain.from_iterable(triangles))
+
+
+def _result_blocks(resultat: TriangulationResult):
+    """Charge utile Triangles d'un résultat : (taille, itérable de blocs)."""
+    if resultat.data is not None:
+        return len(resultat.data), [resultat.data]
+
+    if resultat.cle_disque is not None and disk_cache is not None:
+        contenu = disk_cache.get(resultat.cle_disque)
+        if contenu is None:
+            raise _echec("disk_cache", 500, "Erreur cache disque")
+        return len(contenu), iter_mmap(contenu)
+
+    # La réponse n'est jamais entièrement en mémoire. Les tampons sont
+    # vérifiés avant l'envoi : une erreur d'encodage en cours de flux
+    # tronquerait la réponse sous un statut 200 et un Content-Length complet.
+    try:
+        coords, indices = typed_triangle_buffers(
+            resultat.coords, resultat.indices
+        )
+    except ValueError:
+        raise _echec("triangles_encode", 500, "Erreur conversion triangles")
+    taille = triangles_binary_size(len(coords) // 2, len(indices) // 3)
+    return taille, iter_triangle_buffers_binary(coords, indices)
+
+
+def _result_buffers(resultat: TriangulationResult):
+    """Tampons (coordonnées, indices) d'un résultat, où qu'il soit stocké."""
+    if resultat.coords is not None:
+        return resultat.coords, resultat.indices
+
+    data = resultat.data
+    if data is None:
+        contenu = disk_cache.get(resultat.cle_disque) if disk_cache else None
+        if contenu is None:
+            raise _echec("disk_cache", 500, "Erreur cache disque")
+        data = contenu[:]
+        contenu.close()
+    return binary_to_triangle_buffers(data)
+
+
+def _indices_format(nb_points: Optional[int] = None) -> str:
+    """
+    Format de la liste des triangles demandé par le paramètre `indices` du
+    type application/octet-stream de l'en-tête Accept (ex.
+    "application/octet-stream; indices=strip", voir les variantes
+    compactes de `serialisation`). Format par défaut ("uint32") si aucune
+    variante connue n'est demandée, ou si "uint16" ne convient pas à
+    `nb_points` points.
+    """
+    for element in request.headers.get("Accept", "").split(","):
+        media, *parametres = element.split(";")
+        if media.strip().lower() not in ("application/octet-stream",
+                                         "application/*", "*/*"):
+            continue
+        for parametre in parametres:
+            cle, _, valeur = parametre.partition("=")
+            valeur = valeur.strip().strip('"').lower()
+            if cle.strip().lower() != "indices" \
+                    or valeur not in TRIANGLE_INDEX_FORMATS:
+                continue
+            if valeur == "uint16" and (nb_points or 0) >= 0x10000:
+                return "uint32"
+            return valeur
+    return "uint32"
+
+
+def _triangles_response(resultat: TriangulationResult) -> Response:
+    """
+    Construit la réponse HTTP d'un résultat (complète ou en flux), au
+    format Triangles demandé par l'en-tête Accept.
+    """
+    indices_format = _indices_format()
+    if indices_format != "uint32":
+        coords, indices = _result_buffers(resultat)
+        indices_format = _indices_format(len(coords) // 2)
+
+    if indices_format != "uint32":
+        # Variante compacte : encodée d'un bloc depuis les tampons
+        with _etape("triangles_to_binary"):
+            data = triangle_buffers_to_compact_binary(
+                coords, indices, indices_format
+            )
+        reponse = Response(
+            data,
+            content_type=f"application/octet-stream; indices={indices_format}",
+            headers={"X-Cache": resultat.cache_status},
+        )
+    elif resultat.data is not None:
+        reponse = Response(
+            resultat.data,
+            mimetype="application/octet-stream",
+            headers={"X-Cache": resultat.cache_status},
+        )
+    else:
+        taille, blocs = _result_blocks(resultat)
+        reponse = _streamed_response(blocs, taille, resultat.cache_status)
+
+    reponse.vary.add("Accept")
+    return reponse
+
+
+def _triangulate_id(pointset_id, method: str) -> TriangulationResult:
     """
-    Client minimaliste du PointSetManager.
-    Implémenté UNIQUEMENT avec la bibliothèque standard (urllib).
+    Résultat d'un PointSet du PSM (lots et travaux asynchrones) : cache
+    mémoire, puis récupération et triangulation (une seule par clé).
     """
+    cle = ("id", str(pointset_id), method)
+    if _profilage():
+        return _compute(cle, _fetch_coords(pointset_id), method)
+
+    cached = result_cache.get(cle)
+    if cached is not None:
+        return TriangulationResult("HIT", data=cached)
+
+    resultat, _ = inflight.do(
+        cle, lambda: _compute(cle, _fetch_coords(pointset_id), method)
+    )
+    return resultat
+
+
+def _triangulate_coords(coords, method: str) -> TriangulationResult:
+    """Résultat d'un PointSet décodé : cache mémoire, puis triangulation."""
+    cle = ("body", content_key(coords), method)
+    if _profilage():
+        return _compute(cle, coords, method)
+
+    cached = result_cache.get(cle)
+    if cached is not None:
+        return TriangulationResult("HIT", data=cached)
+
+    resultat, _ = inflight.do(cle, lambda: _compute(cle, coords, method))
+    return resultat
+
+
+def _job_error(job) -> RequestError:
+    """Erreur d'un travail échoué, telle que renvoyée au client."""
+    if isinstance(job.erreur, RequestError):
+        return job.erreur
+    return RequestError(500, "Erreur triangulation")
+
+
+def _batch_frames(pointset_ids, method: str, fanout: int):
+    """
+    Trames du traitement par lot, dans l'ordre de fin des triangulations.
+
+    Au plus `fanout` PointSet sont récupérés et triangulés en même temps ;
+    les calculs coûteux passent par le pool de processus comme pour
+    /triangulate. Une erreur ne concerne que la trame de son identifiant.
+    """
+    pool = ThreadPoolExecutor(max_workers=fanout)
+    try:
+        futurs = {
+            pool.submit(_triangulate_id, pointset_id, method): pointset_id
+            for pointset_id in pointset_ids
+        }
+        for futur in as_completed(futurs):
+            pointset_id = str(futurs[futur])
+            try:
+                taille, blocs = _result_blocks(futur.result())
+            except RequestError as e:
+                yield frame_to_binary(
+                    pointset_id, e.status, e.message.encode("utf-8")
+                )
+                continue
+            except Exception:
+                logger.exception("Erreur du lot pour %s", pointset_id)
+                errors_total.inc(("batch",))
+                yield frame_to_binary(
+                    pointset_id, 500, "Erreur triangulation".encode("utf-8")
+                )
+                continue
 
-    def __init__(self, base_url: str = "http://localhost:8000"):
-        self.base_url = base_url.rstrip("/")
+            yield frame_header(pointset_id, 200, taille)
+            yield from blocs
+    finally:
+        # Client parti en cours de flux : on n'entame pas la suite du lot
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    def fetch_pointset(self, pointset_id: str) -> bytes:
-        url = f"{self.base_url}/pointset/{pointset_id}"
+
+def _streamed_response(blocs, taille: int, cache_status: str) -> Response:
+    """Réponse Triangles envoyée bloc par bloc."""
+    return Response(
+        blocs,
+        mimetype="application/octet-stream",
+        headers={"Content-Length": str(taille), "X-Cache": cache_status},
+    )
+
+
+def _read_body_coords():
+    """Lit en flux le PointSet binaire envoyé dans le corps de la requête."""
+    # Corps vide : ni Content-Length, ni envoi par morceaux.
+    chunked = "chunked" in request.headers.get("Transfer-Encoding", "")
+    if not request.content_length and not chunked:
+        raise _echec("body_empty", 400, "Aucune donnée fournie")
+
+    max_bytes = app.config["TRIANGULATOR_MAX_BYTES"]
+    if max_bytes is not None and (request.content_length or 0) > max_bytes:
+        raise _echec("body_too_large", 413, "PointSet trop volumineux")
+
+    # Corps compressé : décompressé au fil de la lecture, sous les mêmes
+    # limites que le binaire brut
+    flux = request.stream
+    encoding = request.headers.get("Content-Encoding", "").strip().lower()
+    if encoding and encoding != "identity":
         try:
-            with urllib.request.urlopen(url) as response:
-                return response.read()
-        except Exception as e:
-            raise RuntimeError("Erreur PSM") from e
+            flux = DecompressingReader(flux, encoding)
+        except UnsupportedEncodingError:
+            raise _echec("body_encoding", 415,
+                         "Content-Encoding non pris en charge")
 
+    # Lecture en flux : l'en-tête est validé avant de bufferiser le corps
+    try:
+        with _etape("binary_to_pointset"):
+            coords = read_pointset_stream(
+                flux,
+                max_points=app.config["TRIANGULATOR_MAX_POINTS"],
+                max_bytes=max_bytes,
+            )
+    except PointSetTooLargeError:
+        raise _echec("body_too_large", 413, "PointSet trop volumineux")
+    except Exception:
+        raise _echec("pointset_decode", 400, "Erreur conversion pointset")
 
-# Client global
-pointset_client = PointSetManagerClient()
+    # 4 octets d'en-tête, puis 8 octets par point
+    input_bytes.observe(4 + len(coords) * 4)
+    input_points.observe(len(coords) // 2)
+    return coords
+
+
+# ---------------------------------------------------------------------------
+#                          COMPRESSION DES RÉPONSES
+# ---------------------------------------------------------------------------
+
+@app.after_request
+def _compresser_reponse(reponse):
+    """
+    Compresse les réponses binaires (Triangles, trames, localisations)
+    selon l'en-tête Accept-Encoding, au-delà d'une taille minimale. Une
+    réponse en flux est compressée bloc par bloc, sans Content-Length.
+    """
+    min_bytes = app.config["TRIANGULATOR_COMPRESS_MIN_BYTES"]
+    if (min_bytes is None or reponse.status_code != 200
+            or reponse.mimetype != "application/octet-stream"
+            or "Content-Encoding" in reponse.headers):
+        return reponse
+
+    reponse.vary.add("Accept-Encoding")
+    taille = reponse.content_length
+    if taille is not None and taille < min_bytes:
+        return reponse
+    encoding = negotiate(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return reponse
+
+    niveau = app.config["TRIANGULATOR_COMPRESS_LEVEL"]
+    if reponse.is_sequence:
+        reponse.set_data(compress(reponse.get_data(), encoding, niveau))
+    else:
+        reponse.response = iter_compress(reponse.response, encoding, niveau)
+        reponse.headers.pop("Content-Length", None)
+    reponse.headers["Content-Encoding"] = encoding
+
+    # Un ETag fort désigne une représentation : il change avec le codage
+    etag, faible = reponse.get_etag()
+    if etag and not faible:
+        reponse.set_etag(f"{etag}-{encoding}")
+    return reponse
 
 
 # ---------------------------------------------------------------------------
@@ -59,8 +755,36 @@ def health():
     return jsonify({"status": "ok"}), 200
 
 
+@app.get("/psm/stats")
+def psm_stats():
+    return jsonify(pointset_client.pool_stats()), 200
+
+
+@app.get("/compute/stats")
+def compute_stats():
+    return jsonify(executor.stats()), 200
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Métriques du service au format texte de Prometheus."""
+    return Response(metrics.render(), content_type=CONTENT_TYPE), 200
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    stats = result_cache.stats()
+    if disk_cache is not None:
+        stats["disk"] = disk_cache.stats()
+    return jsonify(stats), 200
+
+
 @app.post("/triangulate")
 def triangulate():
+    # Moteur de triangulation : paramètre de requête `method`,
+    # éventuellement surchargé par le champ "method" du corps JSON.
+    method = request.args.get("method", "ear_clipping")
+
     # ------------------------------------------------------------------
     # CAS JSON
     # ------------------------------------------------------------------
@@ -73,47 +797,321 @@ def triangulate():
         if "pointset_id" not in payload:
             return jsonify({"error": "pointset_id manquant"}), 400
 
-        try:
-            data = pointset_client.fetch_pointset(payload["pointset_id"])
-        except Exception:
-            return jsonify({"error": "Erreur PSM"}), 503
+        method = payload.get("method", method)
+        if method not in METHODS:
+            return jsonify({"error": "Méthode de triangulation inconnue"}), 400
 
-        try:
-            points = binary_to_pointset(data)
-        except Exception:
-            return jsonify({"error": "Erreur conversion pointset"}), 400
+        pointset_id = payload["pointset_id"]
+        cle = ("id", str(pointset_id), method)
+
+        def travail():
+            return _compute(cle, _fetch_coords(pointset_id), method)
 
     # ------------------------------------------------------------------
     # CAS BINAIRE DIRECT
     # ------------------------------------------------------------------
     else:
-        data = request.get_data()
-
-        if not data:
-            return jsonify({"error": "Aucune donnée fournie"}), 400
+        if method not in METHODS:
+            return jsonify({"error": "Méthode de triangulation inconnue"}), 400
 
         try:
-            points = binary_to_pointset(data)
-        except Exception:
-            return jsonify({"error": "Erreur conversion pointset"}), 400
+            coords = _read_body_coords()
+        except RequestError as e:
+            return jsonify({"error": e.message}), e.status
+
+        cle = ("body", content_key(coords), method)
+
+        def travail():
+            return _compute(cle, coords, method)
 
     # ------------------------------------------------------------------
-    # TRIANGULATION
+    # CACHE, PUIS TRIANGULATION (une seule par clé à la fois) ; un profil
+    # demandé impose un nouveau calcul, propre à la requête
     # ------------------------------------------------------------------
+    profiler = _profilage()
+    cached = None if profiler else result_cache.get(cle)
+    if cached is not None:
+        return _triangles_response(TriangulationResult("HIT", data=cached)), 200
+
     try:
-        triangles = simple_triangulation(points)
-    except Exception:
-        return jsonify({"error": "Erreur triangulation"}), 500
+        if profiler:
+            resultat, partage = travail(), False
+        else:
+            resultat, partage = inflight.do(cle, travail)
+        reponse = _triangles_response(resultat)
+    except RequestError as e:
+        return jsonify({"error": e.message}), e.status
+
+    if partage:
+        reponse.headers["X-Coalesced"] = "1"
+    return reponse, 200
+
+
+@app.post("/triangulate/batch")
+def triangulate_batch():
+    """
+    Triangule plusieurs PointSet du PSM en une requête.
+
+    Corps JSON : {"pointset_ids": [...], "method": "..."} (méthode
+    optionnelle, comme pour /triangulate). La réponse est une suite de
+    trames (voir `serialisation.frame_to_binary`), une par identifiant,
+    envoyées au fil des résultats : statut 200 et Triangles, ou code
+    d'erreur et message UTF-8.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Aucune donnée fournie"}), 400
+
+    pointset_ids = payload.get("pointset_ids")
+    if not isinstance(pointset_ids, list) or not pointset_ids:
+        return jsonify({"error": "pointset_ids manquant"}), 400
+
+    if len(pointset_ids) > app.config["TRIANGULATOR_BATCH_MAX_IDS"]:
+        return jsonify({"error": "Trop de pointset_ids"}), 413
+
+    method = payload.get("method", request.args.get("method", "ear_clipping"))
+    if method not in METHODS:
+        return jsonify({"error": "Méthode de triangulation inconnue"}), 400
+
+    # Doublons : une seule trame par identifiant
+    pointset_ids = list(dict.fromkeys(str(i) for i in pointset_ids))
+
+    return Response(
+        _batch_frames(
+            pointset_ids, method, app.config["TRIANGULATOR_BATCH_FANOUT"]
+        ),
+        mimetype="application/octet-stream",
+    )
+
+
+@app.post("/jobs")
+def submit_job():
+    """
+    Soumet une triangulation asynchrone et répond immédiatement 202.
+
+    Mêmes entrées que /triangulate (JSON avec pointset_id, ou PointSet
+    binaire). Les PointSet envoyés en binaire sont ordonnancés selon leur
+    nombre de points ; ceux du PSM, de taille inconnue avant
+    récupération, passent en premier.
+    """
+    method = request.args.get("method", "ear_clipping")
+
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        if payload is None:
+            return jsonify({"error": "Aucune donnée fournie"}), 400
+        if "pointset_id" not in payload:
+            return jsonify({"error": "pointset_id manquant"}), 400
+
+        method = payload.get("method", method)
+        if method not in METHODS:
+            return jsonify({"error": "Méthode de triangulation inconnue"}), 400
+
+        pointset_id = payload["pointset_id"]
+        cout = 0
+
+        def travail():
+            return _triangulate_id(pointset_id, method)
+    else:
+        if method not in METHODS:
+            return jsonify({"error": "Méthode de triangulation inconnue"}), 400
+
+        try:
+            coords = _read_body_coords()
+        except RequestError as e:
+            return jsonify({"error": e.message}), e.status
+        cout = len(coords) // 2
+
+        def travail():
+            return _triangulate_coords(coords, method)
 
-    # ------------------------------------------------------------------
-    # SERIALISATION
-    # ------------------------------------------------------------------
     try:
-        binary_output = triangles_to_binary(points, triangles)
+        job = jobs.submit(travail, cout=cout)
+    except QueueFullError:
+        return jsonify({"error": "File de travaux pleine"}), 503, {
+            "Retry-After": "5"
+        }
+
+    return jsonify(job.to_dict()), 202, {"Location": f"/jobs/{job.id}"}
+
+
+@app.get("/jobs/stats")
+def job_stats():
+    return jsonify(jobs.stats()), 200
+
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Travail inconnu ou expiré"}), 404
+
+    etat = job.to_dict()
+    if job.status == FAILED:
+        etat["error"] = _job_error(job).message
+    return jsonify(etat), 200
+
+
+@app.get("/jobs/<job_id>/result")
+def job_result(job_id):
+    """
+    Triangles d'un travail terminé ; 202 (avec son état) tant qu'il ne
+    l'est pas, code d'erreur du calcul s'il a échoué.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Travail inconnu ou expiré"}), 404
+
+    if job.status == FAILED:
+        erreur = _job_error(job)
+        return jsonify({"error": erreur.message}), erreur.status
+
+    if job.status != DONE:
+        return jsonify(job.to_dict()), 202, {"Retry-After": "1"}
+
+    try:
+        return _triangles_response(job.resultat), 200
+    except RequestError as e:
+        return jsonify({"error": e.message}), e.status
+
+
+@app.post("/locate/<pointset_id>")
+def locate(pointset_id):
+    """
+    Localise un lot de points dans la triangulation d'un PointSet du PSM.
+
+    Le corps est un PointSet binaire de points à localiser ; la réponse
+    donne, pour chacun, l'indice du triangle qui le contient ou -1 (voir
+    `serialisation.locations_to_binary`). La triangulation passe par les
+    mêmes caches que /triangulate ; l'index spatial est construit une fois
+    par requête, quel que soit le nombre de points, et comme la
+    triangulation hors du thread de la requête (voir `_locate_points`).
+    """
+    method = request.args.get("method", "ear_clipping")
+    if method not in METHODS:
+        return jsonify({"error": "Méthode de triangulation inconnue"}), 400
+
+    try:
+        requetes = _read_body_coords()
+        resultat = _triangulate_id(pointset_id, method)
+        coords, indices = _result_buffers(resultat)
+    except RequestError as e:
+        return jsonify({"error": e.message}), e.status
+
+    try:
+        localisations = _locate_points(coords, indices, requetes)
+    except RequestError as e:
+        return jsonify({"error": e.message}), e.status
+    return Response(
+        locations_to_binary(localisations),
+        mimetype="application/octet-stream",
+        headers={"X-Cache": resultat.cache_status},
+    ), 200
+
+
+def _locate_points(coords, indices, requetes):
+    """
+    Construit l'index et localise `requetes` via le pool de calcul (même
+    file, même délai que les triangulations) : un gros maillage ne bloque
+    pas le thread de la requête.
+    """
+    cout = len(indices) // 3 + len(requetes) // 2
+    if not executor.is_inline(cout):
+        # Les vues mémoire ne sont pas picklables : copies en tampons
+        coords = array("f", coords)
+        indices = array("I", indices)
+        requetes = array("f", requetes)
+    try:
+        with _etape("locate"):
+            return executor.run(
+                locate_points, coords, indices, requetes, cout=cout
+            )
+    except QueueFullError:
+        raise _echec("compute_queue_full", 503, "File de calcul pleine")
+    except ComputeTimeoutError:
+        raise _echec("compute_timeout", 504, "Délai de localisation dépassé")
+    except BrokenProcessPool:
+        raise _echec("compute_worker_lost", 503,
+                     "Processus de calcul interrompu")
     except Exception:
-        return jsonify({"error": "Erreur conversion triangles"}), 500
+        raise _echec("locate", 500, "Erreur localisation")
+
+
+# Codes d'erreur du schéma `Error` de TP/triangulator.yml
+_CODES_ERREUR = {
+    400: "INVALID_REQUEST",
+    404: "POINTSET_NOT_FOUND",
+    500: "TRIANGULATION_FAILED",
+    503: "SERVICE_UNAVAILABLE",
+    504: "TRIANGULATION_TIMEOUT",
+}
+
+
+def _spec_error(status: int, message: str):
+    """Erreur au format `Error` de la spécification ({code, message})."""
+    code = _CODES_ERREUR.get(status, "INTERNAL_ERROR")
+    return jsonify({"code": code, "message": message}), status
+
+
+@app.get("/triangulation/<pointset_id>")
+def get_triangulation(pointset_id):
+    """
+    Triangulation d'un PointSet du PSM, conforme à TP/triangulator.yml.
+
+    Contrairement à POST /triangulate, la réponse peut être mise en cache
+    par les intermédiaires HTTP : l'ETag (fort) est dérivé de l'empreinte
+    du contenu du PointSet et de la méthode, et un If-None-Match
+    correspondant reçoit un 304 sans triangulation ni corps.
+    """
+    try:
+        uuid.UUID(pointset_id)
+    except ValueError:
+        return _spec_error(400, "PointSetID invalide")
+
+    method = request.args.get("method", "ear_clipping")
+    if method not in METHODS:
+        return _spec_error(400, "Méthode de triangulation inconnue")
+
+    try:
+        coords = _fetch_coords(pointset_id)
+    except RequestError as e:
+        return _spec_error(e.status, e.message)
+
+    # Même empreinte que la clé du cache disque, plus la variante du format
+    etag = f"{method}-{content_key(coords)}"
+    indices_format = _indices_format(len(coords) // 2)
+    if indices_format != "uint32":
+        etag = f"{etag}-{indices_format}"
+    max_age = app.config["TRIANGULATOR_HTTP_MAX_AGE"]
+    entetes = {"Cache-Control": f"public, max-age={max_age}"}
+
+    # ETag éventuellement suffixé par le codage de la réponse compressée.
+    # Le 304 reprend les validateurs de la représentation reconnue (ETag
+    # de la variante, Vary) : sinon un cache réécrirait l'ETag stocké. La
+    # variante du codage négocié pour cette requête est essayée d'abord.
+    variantes = [etag] + [f"{etag}-{encoding}" for encoding in ENCODINGS]
+    negocie = negotiate(request.headers.get("Accept-Encoding"))
+    if negocie is not None:
+        variantes.sort(key=lambda v: v != f"{etag}-{negocie}")
+    reconnue = next(
+        (v for v in variantes if request.if_none_match.contains(v)), None
+    )
+    if reconnue is not None:
+        reponse = Response(status=304, headers=entetes)
+        reponse.set_etag(reconnue)
+        reponse.vary.add("Accept")
+        if app.config["TRIANGULATOR_COMPRESS_MIN_BYTES"] is not None:
+            reponse.vary.add("Accept-Encoding")
+        return reponse
+
+    try:
+        reponse = _triangles_response(_triangulate_coords(coords, method))
+    except RequestError as e:
+        return _spec_error(e.status, e.message)
 
-    return Response(binary_output, mimetype="application/octet-stream"), 200
+    reponse.headers.update(entetes)
+    reponse.set_etag(etag)
+    return reponse, 200
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,136 @@
+"""
+Cache en mémoire des réponses Triangles encodées.
+
+Les entrées sont évincées selon l'ordre LRU dès que le budget total en
+octets est dépassé, et expirent après une durée de vie (TTL). Des
+compteurs (hits, misses, évictions, expirations) permettent de
+dimensionner le cache.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import hashlib
+import threading
+import time
+
+
+def content_key(data) -> str:
+    """Empreinte rapide (BLAKE2b, 128 bits) d'un contenu binaire."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class TriangulationCache:
+    """
+    Cache LRU borné en octets et en durée de vie, utilisable par plusieurs
+    threads.
+
+    Args:
+        max_bytes: budget total des valeurs stockées, en octets.
+        max_entry_bytes: taille maximale d'une entrée (par défaut un quart
+            du budget, pour qu'un maillage géant ne vide pas le cache).
+        ttl: durée de vie d'une entrée, en secondes (None : pas d'expiration).
+        horloge: source de temps (injectable pour les tests).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entry_bytes: Optional[int] = None,
+        ttl: Optional[float] = 300.0,
+        horloge: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = (
+            max_bytes // 4 if max_entry_bytes is None else max_entry_bytes
+        )
+        self.ttl = ttl
+        self._horloge = horloge
+
+        self._entrees: "OrderedDict[Hashable, Tuple[bytes, float]]" = (
+            OrderedDict()
+        )
+        self._taille = 0
+        self._verrou = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, cle: Hashable) -> Optional[bytes]:
+        """Retourne la valeur associée à `cle`, ou None (absente/expirée)."""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                self.misses += 1
+                return None
+
+            valeur, expiration = entree
+            if expiration < self._horloge():
+                self._retirer(cle)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entrees.move_to_end(cle)
+            self.hits += 1
+            return valeur
+
+    def put(self, cle: Hashable, valeur: bytes) -> bool:
+        """
+        Stocke `valeur` sous `cle`, en évinçant les entrées les moins
+        récemment utilisées si nécessaire.
+
+        Retourne False si la valeur est trop grande pour être mise en cache.
+        """
+        if not self.accepts(len(valeur)):
+            return False
+
+        expiration = (
+            self._horloge() + self.ttl if self.ttl is not None
+            else float("inf")
+        )
+
+        with self._verrou:
+            if cle in self._entrees:
+                self._retirer(cle)
+
+            self._entrees[cle] = (valeur, expiration)
+            self._taille += len(valeur)
+
+            while self._taille > self.max_bytes:
+                plus_ancienne = next(iter(self._entrees))
+                self._retirer(plus_ancienne)
+                self.evictions += 1
+
+        return True
+
+    def accepts(self, taille: int) -> bool:
+        """True si une valeur de `taille` octets peut être mise en cache."""
+        return 0 < taille <= min(self.max_entry_bytes, self.max_bytes)
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._verrou:
+            self._entrees.clear()
+            self._taille = 0
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs et occupation courante du cache."""
+        with self._verrou:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entrees),
+                "bytes": self._taille,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _retirer(self, cle: Hashable) -> None:
+        """Supprime une entrée (verrou déjà pris)."""
+        valeur, _ = self._entrees.pop(cle)
+        self._taille -= len(valeur)
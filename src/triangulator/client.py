@@ -0,0 +1,255 @@
+"""
+Client HTTP du PointSetManager.
+
+Implémenté uniquement avec la bibliothèque standard (`http.client`) :
+- connexions keep-alive réutilisées, par hôte, dans un pool borné ;
+- délais distincts pour l'établissement de la connexion et la lecture ;
+- nouvelles tentatives bornées, avec attente exponentielle, sur les
+  erreurs réseau et les réponses 502/503/504 ;
+- PointSet compressés acceptés (Accept-Encoding), décompressés à la
+  réception en flux, sous les mêmes limites (points, octets) qu'un
+  PointSet envoyé au service (voir `triangulator.content_encoding`).
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+import http.client
+import io
+import threading
+import time
+
+from .content_encoding import ENCODINGS, DecompressingReader
+from .serialisation import (
+    PointSetTooLargeError,
+    coords_to_binary,
+    read_pointset_stream,
+)
+
+# Réponses du PSM pour lesquelles une nouvelle tentative a un sens
+_STATUTS_TEMPORAIRES = (502, 503, 504)
+
+Hote = Tuple[str, str, int]
+
+
+class PointSetManagerError(RuntimeError):
+    """
+    Échec d'un appel au PointSetManager.
+
+    `status` vaut le code HTTP renvoyé par le PSM, ou None si l'échec est
+    réseau (connexion refusée, délai dépassé...).
+    """
+
+    def __init__(self, message: str = "Erreur PSM",
+                 status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class PointSetManagerClient:
+    """
+    Client du PointSetManager, utilisable par plusieurs threads.
+
+    Args:
+        base_url: URL racine du PSM.
+        connect_timeout: délai d'établissement de la connexion (secondes).
+        read_timeout: délai maximal d'attente de données (secondes).
+        max_retries: nombre de nouvelles tentatives après un échec.
+        backoff: attente avant la première nouvelle tentative (doublée
+            ensuite), en secondes.
+        pool_size: nombre maximal de connexions inactives gardées par hôte.
+        compression: annonce les codages disponibles (Accept-Encoding) ;
+            False : le PSM répond sans compression.
+        max_points: nombre maximal de points d'un PointSet compressé
+            (None : illimité).
+        max_bytes: taille décompressée maximale d'un PointSet compressé,
+            en octets (None : illimitée).
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        connect_timeout: float = 2.0,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff: float = 0.1,
+        pool_size: int = 8,
+        compression: bool = True,
+        max_points: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.max_points = max_points
+        self.max_bytes = max_bytes
+        self._entetes = (
+            {"Accept-Encoding": ", ".join(ENCODINGS)} if compression else {}
+        )
+
+        url = urlsplit(self.base_url)
+        self._hote: Hote = (
+            url.scheme or "http",
+            url.hostname or "localhost",
+            url.port or (443 if url.scheme == "https" else 80),
+        )
+        self._prefixe = url.path
+
+        self._pool: Dict[Hote, List[http.client.HTTPConnection]] = {}
+        self._verrou = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # POOL DE CONNEXIONS
+    # ------------------------------------------------------------------
+
+    def _acquire(self, hote: Hote) -> Tuple[http.client.HTTPConnection, bool]:
+        """Retourne (connexion, réutilisée ?)."""
+        with self._verrou:
+            libres = self._pool.get(hote)
+            if libres:
+                self._stats["connections_reused"] += 1
+                return libres.pop(), True
+            self._stats["connections_created"] += 1
+
+        scheme, host, port = hote
+        classe = (http.client.HTTPSConnection if scheme == "https"
+                  else http.client.HTTPConnection)
+        return classe(host, port, timeout=self.connect_timeout), False
+
+    def _release(self, hote: Hote, connexion: http.client.HTTPConnection
+                 ) -> None:
+        """Remet une connexion dans le pool (ou la ferme s'il est plein)."""
+        with self._verrou:
+            libres = self._pool.setdefault(hote, [])
+            if len(libres) < self.pool_size:
+                libres.append(connexion)
+                return
+        connexion.close()
+
+    def close(self) -> None:
+        """Ferme toutes les connexions inactives."""
+        with self._verrou:
+            connexions = [c for libres in self._pool.values() for c in libres]
+            self._pool.clear()
+        for connexion in connexions:
+            connexion.close()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Statistiques du pool (compteurs cumulés et connexions inactives)."""
+        with self._verrou:
+            stats = dict(self._stats)
+            stats["idle"] = sum(len(libres) for libres in self._pool.values())
+        return stats
+
+    # ------------------------------------------------------------------
+    # REQUÊTES
+    # ------------------------------------------------------------------
+
+    def _get(self, chemin: str) -> Tuple[int, bytes, str]:
+        """
+        Une requête GET sur une connexion du pool : (statut, corps tel que
+        reçu, codage du corps).
+
+        Une connexion réutilisée peut avoir été fermée par le serveur entre
+        deux requêtes : on retente alors tout de suite sur une connexion
+        neuve, sans compter de nouvelle tentative.
+        """
+        while True:
+            connexion, reutilisee = self._acquire(self._hote)
+            try:
+                if connexion.sock is None:
+                    connexion.connect()
+                connexion.sock.settimeout(self.read_timeout)
+
+                connexion.request("GET", chemin, headers=self._entetes)
+                reponse = connexion.getresponse()
+                corps = reponse.read()
+                encoding = reponse.getheader("Content-Encoding", "identity")
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError):
+                connexion.close()
+                if reutilisee:
+                    continue
+                raise
+            except BaseException:
+                connexion.close()
+                raise
+
+            if reponse.will_close:
+                connexion.close()
+            else:
+                self._release(self._hote, connexion)
+            return reponse.status, corps, encoding.strip().lower()
+
+    def _decompresser(self, corps: bytes, encoding: str) -> bytes:
+        """
+        Décompresse un PointSet reçu : avec des limites, l'en-tête est
+        confronté aux limites avant toute allocation et seuls les octets
+        annoncés sont décompressés (voir `read_pointset_stream`).
+        """
+        lecteur = DecompressingReader(io.BytesIO(corps), encoding)
+        if self.max_points is None and self.max_bytes is None:
+            return lecteur.read()
+        coords = read_pointset_stream(
+            lecteur, max_points=self.max_points, max_bytes=self.max_bytes
+        )
+        return coords_to_binary(coords)
+
+    def fetch_pointset(self, pointset_id: str) -> bytes:
+        """
+        Récupère le PointSet binaire `pointset_id` auprès du PSM.
+
+        Raises:
+            PointSetManagerError: si le PSM est injoignable, répond une
+                erreur, ou reste indisponible après les nouvelles tentatives.
+        """
+        chemin = f"{self._prefixe}/pointset/{quote(str(pointset_id), safe='')}"
+
+        with self._verrou:
+            self._stats["requests"] += 1
+
+        for tentative in range(self.max_retries + 1):
+            if tentative:
+                with self._verrou:
+                    self._stats["retries"] += 1
+                time.sleep(self.backoff * 2 ** (tentative - 1))
+
+            try:
+                status, corps, encoding = self._get(chemin)
+            except (OSError, http.client.HTTPException) as e:
+                erreur = PointSetManagerError()
+                erreur.__cause__ = e
+                continue
+
+            if status == 200:
+                if encoding in ("", "identity"):
+                    return corps
+                try:
+                    return self._decompresser(corps, encoding)
+                except PointSetTooLargeError as e:
+                    erreur = PointSetManagerError("PointSet PSM trop volumineux")
+                    erreur.__cause__ = e
+                    break
+                except ValueError as e:
+                    # Codage inconnu ou corps corrompu : inutile de retenter
+                    erreur = PointSetManagerError("Réponse PSM illisible")
+                    erreur.__cause__ = e
+                    break
+
+            erreur = PointSetManagerError(status=status)
+            if status not in _STATUTS_TEMPORAIRES:
+                break
+
+        with self._verrou:
+            self._stats["failures"] += 1
+        raise erreur
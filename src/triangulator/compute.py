@@ -0,0 +1,420 @@
+"""
+Exécution des triangulations hors du thread de requête.
+
+La triangulation est du calcul Python pur : exécutée dans le thread Flask,
+elle bloque tous les autres threads du worker à cause du GIL. Ce module
+la confie à un pool de processus (`ProcessPoolExecutor`) :
+- la file d'attente est bornée : au-delà, la demande est refusée
+  immédiatement plutôt que d'attendre indéfiniment ;
+- chaque travail a un délai maximal ; un travail expiré encore en attente
+  est annulé. Un travail déjà démarré ne peut pas être interrompu dans son
+  processus : le pool est alors recyclé (processus arrêtés, nouveau pool
+  au calcul suivant) et sa place rendue aussitôt. Les autres calculs du
+  pool recyclé sont relancés une fois sur le nouveau pool ;
+- un pool cassé (processus tué, ex. par le système faute de mémoire) est
+  remplacé au calcul suivant au lieu de faire échouer toutes les requêtes
+  jusqu'au redémarrage du service ;
+- les petites entrées sont traitées directement dans le thread appelant,
+  pour ne pas payer le coût des échanges entre processus.
+
+Pour les triangulations (`triangulate_buffers`), les points et les indices
+résultats transitent par des blocs `multiprocessing.shared_memory` au
+format binaire de `serialisation` (float32 / uint32 little-endian) : seuls
+leurs noms traversent la frontière entre processus, rien n'est picklé.
+La méthode "delaunay_parallel" confie plutôt chaque bande de
+`parallel.parallel_delaunay` au pool, comme un calcul à part entière.
+"""
+
+from __future__ import annotations
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+import math
+import multiprocessing
+import os
+import struct
+import sys
+import threading
+import time
+import weakref
+
+from .serialisation import (
+    binary_to_coords,
+    coords_to_points,
+    pack_pointset_into,
+)
+from .hull import convex_hull
+from .mesh import PointSet
+from . import parallel
+from .triangulation import simple_triangulation
+
+
+class QueueFullError(RuntimeError):
+    """La file des calculs en attente est pleine."""
+
+
+class ComputeTimeoutError(RuntimeError):
+    """Un calcul a dépassé son délai maximal."""
+
+
+class ComputeExecutor:
+    """
+    Pool de processus borné pour les calculs coûteux.
+
+    Args:
+        max_workers: nombre de processus (None : nombre de cœurs ;
+            0 : tout est exécuté dans le thread appelant).
+        max_pending: nombre maximal de calculs confiés au pool en même
+            temps (en cours + en attente).
+        timeout: délai maximal d'un calcul, en secondes (None : aucun).
+        inline_threshold: en dessous de ce coût (ex. nombre de points),
+            le calcul est exécuté dans le thread appelant.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: int = 32,
+        timeout: Optional[float] = 120.0,
+        inline_threshold: int = 5000,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.inline_threshold = inline_threshold
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Pools recyclés sur délai dépassé : leurs autres calculs sont relancés
+        self._interrompus: "weakref.WeakSet[ProcessPoolExecutor]" = (
+            weakref.WeakSet()
+        )
+        self._places = threading.BoundedSemaphore(max_pending)
+        self._verrou = threading.Lock()
+        self._stats = {
+            "inline": 0,
+            "submitted": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "recycled": 0,
+            "resubmitted": 0,
+            "pending": 0,
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Pool courant, créé au premier usage (rien n'est lancé à l'import)
+        ou après un recyclage.
+        """
+        with self._verrou:
+            if self._pool is None:
+                # "spawn" : pas de fork d'un serveur multi-thread
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _recycler(self, pool: ProcessPoolExecutor,
+                  interrompu: bool = False) -> None:
+        """
+        Retire `pool` s'il est encore le pool courant et arrête ses
+        processus ; le calcul suivant en crée un neuf. Les calculs encore
+        confiés à `pool` échouent (`BrokenProcessPool`), ce qui rend leurs
+        places. `interrompu` : recyclage sur délai dépassé, ces calculs
+        seront relancés.
+        """
+        with self._verrou:
+            if self._pool is not pool:
+                return
+            self._pool = None
+            self._stats["recycled"] += 1
+            if interrompu:
+                self._interrompus.add(pool)
+        _arreter_processus(pool)
+        pool.shutdown(wait=False)
+
+    def _compter(self, nom: str, delta: int = 1) -> None:
+        with self._verrou:
+            self._stats[nom] += delta
+
+    def nb_workers(self) -> int:
+        """Nombre de processus du pool (0 : pool désactivé)."""
+        if self.max_workers is None:
+            return os.cpu_count() or 1
+        return self.max_workers
+
+    def is_inline(self, cout: int) -> bool:
+        """True si un calcul de ce coût s'exécute dans le thread appelant."""
+        return self.max_workers == 0 or cout <= self.inline_threshold
+
+    def run(self, fonction: Callable[..., Any], *args: Any, cout: int = 0,
+            timeout: Optional[float] = None) -> Any:
+        """
+        Exécute `fonction(*args)` et retourne son résultat.
+
+        `fonction` et ses arguments doivent être picklables dès que le
+        calcul part dans le pool (cout > inline_threshold).
+
+        Raises:
+            QueueFullError: si la file du pool est pleine.
+            ComputeTimeoutError: si le délai est dépassé.
+            BrokenProcessPool: si le processus du calcul s'est arrêté (le
+                pool est remplacé pour les calculs suivants).
+            Toute exception levée par `fonction`.
+        """
+        if self.is_inline(cout):
+            self._compter("inline")
+            return fonction(*args)
+
+        delai = self.timeout if timeout is None else timeout
+        fin = None if delai is None else time.monotonic() + delai
+        relance = False
+        while True:
+            pool, futur, liberer = self._soumettre(fonction, args)
+            try:
+                reste = None if fin is None else max(fin - time.monotonic(), 0)
+                return futur.result(timeout=reste)
+            except FuturesTimeoutError:
+                self._compter("timeouts")
+                if futur.cancel():
+                    self._compter("cancelled")
+                else:
+                    # Déjà démarré : seul l'arrêt de son processus le libère
+                    self._recycler(pool, interrompu=True)
+                    liberer()
+                raise ComputeTimeoutError("Délai de calcul dépassé.")
+            except BrokenProcessPool:
+                with self._verrou:
+                    victime = pool in self._interrompus
+                if victime and not relance:
+                    # Arrêté avec le pool d'un autre calcul expiré
+                    relance = True
+                    self._compter("resubmitted")
+                    continue
+                self._recycler(pool)
+                raise
+
+    def _soumettre(self, fonction: Callable[..., Any], args: Tuple
+                   ) -> Tuple[ProcessPoolExecutor, Future, Callable[[], None]]:
+        """
+        Réserve une place et confie le calcul au pool courant.
+
+        Returns:
+            (pool, futur, fonction rendant la place une seule fois).
+        """
+        if not self._places.acquire(blocking=False):
+            self._compter("rejected")
+            raise QueueFullError("File de calcul pleine.")
+
+        try:
+            pool = self._get_pool()
+            try:
+                futur = pool.submit(fonction, *args)
+            except RuntimeError:
+                # Pool cassé (processus tué depuis le dernier calcul) ou
+                # recyclé entre-temps par un autre thread
+                self._recycler(pool)
+                pool = self._get_pool()
+                futur = pool.submit(fonction, *args)
+        except BaseException:
+            self._places.release()
+            raise
+
+        self._compter("submitted")
+        self._compter("pending")
+
+        rendue = []
+
+        def liberer(_=None):
+            with self._verrou:
+                if rendue:
+                    return
+                rendue.append(True)
+                self._stats["pending"] -= 1
+            self._places.release()
+
+        # La place est rendue à la fin réelle du calcul (ou annulation), ou
+        # dès le recyclage de son pool sur délai dépassé
+        futur.add_done_callback(liberer)
+        return pool, futur, liberer
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs cumulés et nombre de calculs confiés au pool."""
+        with self._verrou:
+            return dict(self._stats)
+
+    def shutdown(self) -> None:
+        """Arrête le pool (les calculs en attente sont annulés)."""
+        with self._verrou:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _arreter_processus(pool: ProcessPoolExecutor) -> None:
+    """Arrête les processus d'un pool, y compris ceux en plein calcul."""
+    terminer = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if terminer is not None:
+        terminer()
+        return
+
+    # Avant 3.14 : attribut privé `_processes` (dict pid → Process, None
+    # après `shutdown`), vérifié sur CPython 3.8 à 3.13. Absent ou d'un
+    # autre type : les calculs en attente sont seulement annulés, celui en
+    # cours va à son terme avant la fin de son processus.
+    processus = getattr(pool, "_processes", None)
+    if not isinstance(processus, dict):
+        pool.shutdown(wait=False, cancel_futures=True)
+        return
+    for p in list(processus.values()):
+        p.terminate()
+
+
+# ---------------------------------------------------------------------------
+#                 TRIANGULATION PAR MÉMOIRE PARTAGÉE
+# ---------------------------------------------------------------------------
+
+def _triangulate_shared(
+    fonction: Callable,
+    nom_points: str,
+    nom_resultat: str,
+    method: str,
+) -> int:
+    """
+    Côté worker : lit le PointSet dans le bloc `nom_points`, le triangule
+    et écrit les indices (uint32 little-endian) dans le bloc `nom_resultat`.
+
+    Returns:
+        Nombre de triangles écrits.
+    """
+    entree = SharedMemory(name=nom_points)
+    sortie = SharedMemory(name=nom_resultat)
+    try:
+        coords = binary_to_coords(entree.buf)
+        points = coords_to_points(coords)
+        if isinstance(coords, memoryview):
+            coords.release()
+
+        triangles = fonction(points, method)
+
+        if len(triangles) * 12 > sortie.size:
+            raise ValueError("Bloc résultat trop petit.")
+        struct.pack_into(
+            f"<{3 * len(triangles)}I", sortie.buf, 0,
+            *chain.from_iterable(triangles),
+        )
+        return len(triangles)
+    finally:
+        entree.close()
+        sortie.close()
+
+
+def triangulate_buffers(
+    executor: ComputeExecutor,
+    coords: Sequence[float],
+    method: str,
+    fonction: Callable = simple_triangulation,
+) -> Sequence[int]:
+    """
+    Triangule un tampon de coordonnées à plat et retourne les indices à
+    plat (`array("I")` : a0, b0, c0, a1, ...).
+
+    Dans le pool, les coordonnées sont copiées une fois dans un bloc
+    partagé et les indices relus d'un bloc : aucun point ni triangle n'est
+    picklé. En ligne, `fonction` est appelée directement.
+
+    Pour "delaunay_parallel", les bandes partent chacune dans le pool (voir
+    `_parallel_buffers`) ; avec une seule bande utile (peu de points ou
+    un seul processus), le moteur "delaunay" suit le chemin habituel.
+
+    Raises:
+        Les mêmes exceptions que `ComputeExecutor.run`.
+    """
+    nb_points = len(coords) // 2
+
+    if method == "delaunay_parallel":
+        nb_bandes = min(executor.nb_workers(),
+                        nb_points // parallel.MIN_POINTS_BANDE)
+        if nb_bandes >= 2:
+            return _parallel_buffers(executor, coords, nb_bandes)
+        method = "delaunay"
+
+    if executor.is_inline(nb_points):
+        triangles = executor.run(
+            fonction, PointSet(coords), method, cout=nb_points
+        )
+        return array("I", chain.from_iterable(triangles))
+
+    # Une triangulation de n points a au plus 2n triangles
+    entree = SharedMemory(create=True, size=4 + nb_points * 8)
+    sortie = SharedMemory(create=True, size=max(12, 2 * nb_points * 12))
+    try:
+        pack_pointset_into(entree.buf, coords)
+
+        nb_triangles = executor.run(
+            _triangulate_shared, fonction, entree.name, sortie.name, method,
+            cout=nb_points,
+        )
+
+        indices = array("I")
+        indices.frombytes(sortie.buf[:nb_triangles * 12])
+        if sys.byteorder != "little":
+            indices.byteswap()
+        return indices
+    finally:
+        # Sur délai dépassé, le worker garde sa projection jusqu'à son
+        # arrêt : supprimer les noms ici ne l'affecte pas.
+        entree.close()
+        entree.unlink()
+        sortie.close()
+        sortie.unlink()
+
+
+# ---------------------------------------------------------------------------
+#                 DELAUNAY PARALLÈLE PAR LE POOL DE CALCUL
+# ---------------------------------------------------------------------------
+
+class _PoolBandes:
+    """
+    Interface `submit` d'un `Executor` pour `parallel_delaunay` : chaque
+    bande passe par `ComputeExecutor.run` (place dans la file, délai,
+    recyclage du pool), depuis un thread qui attend son résultat.
+    """
+
+    def __init__(self, executor: ComputeExecutor, nb_bandes: int):
+        self._executor = executor
+        self._threads = ThreadPoolExecutor(max_workers=nb_bandes)
+
+    def submit(self, fonction: Callable, *args: Any) -> Future:
+        return self._threads.submit(
+            self._executor.run, fonction, *args, cout=math.inf
+        )
+
+    def shutdown(self) -> None:
+        self._threads.shutdown(wait=True)
+
+
+def _parallel_buffers(executor: ComputeExecutor, coords: Sequence[float],
+                      nb_bandes: int) -> Sequence[int]:
+    """
+    "delaunay_parallel" : bandes triangulées dans le pool, découpage et
+    couture dans le thread appelant (voir `parallel.parallel_delaunay`).
+    """
+    points = coords_to_points(coords)
+    # Points tous alignés : aucun triangle (comme `simple_triangulation`)
+    if len(convex_hull(points)) < 3:
+        return array("I")
+    bandes = _PoolBandes(executor, nb_bandes)
+    try:
+        triangles = parallel.parallel_delaunay(
+            points, workers=nb_bandes, executor=bandes,
+            min_points_bande=parallel.MIN_POINTS_BANDE,
+        )
+    finally:
+        bandes.shutdown()
+    return array("I", chain.from_iterable(triangles))
@@ -0,0 +1,187 @@
+"""
+Compression HTTP (`Content-Encoding`) des PointSet et des Triangles.
+
+Codages pris en charge :
+- "gzip" et "deflate" (format zlib, RFC 9110) via `zlib` ;
+- "zstd" si le module `compression.zstd` de la bibliothèque standard est
+  disponible (Python 3.14+), sinon ignoré.
+
+La compression et la décompression se font en flux : bloc par bloc pour
+une réponse (`iter_compress`), et à la demande pour un corps reçu
+(`DecompressingReader`, lu comme un fichier par `read_pointset_stream`).
+La taille décompressée n'est jamais produite au-delà de ce que le
+lecteur demande : un PointSet compressé reste soumis aux mêmes limites
+que le binaire brut.
+"""
+
+from __future__ import annotations
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+import io
+import zlib
+
+from .serialisation import TAILLE_BLOC
+
+try:
+    from compression import zstd as _zstd
+except ImportError:
+    _zstd = None
+
+# Paramètre `wbits` de zlib : en-tête gzip, ou en-tête zlib ("deflate")
+_WBITS = {"gzip": 31, "deflate": 15}
+
+# Codages disponibles, par ordre de préférence du serveur
+ENCODINGS = (("zstd",) if _zstd is not None else ()) + ("gzip", "deflate")
+
+
+class UnsupportedEncodingError(ValueError):
+    """Codage de contenu inconnu ou indisponible."""
+
+
+def _verifier(encoding: str) -> None:
+    if encoding not in ENCODINGS:
+        raise UnsupportedEncodingError(f"Codage non pris en charge : {encoding}")
+
+
+def negotiate(accept_encoding: Optional[str],
+              disponibles: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """
+    Choisit le codage de la réponse d'après un en-tête `Accept-Encoding`.
+
+    Le codage de plus forte qualité (q) l'emporte ; à qualité égale, la
+    préférence du serveur (`disponibles`) départage. Retourne None si
+    aucun codage disponible n'est accepté (réponse non compressée).
+    """
+    if not accept_encoding:
+        return None
+
+    qualites = {}
+    for element in accept_encoding.split(","):
+        nom, _, parametres = element.strip().partition(";")
+        nom = nom.strip().lower()
+        q = 1.0
+        for parametre in parametres.split(";"):
+            cle, _, valeur = parametre.strip().partition("=")
+            if cle.strip().lower() == "q":
+                try:
+                    q = float(valeur)
+                except ValueError:
+                    q = 0.0
+        if nom:
+            qualites[nom] = q
+
+    meilleur, meilleure_q = None, 0.0
+    for encoding in disponibles:
+        q = qualites.get(encoding, qualites.get("*", 0.0))
+        if q > meilleure_q:
+            meilleur, meilleure_q = encoding, q
+    return meilleur
+
+
+def _compresseur(encoding: str, niveau: Optional[int]):
+    _verifier(encoding)
+    if encoding == "zstd":
+        return _zstd.ZstdCompressor(level=niveau)
+    return zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION if niveau is None else niveau,
+        zlib.DEFLATED, _WBITS[encoding],
+    )
+
+
+def _decompresseur(encoding: str):
+    _verifier(encoding)
+    if encoding == "zstd":
+        return _zstd.ZstdDecompressor()
+    return zlib.decompressobj(_WBITS[encoding])
+
+
+def iter_compress(blocs: Iterable[bytes], encoding: str,
+                  niveau: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Compresse une suite de blocs en flux (blocs vides omis). `blocs` est
+    fermé (s'il a une méthode `close`) à la fin ou à l'abandon du flux.
+    """
+    compresseur = _compresseur(encoding, niveau)
+    try:
+        for bloc in blocs:
+            sortie = compresseur.compress(bloc)
+            if sortie:
+                yield sortie
+        sortie = compresseur.flush()
+        if sortie:
+            yield sortie
+    finally:
+        fermer = getattr(blocs, "close", None)
+        if fermer is not None:
+            fermer()
+
+
+def compress(data: bytes, encoding: str, niveau: Optional[int] = None) -> bytes:
+    """Compresse un contenu d'un bloc."""
+    return b"".join(iter_compress([data], encoding, niveau))
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """Décompresse un contenu d'un bloc."""
+    return DecompressingReader(io.BytesIO(data), encoding).read()
+
+
+class DecompressingReader:
+    """
+    Flux décompressé à la lecture depuis un flux compressé `flux`.
+
+    Seuls les octets demandés par `read` sont décompressés : un contenu
+    compressé très redondant ne peut pas occuper plus de mémoire que ce
+    que le lecteur consomme.
+
+    Raises (à la lecture):
+        ValueError: si les données compressées sont invalides.
+    """
+
+    def __init__(self, flux: BinaryIO, encoding: str,
+                 taille_bloc: int = TAILLE_BLOC):
+        self._flux = flux
+        self._decompresseur = _decompresseur(encoding)
+        self._taille_bloc = taille_bloc
+        self._entree = b""
+        self._fin_flux = False
+
+    def _decompresser(self, donnees: bytes, n: int) -> bytes:
+        try:
+            sortie = self._decompresseur.decompress(donnees, n)
+        except Exception as e:
+            raise ValueError("Données compressées invalides.") from e
+        # zlib : entrée non consommée à cause de la limite de sortie
+        self._entree = getattr(self._decompresseur, "unconsumed_tail", b"")
+        return sortie
+
+    def _termine(self) -> bool:
+        return getattr(self._decompresseur, "eof", False)
+
+    def read(self, n: int = -1) -> bytes:
+        """Au plus `n` octets décompressés (tout le reste si n < 0)."""
+        if n is None or n < 0:
+            blocs: List[bytes] = []
+            while True:
+                bloc = self.read(self._taille_bloc)
+                if not bloc:
+                    return b"".join(blocs)
+                blocs.append(bloc)
+
+        while n:
+            if self._entree:
+                donnees = self._entree
+            elif self._termine() or self._fin_flux:
+                return b""
+            elif not getattr(self._decompresseur, "needs_input", True):
+                # zstd : sortie encore en attente dans le décompresseur
+                donnees = b""
+            else:
+                donnees = self._flux.read(self._taille_bloc)
+                if not donnees:
+                    self._fin_flux = True
+                    return b""
+
+            sortie = self._decompresser(donnees, n)
+            if sortie:
+                return sortie
+        return b""
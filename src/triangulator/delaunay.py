@@ -0,0 +1,559 @@
+"""
+Triangulation de Delaunay par l'algorithme de Bowyer–Watson.
+
+Les points sont insérés un à un. Chaque triangle connaît ses trois
+voisins, ce qui permet :
+- de localiser le triangle contenant un point par une marche ;
+- de construire la cavité (triangles dont le cercle circonscrit contient
+  le point) par un parcours local.
+
+Le maillage est fermé par un sommet fantôme « à l'infini » : chaque arête
+de l'enveloppe convexe porte, côté extérieur, un triangle fantôme (a, b,
+fantôme). Son « cercle circonscrit » est le demi-plan ouvert extérieur à
+l'arête, plus l'arête elle-même (segment ouvert). Un point hors de
+l'enveloppe tombe donc dans la cavité des triangles fantômes qui le
+voient, et l'enveloppe convexe est toujours entièrement triangulée,
+quelle que soit la forme du nuage (contrairement à un super-triangle
+fini, qui perd des triangles de l'enveloppe sur les nuages allongés).
+
+Les points sont insérés dans l'ordre d'une courbe de Hilbert pour que
+chaque marche parte d'un triangle proche : la complexité attendue est
+proche de O(n log n) (dominée par le tri).
+
+`IncrementalDelaunay` garde le maillage entre deux ajouts de points : un
+ajout ne modifie que les cavités des nouveaux points, et le résultat
+(tampons à plat) est tenu à jour au fil des insertions.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Sequence, Set, Tuple
+import math
+
+from .mesh import PointSet, TriangleMesh
+from .predicates import incircle, orient2d
+from .serialisation import triangle_buffers_to_binary
+
+# Le sommet fantôme occupe l'indice interne 0 ; le point d'indice i du jeu
+# d'entrée a l'indice interne i + _DECALAGE.
+_FANTOME = 0
+_DECALAGE = 1
+
+# Ordre de la courbe de Hilbert utilisée pour trier les insertions.
+_ORDRE_HILBERT = 16
+
+
+def _hilbert_key(x: int, y: int, ordre: int) -> int:
+    """Position de la cellule (x, y) le long d'une courbe de Hilbert."""
+    d = 0
+    s = 1 << (ordre - 1)
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotation du quadrant
+        if ry == 0:
+            if rx == 1:
+                x = s - 1 - x
+                y = s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+
+def hilbert_order(points: Sequence[Tuple[float, float]]) -> List[int]:
+    """
+    Retourne les indices des points triés le long d'une courbe de Hilbert.
+
+    Deux points consécutifs dans cet ordre sont en général proches dans le
+    plan, ce qui raccourcit les marches de localisation.
+    """
+    if not points:
+        return []
+
+    min_x = min(p[0] for p in points)
+    max_x = max(p[0] for p in points)
+    min_y = min(p[1] for p in points)
+    max_y = max(p[1] for p in points)
+
+    cote = (1 << _ORDRE_HILBERT) - 1
+    etendue = max(max_x - min_x, max_y - min_y) or 1.0
+    echelle = cote / etendue
+
+    cles = [
+        _hilbert_key(
+            int((x - min_x) * echelle),
+            int((y - min_y) * echelle),
+            _ORDRE_HILBERT,
+        )
+        for x, y in points
+    ]
+    return sorted(range(len(points)), key=cles.__getitem__)
+
+
+class DelaunayTriangulation:
+    """
+    Maillage de Delaunay construit par insertions successives.
+
+    Représentation interne (tableaux « à plat ») :
+    - `_x`, `_y` : coordonnées des sommets ; l'indice 0 est celui du
+      sommet fantôme (coordonnées inutilisées), le point d'indice i du jeu
+      d'entrée a l'indice interne i + 1 ;
+    - `_sommets` : 3 indices de sommets par triangle, dans le sens
+      trigonométrique ; un triangle supprimé a ses sommets à -1 ;
+    - `_voisins` : 3 indices de triangles par triangle, le voisin k étant
+      celui opposé au sommet k.
+
+    Tant que les points reçus sont alignés, aucun triangle n'existe : ils
+    attendent (`_en_attente`) le premier point non aligné, qui forme avec
+    deux d'entre eux le triangle initial.
+    """
+
+    def __init__(self):
+        self._x: List[float] = [0.0]
+        self._y: List[float] = [0.0]
+
+        self._sommets: List[int] = []
+        self._voisins: List[int] = []
+        self._libres: List[int] = []
+        self._dernier = 0
+        self._en_attente: List[int] = []
+        self._positions_en_attente: Set[Tuple[float, float]] = set()
+
+    # ------------------------------------------------------------------
+    # PRIMITIVES GÉOMÉTRIQUES
+    # ------------------------------------------------------------------
+
+    def _orient(self, a: int, b: int, px: float, py: float) -> float:
+        """> 0 si le point p est à gauche de l'arête orientée a → b."""
+        X, Y = self._x, self._y
+        return orient2d(X[a], Y[a], X[b], Y[b], px, py)
+
+    def _arete_fantome(self, t: int) -> Tuple[int, int]:
+        """
+        Arête (u, v) de l'enveloppe portée par le triangle fantôme t, tel
+        que (u, v, fantôme) soit t à une rotation près : l'extérieur de
+        l'enveloppe est à gauche de u → v. (-1, -1) si t est réel.
+        """
+        S = self._sommets
+        a, b, c = S[3 * t], S[3 * t + 1], S[3 * t + 2]
+        if a == _FANTOME:
+            return b, c
+        if b == _FANTOME:
+            return c, a
+        if c == _FANTOME:
+            return a, b
+        return -1, -1
+
+    def _in_circle(self, t: int, px: float, py: float) -> bool:
+        """
+        True si p est strictement dans le cercle circonscrit de t (pour un
+        triangle fantôme : dans le demi-plan extérieur ou sur l'arête).
+        """
+        u, v = self._arete_fantome(t)
+        X, Y = self._x, self._y
+        if u < 0:
+            S = self._sommets
+            a, b, c = S[3 * t], S[3 * t + 1], S[3 * t + 2]
+            return incircle(X[a], Y[a], X[b], Y[b], X[c], Y[c], px, py) > 0
+
+        cote = self._orient(u, v, px, py)
+        if cote:
+            return cote > 0
+        # Aligné avec l'arête : dedans s'il est strictement entre u et v
+        # (comparaison exacte, les trois points étant exactement alignés)
+        if X[u] != X[v]:
+            return min(X[u], X[v]) < px < max(X[u], X[v])
+        return min(Y[u], Y[v]) < py < max(Y[u], Y[v])
+
+    # ------------------------------------------------------------------
+    # LOCALISATION
+    # ------------------------------------------------------------------
+
+    def _locate(self, px: float, py: float) -> int:
+        """
+        Trouve par marche de visibilité un triangle contenant p, ou un
+        triangle fantôme dont l'arête voit p (p hors de l'enveloppe).
+        """
+        S, V = self._sommets, self._voisins
+        t = self._dernier
+        if S[3 * t] < 0:
+            t = next(i for i in range(len(S) // 3) if S[3 * i] >= 0)
+        # La marche part d'un triangle réel
+        for k in range(3):
+            if S[3 * t + k] == _FANTOME:
+                t = V[3 * t + k]
+                break
+
+        # Garde-fou : une marche ne visite jamais plus de triangles qu'il
+        # n'en existe, sauf erreur d'arrondi ; on repasse alors en linéaire.
+        for _ in range(len(S) // 3 + 1):
+            base = 3 * t
+            for k in range(3):
+                a = S[base + (k + 1) % 3]
+                b = S[base + (k + 2) % 3]
+                if self._orient(a, b, px, py) < 0:
+                    t = V[base + k]
+                    # Arête de l'enveloppe franchie : p est vu par son
+                    # triangle fantôme
+                    if _FANTOME in (S[3 * t], S[3 * t + 1], S[3 * t + 2]):
+                        return t
+                    break
+            else:
+                return t
+
+        return self._locate_lineaire(px, py)
+
+    def _locate_lineaire(self, px: float, py: float) -> int:
+        """Localisation par parcours de tous les triangles (secours)."""
+        S = self._sommets
+        fantome = -1
+        for t in range(len(S) // 3):
+            base = 3 * t
+            if S[base] < 0:
+                continue
+            if _FANTOME in (S[base], S[base + 1], S[base + 2]):
+                if fantome < 0 and self._in_circle(t, px, py):
+                    fantome = t
+            elif all(
+                self._orient(S[base + (k + 1) % 3], S[base + (k + 2) % 3],
+                             px, py) >= 0
+                for k in range(3)
+            ):
+                return t
+        return fantome
+
+    # ------------------------------------------------------------------
+    # INSERTION
+    # ------------------------------------------------------------------
+
+    def add_point(self, x: float, y: float) -> bool:
+        """
+        Ajoute un sommet et l'insère dans le maillage.
+
+        Retourne False si le point est un doublon d'un sommet existant
+        (il garde alors son indice mais n'appartient à aucun triangle).
+        """
+        self._x.append(float(x))
+        self._y.append(float(y))
+        return self._insert(len(self._x) - 1)
+
+    def add_points(self, points: Sequence[Tuple[float, float]]) -> None:
+        """
+        Ajoute plusieurs sommets, insérés dans l'ordre de Hilbert.
+
+        Les sommets gardent l'ordre de `points` pour la numérotation.
+        """
+        debut = len(self._x)
+        self._x.extend(float(p[0]) for p in points)
+        self._y.extend(float(p[1]) for p in points)
+        for i in hilbert_order(points):
+            self._insert(debut + i)
+
+    def _insert(self, v: int) -> bool:
+        """Insère le sommet déjà enregistré v (Bowyer–Watson)."""
+        if not self._sommets:
+            return self._attendre(v)
+
+        X, Y = self._x, self._y
+        px, py = X[v], Y[v]
+
+        t = self._locate(px, py)
+        if t < 0:
+            raise RuntimeError("Localisation impossible : maillage incohérent.")
+
+        S, V = self._sommets, self._voisins
+        for k in range(3):
+            s = S[3 * t + k]
+            if s != _FANTOME and X[s] == px and Y[s] == py:
+                return False
+
+        # Cavité : triangles connexes dont le cercle contient p
+        cavite = {t}
+        pile = [t]
+        while pile:
+            u = pile.pop()
+            for k in range(3):
+                n = V[3 * u + k]
+                if n not in cavite and self._in_circle(n, px, py):
+                    cavite.add(n)
+                    pile.append(n)
+
+        # Bord de la cavité : arêtes dont le voisin n'est pas dans la cavité
+        bord = []
+        for u in cavite:
+            base = 3 * u
+            for k in range(3):
+                n = V[base + k]
+                if n not in cavite:
+                    # Position de u chez son voisin, relevée avant que les
+                    # emplacements de la cavité ne soient réutilisés.
+                    j = V.index(u, 3 * n, 3 * n + 3) - 3 * n
+                    bord.append((S[base + (k + 1) % 3], S[base + (k + 2) % 3],
+                                 n, j))
+
+        self._supprimer(cavite)
+
+        # Nouveaux triangles (a, b, v) : le voisin opposé à v est l'ancien
+        # voisin extérieur, les deux autres sont des nouveaux triangles.
+        # Une arête du bord touchant le fantôme donne un triangle fantôme.
+        par_debut = {}
+        par_fin = {}
+        for a, b, n, j in bord:
+            nt = self._nouveau_triangle(a, b, v, n)
+            V[3 * n + j] = nt
+            par_debut[a] = nt
+            par_fin[b] = nt
+
+        for a, nt in par_debut.items():
+            b = S[3 * nt + 1]
+            V[3 * nt] = par_debut[b]
+            V[3 * nt + 1] = par_fin[a]
+
+        self._dernier = nt
+        return True
+
+    def _attendre(self, v: int) -> bool:
+        """
+        Sommet v reçu avant le premier triangle : mis en attente tant qu'il
+        est aligné avec les précédents, sinon triangle initial puis
+        insertion des sommets en attente.
+        """
+        X, Y = self._x, self._y
+        position = (X[v], Y[v])
+        if position in self._positions_en_attente:
+            return False
+
+        attente = self._en_attente
+        if len(attente) < 2 or self._orient(attente[0], attente[1],
+                                            *position) == 0:
+            attente.append(v)
+            self._positions_en_attente.add(position)
+            return True
+
+        a, b = attente[0], attente[1]
+        if self._orient(a, b, *position) < 0:
+            a, b = b, a
+        self._triangle_initial(a, b, v)
+
+        self._en_attente = []
+        self._positions_en_attente = set()
+        for w in attente[2:]:
+            self._insert(w)
+        return True
+
+    def _triangle_initial(self, a: int, b: int, c: int) -> None:
+        """Crée le triangle (a, b, c) (sens trigonométrique) et ses trois
+        triangles fantômes."""
+        t = self._nouveau_triangle(a, b, c, -1)
+        f_ab = self._nouveau_triangle(b, a, _FANTOME, t)
+        f_bc = self._nouveau_triangle(c, b, _FANTOME, t)
+        f_ca = self._nouveau_triangle(a, c, _FANTOME, t)
+
+        V = self._voisins
+        V[3 * t:3 * t + 3] = [f_bc, f_ca, f_ab]
+        V[3 * f_ab:3 * f_ab + 2] = [f_ca, f_bc]
+        V[3 * f_bc:3 * f_bc + 2] = [f_ab, f_ca]
+        V[3 * f_ca:3 * f_ca + 2] = [f_bc, f_ab]
+        self._dernier = t
+
+    def _supprimer(self, cavite) -> None:
+        """Supprime les triangles de la cavité (emplacements réutilisés)."""
+        S = self._sommets
+        for u in cavite:
+            S[3 * u] = S[3 * u + 1] = S[3 * u + 2] = -1
+            self._libres.append(u)
+
+    def _nouveau_triangle(self, a: int, b: int, c: int, voisin_c: int) -> int:
+        """Crée le triangle (a, b, c) en réutilisant un emplacement libre."""
+        S, V = self._sommets, self._voisins
+        if self._libres:
+            t = self._libres.pop()
+            base = 3 * t
+            S[base], S[base + 1], S[base + 2] = a, b, c
+            V[base], V[base + 1], V[base + 2] = -1, -1, voisin_c
+        else:
+            t = len(S) // 3
+            S.extend((a, b, c))
+            V.extend((-1, -1, voisin_c))
+        return t
+
+    # ------------------------------------------------------------------
+    # RÉSULTAT
+    # ------------------------------------------------------------------
+
+    def triangles(self) -> List[Tuple[int, int, int]]:
+        """
+        Retourne les triangles réels (sans les triangles fantômes), avec
+        les indices du jeu de points d'entrée. Chaque triangle commence
+        par son plus petit indice (l'ordre trigonométrique est conservé).
+        """
+        S = self._sommets
+        resultat = []
+        for base in range(0, len(S), 3):
+            a, b, c = S[base], S[base + 1], S[base + 2]
+            if a < _DECALAGE or b < _DECALAGE or c < _DECALAGE:
+                continue
+            a, b, c = a - _DECALAGE, b - _DECALAGE, c - _DECALAGE
+            if b < a and b < c:
+                a, b, c = b, c, a
+            elif c < a and c < b:
+                a, b, c = c, a, b
+            resultat.append((a, b, c))
+        return resultat
+
+
+def delaunay_triangulation(
+    points: Sequence[Tuple[float, float]]
+) -> List[Tuple[int, int, int]]:
+    """
+    Calcule la triangulation de Delaunay d'un ensemble de points.
+
+    Args:
+        points: Liste de points (x, y)
+
+    Returns:
+        Liste de triangles (indices dans `points`, sens trigonométrique),
+        couvrant exactement l'enveloppe convexe des points.
+        Une liste vide si les points sont tous alignés ou confondus.
+    """
+    maillage = DelaunayTriangulation()
+    maillage.add_points(points)
+    return maillage.triangles()
+
+
+# ---------------------------------------------------------------------------
+#                       TRIANGULATION INCRÉMENTALE
+# ---------------------------------------------------------------------------
+
+class IncrementalDelaunay(DelaunayTriangulation):
+    """
+    Triangulation de Delaunay d'un ensemble de points qui grandit.
+
+    Les points ajoutés sont insérés localement dans le maillage existant
+    (cavité de Bowyer–Watson, voisins mis à jour), où qu'ils tombent : le
+    sommet fantôme ferme le maillage, un point hors de l'enveloppe ne
+    demande pas de reconstruction. Le résultat est tenu à jour au fil des
+    insertions :
+    - `_coords` : coordonnées float32 des points (format du fil) ; chaque
+      point est arrondi en float32 dès son ajout, si bien que le maillage
+      exporté est celui que les prédicats ont construit (deux points
+      confondus après arrondi sont des doublons) ;
+    - `_sortie` : indices (uint32) des triangles réels, trois par
+      triangle ; un triangle supprimé est remplacé par le dernier (retrait
+      en O(1)).
+
+    Un ajout coûte donc en proportion des points ajoutés, et le résultat
+    (`mesh`, `to_bytes`) n'est qu'une copie de tampons.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float]] = ()):
+        super().__init__()
+        self._coords = array("f")
+        self._sortie = array("I")
+        self._position: Dict[int, int] = {}
+        self._proprietaires: List[int] = []
+        if len(points):
+            self.add_points(points)
+
+    @staticmethod
+    def _coordonnees_fil(points):
+        for x, y in points:
+            yield x
+            yield y
+
+    @staticmethod
+    def _arrondir(coords: array) -> List[float]:
+        """Coordonnées float32 en flottants Python (finies, sinon erreur)."""
+        valeurs = coords.tolist()
+        if not all(map(math.isfinite, valeurs)):
+            raise ValueError("Coordonnée non représentable en float32.")
+        return valeurs
+
+    # ------------------------------------------------------------------
+    # AJOUTS
+    # ------------------------------------------------------------------
+
+    def add_points(self, points: Sequence[Tuple[float, float]]) -> None:
+        """
+        Ajoute des points (numérotés à la suite des précédents) et met à
+        jour la triangulation.
+        """
+        if isinstance(points, PointSet):
+            coords = array("f", points.coords)
+        else:
+            coords = array("f", self._coordonnees_fil(points))
+        valeurs = iter(self._arrondir(coords))
+        DelaunayTriangulation.add_points(self, list(zip(valeurs, valeurs)))
+        self._coords.extend(coords)
+
+    def add_point(self, x: float, y: float) -> bool:
+        """
+        Ajoute un point ; False si c'est un doublon d'un point existant (il
+        garde alors son indice mais n'appartient à aucun triangle).
+        """
+        coords = array("f", (x, y))
+        x, y = self._arrondir(coords)
+        self._coords.extend(coords)
+        return DelaunayTriangulation.add_point(self, x, y)
+
+    def __len__(self) -> int:
+        """Nombre de points ajoutés."""
+        return len(self._coords) // 2
+
+    # ------------------------------------------------------------------
+    # SUIVI DU RÉSULTAT
+    # ------------------------------------------------------------------
+
+    def _supprimer(self, cavite) -> None:
+        position, proprietaires, sortie = (
+            self._position, self._proprietaires, self._sortie
+        )
+        for u in cavite:
+            k = position.pop(u, None)
+            if k is None:
+                continue
+            dernier = len(proprietaires) - 1
+            if k != dernier:
+                w = proprietaires[dernier]
+                sortie[3 * k:3 * k + 3] = sortie[3 * dernier:3 * dernier + 3]
+                proprietaires[k] = w
+                position[w] = k
+            del sortie[3 * dernier:]
+            proprietaires.pop()
+        super()._supprimer(cavite)
+
+    def _nouveau_triangle(self, a: int, b: int, c: int, voisin_c: int) -> int:
+        t = super()._nouveau_triangle(a, b, c, voisin_c)
+        if a >= _DECALAGE and b >= _DECALAGE and c >= _DECALAGE:
+            # Même présentation que `triangles` : plus petit indice d'abord
+            if b < a and b < c:
+                a, b, c = b, c, a
+            elif c < a and c < b:
+                a, b, c = c, a, b
+            self._position[t] = len(self._proprietaires)
+            self._proprietaires.append(t)
+            self._sortie.extend((a - _DECALAGE, b - _DECALAGE, c - _DECALAGE))
+        return t
+
+    # ------------------------------------------------------------------
+    # RÉSULTAT
+    # ------------------------------------------------------------------
+
+    def triangles(self) -> List[Tuple[int, int, int]]:
+        """Triangles courants (indices des points ajoutés)."""
+        valeurs = iter(self._sortie.tolist())
+        return list(zip(valeurs, valeurs, valeurs))
+
+    def points(self) -> List[Tuple[float, float]]:
+        """Points ajoutés (coordonnées float32 du maillage)."""
+        valeurs = iter(self._coords.tolist())
+        return list(zip(valeurs, valeurs))
+
+    def mesh(self) -> TriangleMesh:
+        """Copie du maillage courant (tampons float32 / uint32)."""
+        return TriangleMesh(PointSet(self._coords[:]), self._sortie[:])
+
+    def to_bytes(self) -> bytes:
+        """Structure Triangles du maillage courant."""
+        return triangle_buffers_to_binary(self._coords, self._sortie)
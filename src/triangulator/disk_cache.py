@@ -0,0 +1,168 @@
+"""
+Cache persistant sur disque des réponses Triangles encodées.
+
+Chaque entrée est un fichier nommé d'après sa clé (empreinte du contenu du
+PointSet et méthode de triangulation) :
+- l'écriture passe par un fichier temporaire renommé atomiquement, ce qui
+  permet à plusieurs workers de partager le même répertoire ;
+- la lecture d'une entrée se fait par `mmap`, sans charger le fichier ;
+- la taille totale est plafonnée : les entrées les moins récemment lues
+  (date de modification, rafraîchie à chaque lecture) sont supprimées.
+
+Le cache survit aux redémarrages : un nouveau worker sert immédiatement
+les résultats déjà calculés.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, Optional, Union
+import mmap
+import os
+import tempfile
+import threading
+
+from .serialisation import TAILLE_BLOC
+
+_EXTENSION = ".tri"
+
+
+def iter_mmap(contenu: mmap.mmap, taille_bloc: int = TAILLE_BLOC
+              ) -> Iterator[bytes]:
+    """Parcourt une entrée projetée en mémoire par blocs, puis la ferme."""
+    try:
+        for debut in range(0, len(contenu), taille_bloc):
+            yield contenu[debut:debut + taille_bloc]
+    finally:
+        contenu.close()
+
+
+class DiskTriangulationCache:
+    """
+    Cache disque borné en octets.
+
+    Args:
+        repertoire: répertoire des entrées (créé si besoin).
+        max_bytes: taille totale maximale des entrées, en octets.
+    """
+
+    def __init__(self, repertoire: str, max_bytes: int = 1024 ** 3):
+        self.repertoire = repertoire
+        self.max_bytes = max_bytes
+        os.makedirs(repertoire, exist_ok=True)
+
+        self._verrou = threading.Lock()
+        self._taille = sum(
+            os.path.getsize(chemin) for chemin in self._entrees()
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _chemin(self, cle: str) -> str:
+        return os.path.join(self.repertoire, cle + _EXTENSION)
+
+    def _entrees(self) -> Iterator[str]:
+        for nom in os.listdir(self.repertoire):
+            if nom.endswith(_EXTENSION):
+                yield os.path.join(self.repertoire, nom)
+
+    def get(self, cle: str) -> Optional[mmap.mmap]:
+        """
+        Retourne l'entrée projetée en mémoire (à fermer par l'appelant,
+        par exemple via `iter_mmap`), ou None si elle est absente.
+        """
+        chemin = self._chemin(cle)
+        try:
+            with open(chemin, "rb") as fichier:
+                # Rafraîchit la date utilisée pour l'éviction LRU, avant la
+                # projection : une entrée évincée entre-temps ne laisse
+                # aucune projection ouverte
+                os.utime(fichier.fileno() if os.utime in os.supports_fd
+                         else chemin)
+                contenu = mmap.mmap(fichier.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError : fichier vide, impossible à projeter
+            with self._verrou:
+                self.misses += 1
+            return None
+
+        with self._verrou:
+            self.hits += 1
+        return contenu
+
+    def put(self, cle: str, valeur: Union[bytes, Iterable[bytes]]) -> bool:
+        """
+        Écrit une entrée, d'un bloc (`bytes`) ou bloc par bloc (itérable),
+        puis évince les plus anciennes si le plafond est dépassé.
+
+        Retourne False si l'entrée dépasse à elle seule le plafond.
+        """
+        blocs = [valeur] if isinstance(valeur, (bytes, bytearray)) else valeur
+
+        descripteur, temporaire = tempfile.mkstemp(
+            dir=self.repertoire, suffix=".tmp"
+        )
+        taille = 0
+        try:
+            with os.fdopen(descripteur, "wb") as fichier:
+                for bloc in blocs:
+                    taille += len(bloc)
+                    if taille > self.max_bytes:
+                        break
+                    fichier.write(bloc)
+
+            if taille > self.max_bytes or taille == 0:
+                os.unlink(temporaire)
+                return False
+
+            chemin = self._chemin(cle)
+            ancienne = os.path.getsize(chemin) if os.path.exists(chemin) else 0
+            os.replace(temporaire, chemin)
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.unlink(temporaire)
+            raise
+
+        with self._verrou:
+            self._taille += taille - ancienne
+            if self._taille > self.max_bytes:
+                self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récentes (verrou déjà pris)."""
+        entrees = []
+        for chemin in self._entrees():
+            try:
+                etat = os.stat(chemin)
+            except FileNotFoundError:
+                continue
+            entrees.append((etat.st_mtime, etat.st_size, chemin))
+        entrees.sort()
+
+        # Recalcul depuis le disque : d'autres workers écrivent aussi
+        self._taille = sum(taille for _, taille, _ in entrees)
+
+        # On descend sous 90 % du plafond pour ne pas évincer à chaque écriture
+        cible = self.max_bytes * 0.9
+        for _, taille, chemin in entrees:
+            if self._taille <= cible:
+                break
+            try:
+                os.unlink(chemin)
+            except FileNotFoundError:
+                pass
+            self._taille -= taille
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs et occupation courante du cache disque."""
+        with self._verrou:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._taille,
+                "max_bytes": self.max_bytes,
+            }
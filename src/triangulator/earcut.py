@@ -0,0 +1,438 @@
+"""
+Triangulation de polygone par Ear-Clipping, à la manière d'earcut.
+
+Les points sont pris comme un polygone simple, dans leur ordre. Par
+rapport à l'Ear-Clipping de `triangulation`, qui repart du début de la
+liste après chaque oreille et teste tous les sommets restants :
+- les sommets forment un anneau doublement chaîné (tableaux `prec` /
+  `suiv`) : retirer une oreille est en O(1) et la recherche reprend là
+  où elle s'était arrêtée ;
+- l'état réflexe de chaque sommet est tenu à jour (seuls les deux voisins
+  d'une oreille retirée changent) : seul un sommet réflexe peut se
+  trouver dans une oreille, les autres ne sont jamais testés ;
+- les sommets réflexes sont rangés dans l'ordre d'une courbe de Morton
+  (ordre z) : le test d'une oreille ne parcourt que ceux dont la clé z
+  tombe dans celle de sa boîte englobante, c'est-à-dire les plus proches ;
+- après une oreille, seuls ses deux voisins sont remis en file de test :
+  les longues suites de sommets réflexes ne sont pas reparcourues.
+
+Le comportement est presque linéaire sur les polygones usuels. Les
+sommets en double ou alignés avec leurs voisins sont ignorés : ils
+n'apparaissent dans aucun triangle.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from collections import deque
+from typing import List, Sequence, Tuple
+
+from .predicates import orient2d
+
+# Coordonnées ramenées sur 15 bits avant entrelacement (clé z sur 30 bits)
+_COTE_Z = 32767
+_BITS_Z = 30
+
+# Pour chaque bit de clé z : bits de poids plus faible de la même
+# coordonnée (utilisé par `_bigmin`).
+_BITS_INFERIEURS = [
+    sum(1 << j for j in range(bit - 2, -1, -2)) for bit in range(_BITS_Z)
+]
+
+# Nombre d'entrées consécutives hors de la boîte avant de sauter
+_SAUT_Z = 2
+
+
+# Produit vectoriel AB ^ AC : > 0 si A, B, C tournent à gauche (signe exact)
+_cross = orient2d
+
+
+def _z_key(x: int, y: int) -> int:
+    """Entrelace les bits de x et y (courbe de Morton)."""
+    x = (x | (x << 8)) & 0x00FF00FF
+    x = (x | (x << 4)) & 0x0F0F0F0F
+    x = (x | (x << 2)) & 0x33333333
+    x = (x | (x << 1)) & 0x55555555
+
+    y = (y | (y << 8)) & 0x00FF00FF
+    y = (y | (y << 4)) & 0x0F0F0F0F
+    y = (y | (y << 2)) & 0x33333333
+    y = (y | (y << 1)) & 0x55555555
+
+    return x | (y << 1)
+
+
+def _bigmin(cle: int, min_z: int, max_z: int) -> int:
+    """
+    Plus petite clé z > `cle` appartenant au rectangle de coins `min_z` et
+    `max_z` (`cle` étant entre les deux mais hors du rectangle).
+    Algorithme BIGMIN de Tropf et Herzog.
+    """
+    bigmin = max_z
+    # Au-dessus du premier bit où les coins diffèrent, tout est commun
+    for bit in range((min_z ^ max_z).bit_length() - 1, -1, -1):
+        masque = 1 << bit
+        inferieurs = _BITS_INFERIEURS[bit]
+        v = cle & masque
+        bas = min_z & masque
+        haut = max_z & masque
+        if v:
+            if not bas and haut:
+                # La clé est dans la moitié haute : le minimum y passe
+                min_z = (min_z | masque) & ~inferieurs
+            elif not haut:
+                return bigmin
+        elif haut:
+            if bas:
+                return min_z
+            # Candidat : début de la moitié haute ; on poursuit dans la basse
+            bigmin = (min_z | masque) & ~inferieurs
+            max_z = (max_z & ~masque) | inferieurs
+    return bigmin
+
+
+class _Earcut:
+    """État d'une triangulation : anneau de sommets et index z."""
+
+    def __init__(self, points: Sequence[Tuple[float, float]]):
+        n = len(points)
+        self.x = [float(p[0]) for p in points]
+        self.y = [float(p[1]) for p in points]
+        self.triangles: List[Tuple[int, int, int]] = []
+
+        # Anneau dans le sens trigonométrique : un sommet convexe tourne
+        # alors à gauche.
+        aire = 0.0
+        for i in range(n):
+            j = i - 1
+            aire += (self.x[j] - self.x[i]) * (self.y[j] + self.y[i])
+        ordre = list(range(n)) if aire > 0 else list(range(n - 1, -1, -1))
+
+        self.prec = [0] * n
+        self.suiv = [0] * n
+        for k in range(n):
+            i = ordre[k]
+            self.prec[i] = ordre[k - 1]
+            self.suiv[i] = ordre[(k + 1) % n]
+
+        self.actif = [True] * n
+        self.restants = n
+        x, y, prec, suiv = self.x, self.y, self.prec, self.suiv
+        self.reflexe = [
+            _cross(x[prec[i]], y[prec[i]], x[i], y[i],
+                   x[suiv[i]], y[suiv[i]]) <= 0
+            for i in range(n)
+        ]
+        # Index z construit après le premier filtrage (voir `trianguler`)
+        self.z = None
+
+    # ------------------------------------------------------------------
+    # ANNEAU
+    # ------------------------------------------------------------------
+
+    def _maj_reflexe(self, i: int) -> None:
+        """Recalcule l'état réflexe (ou plat) du sommet `i`."""
+        a, c = self.prec[i], self.suiv[i]
+        x, y = self.x, self.y
+        reflexe = _cross(x[a], y[a], x[i], y[i], x[c], y[c]) <= 0
+        if reflexe == self.reflexe[i]:
+            return
+        self.reflexe[i] = reflexe
+        if reflexe and self.z is not None:
+            # Rare (jamais pour un polygone simple) : index reconstruit
+            self._indexer_reflexes()
+
+    def _retirer(self, i: int) -> None:
+        """Retire le sommet `i` de l'anneau."""
+        a, c = self.prec[i], self.suiv[i]
+        self.suiv[a] = c
+        self.prec[c] = a
+        self.actif[i] = False
+        self.restants -= 1
+        self.reflexe[i] = False
+
+    def _egaux(self, i: int, j: int) -> bool:
+        return self.x[i] == self.x[j] and self.y[i] == self.y[j]
+
+    def _filtrer(self, debut: int) -> int:
+        """
+        Retire les sommets en double ou alignés avec leurs voisins.
+
+        Retourne un sommet restant de l'anneau.
+        """
+        x, y = self.x, self.y
+        p = fin = debut
+        while True:
+            recommencer = False
+            a, c = self.prec[p], self.suiv[p]
+            if p != c and (
+                self._egaux(p, c)
+                or _cross(x[a], y[a], x[p], y[p], x[c], y[c]) == 0
+            ):
+                self._retirer(p)
+                self._maj_reflexe(a)
+                self._maj_reflexe(c)
+                p = fin = a
+                if p == self.suiv[p]:
+                    break
+                recommencer = True
+            else:
+                p = c
+            if not recommencer and p == fin:
+                break
+        return fin
+
+    # ------------------------------------------------------------------
+    # INDEX Z
+    # ------------------------------------------------------------------
+
+    def _indexer(self) -> None:
+        """Calcule les clés z et l'index des sommets réflexes."""
+        x, y = self.x, self.y
+        self.min_x = min(x)
+        self.min_y = min(y)
+        etendue = max(max(x) - self.min_x, max(y) - self.min_y)
+        self.echelle = _COTE_Z / etendue if etendue else 0.0
+
+        grille = [self._grille(x[i], y[i]) for i in range(len(x))]
+        self.gx = [g[0] for g in grille]
+        self.gy = [g[1] for g in grille]
+        self.z = [_z_key(gx, gy) for gx, gy in grille]
+
+        self._indexer_reflexes()
+
+    def _indexer_reflexes(self) -> None:
+        """
+        Range les sommets réflexes par clé z (listes parallèles).
+
+        Un sommet qui cesse d'être réflexe reste en place ; `saut[k]` mène
+        vers une entrée suivante, et les suites d'entrées périmées sont
+        court-circuitées au fil des parcours (compression de chemin).
+        """
+        self.sommets_z = sorted(
+            (i for i in range(len(self.x)) if self.reflexe[i]),
+            key=self.z.__getitem__,
+        )
+        self.cles_z = [self.z[i] for i in self.sommets_z]
+        self.saut = list(range(1, len(self.sommets_z) + 1))
+
+    def _vivante(self, k: int) -> int:
+        """Première entrée d'indice >= `k` encore réflexe (ou la fin)."""
+        sommets, reflexe, saut = self.sommets_z, self.reflexe, self.saut
+        fin = len(sommets)
+        r = k
+        while r < fin and not reflexe[sommets[r]]:
+            r = saut[r]
+        while k < r:
+            saut[k], k = r, saut[k]
+        return r
+
+    def _grille(self, x: float, y: float) -> Tuple[int, int]:
+        """Coordonnées entières (15 bits) d'un point pour la clé z."""
+        return (int((x - self.min_x) * self.echelle),
+                int((y - self.min_y) * self.echelle))
+
+    # ------------------------------------------------------------------
+    # OREILLES
+    # ------------------------------------------------------------------
+
+    def _dans_oreille(self, p, ax, ay, bx, by, cx, cy) -> bool:
+        """True si le sommet réflexe `p` est dans le triangle (bords inclus)."""
+        px, py = self.x[p], self.y[p]
+        if px == ax and py == ay:
+            return False
+        return (
+            _cross(ax, ay, bx, by, px, py) >= 0
+            and _cross(bx, by, cx, cy, px, py) >= 0
+            and _cross(cx, cy, ax, ay, px, py) >= 0
+        )
+
+    def _est_oreille(self, b: int) -> bool:
+        if self.reflexe[b]:
+            return False
+
+        a, c = self.prec[b], self.suiv[b]
+        x, y = self.x, self.y
+        ax, ay, bx, by, cx, cy = x[a], y[a], x[b], y[b], x[c], y[c]
+
+        # Seuls les sommets dont la clé z est entre celles des coins de la
+        # boîte englobante du triangle peuvent s'y trouver. Après quelques
+        # entrées hors de la boîte, on saute directement à la clé suivante
+        # qui y retombe (BIGMIN) : une grande boîte ne coûte pas plus que
+        # les sommets qu'elle contient.
+        gx0, gy0 = self._grille(min(ax, bx, cx), min(ay, by, cy))
+        gx1, gy1 = self._grille(max(ax, bx, cx), max(ay, by, cy))
+        min_z, max_z = _z_key(gx0, gy0), _z_key(gx1, gy1)
+        cles, sommets = self.cles_z, self.sommets_z
+        gx, gy = self.gx, self.gy
+
+        fin = len(cles)
+        k = self._vivante(bisect_left(cles, min_z))
+        dehors = 0
+        while k < fin and cles[k] <= max_z:
+            p = sommets[k]
+            if gx0 <= gx[p] <= gx1 and gy0 <= gy[p] <= gy1:
+                if (p != a and p != c
+                        and self._dans_oreille(p, ax, ay, bx, by, cx, cy)):
+                    return False
+                dehors = 0
+                k = self._vivante(k + 1)
+            elif dehors < _SAUT_Z:
+                dehors += 1
+                k = self._vivante(k + 1)
+            else:
+                k = self._vivante(
+                    bisect_left(cles, _bigmin(cles[k], min_z, max_z), k + 1)
+                )
+                dehors = 0
+
+        return True
+
+    def _couper(self, b: int) -> None:
+        """Émet l'oreille de sommet `b` et la retire de l'anneau."""
+        a, c = self.prec[b], self.suiv[b]
+        self.triangles.append((a, b, c))
+        self._retirer(b)
+        self._maj_reflexe(a)
+        self._maj_reflexe(c)
+
+    # ------------------------------------------------------------------
+    # INTERSECTIONS LOCALES (polygones légèrement non simples)
+    # ------------------------------------------------------------------
+
+    def _signe(self, p, q, r) -> int:
+        x, y = self.x, self.y
+        v = _cross(x[p], y[p], x[q], y[q], x[r], y[r])
+        return (v > 0) - (v < 0)
+
+    def _sur_segment(self, p, q, r) -> bool:
+        """q (aligné avec p et r) est-il sur le segment pr ?"""
+        x, y = self.x, self.y
+        return (min(x[p], x[r]) <= x[q] <= max(x[p], x[r])
+                and min(y[p], y[r]) <= y[q] <= max(y[p], y[r]))
+
+    def _intersectent(self, p1, q1, p2, q2) -> bool:
+        """Les segments p1q1 et p2q2 se coupent-ils ?"""
+        o1 = self._signe(p1, q1, p2)
+        o2 = self._signe(p1, q1, q2)
+        o3 = self._signe(p2, q2, p1)
+        o4 = self._signe(p2, q2, q1)
+        if o1 != o2 and o3 != o4:
+            return True
+        return (
+            (o1 == 0 and self._sur_segment(p1, p2, q1))
+            or (o2 == 0 and self._sur_segment(p1, q2, q1))
+            or (o3 == 0 and self._sur_segment(p2, p1, q2))
+            or (o4 == 0 and self._sur_segment(p2, q1, q2))
+        )
+
+    def _localement_interieur(self, a, b) -> bool:
+        """La diagonale ab part-elle vers l'intérieur du polygone en a ?"""
+        x, y = self.x, self.y
+        pa, na = self.prec[a], self.suiv[a]
+        if _cross(x[pa], y[pa], x[a], y[a], x[na], y[na]) > 0:
+            return (_cross(x[a], y[a], x[b], y[b], x[na], y[na]) <= 0
+                    and _cross(x[a], y[a], x[pa], y[pa], x[b], y[b]) <= 0)
+        return (_cross(x[a], y[a], x[b], y[b], x[pa], y[pa]) > 0
+                or _cross(x[a], y[a], x[na], y[na], x[b], y[b]) > 0)
+
+    def _reparer(self, debut: int) -> int:
+        """
+        Coupe les petites boucles a-p-p'-b où les arêtes (a, p) et
+        (p', b) se croisent, en émettant le triangle (a, p, b).
+        """
+        p = debut
+        while True:
+            a = self.prec[p]
+            b = self.suiv[self.suiv[p]]
+            if (not self._egaux(a, b)
+                    and self._intersectent(a, p, self.suiv[p], b)
+                    and self._localement_interieur(a, b)
+                    and self._localement_interieur(b, a)):
+                self.triangles.append((a, p, b))
+                self._retirer(self.suiv[p])
+                self._retirer(p)
+                self._maj_reflexe(a)
+                self._maj_reflexe(b)
+                p = debut = b
+            p = self.suiv[p]
+            if p == debut:
+                break
+        return self._filtrer(p)
+
+    # ------------------------------------------------------------------
+    # BOUCLE PRINCIPALE
+    # ------------------------------------------------------------------
+
+    def _anneau(self, debut: int) -> List[int]:
+        """Sommets de l'anneau, dans l'ordre, à partir de `debut`."""
+        sommets = [debut]
+        p = self.suiv[debut]
+        while p != debut:
+            sommets.append(p)
+            p = self.suiv[p]
+        return sommets
+
+    def trianguler(self) -> List[Tuple[int, int, int]]:
+        # Sommets à tester, dans l'ordre de l'anneau. Après une oreille,
+        # seuls ses deux voisins ont pu en devenir une : ils sont remis en
+        # file, et les longues suites de sommets réflexes ne sont jamais
+        # reparcourues (chaque sommet est testé O(1) fois en moyenne).
+        debut = self._filtrer(0)
+        self._indexer()
+        file = deque(self._anneau(debut))
+        en_file = [False] * len(self.x)
+        for p in file:
+            en_file[p] = True
+        passe = 0
+
+        while self.restants > 2:
+            if not file:
+                # Aucune oreille dans tout l'anneau
+                if passe == 0:
+                    debut = self._filtrer(debut)
+                elif passe == 1:
+                    debut = self._reparer(debut)
+                else:
+                    raise ValueError(
+                        "Triangulation impossible : polygone non simple "
+                        "ou problème géométrique."
+                    )
+                passe += 1
+                file.extend(self._anneau(debut))
+                for p in file:
+                    en_file[p] = True
+                continue
+
+            oreille = file.popleft()
+            en_file[oreille] = False
+            if not self.actif[oreille] or not self._est_oreille(oreille):
+                continue
+
+            a, c = self.prec[oreille], self.suiv[oreille]
+            self._couper(oreille)
+            debut = a
+            for voisin in (a, c):
+                if not en_file[voisin]:
+                    en_file[voisin] = True
+                    file.append(voisin)
+
+        return self.triangles
+
+
+def earcut_triangulation(
+    points: Sequence[Tuple[float, float]]
+) -> List[Tuple[int, int, int]]:
+    """
+    Triangule le polygone simple formé par `points` (dans l'ordre, sens
+    horaire ou trigonométrique).
+
+    Returns:
+        Triangles (indices dans `points`), orientés dans le sens
+        trigonométrique ; [] si tous les points sont alignés.
+
+    Raises:
+        ValueError: si aucune oreille n'est trouvée (polygone non simple).
+    """
+    if len(points) < 3:
+        return []
+    return _Earcut(points).trianguler()
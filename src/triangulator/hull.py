@@ -0,0 +1,91 @@
+"""
+Enveloppe convexe et pré-analyse des entrées de triangulation.
+
+L'enveloppe est calculée par l'algorithme de la chaîne monotone d'Andrew,
+en O(n log n). Elle permet de reconnaître avant toute triangulation :
+- les entrées dont tous les points sont alignés (aucun triangle possible) ;
+- les polygones strictement convexes, dont un éventail est une
+  triangulation valide, construite en O(n).
+"""
+
+from __future__ import annotations
+from typing import List, Optional, Sequence, Tuple
+
+from .predicates import orient2d
+
+
+def _cross(o, a, b) -> float:
+    """Produit vectoriel OA ^ OB : > 0 si O, A, B tournent à gauche."""
+    return orient2d(o[0], o[1], a[0], a[1], b[0], b[1])
+
+
+def convex_hull(points: Sequence[Tuple[float, float]]) -> List[int]:
+    """
+    Indices des sommets de l'enveloppe convexe, dans le sens
+    trigonométrique, sans points alignés sur les arêtes.
+
+    Retourne moins de 3 indices si tous les points sont alignés (ou
+    confondus).
+    """
+    ordre = sorted(range(len(points)), key=points.__getitem__)
+    if len(ordre) < 3:
+        return ordre
+
+    def chaine(indices):
+        pile: List[int] = []
+        for i in indices:
+            while (len(pile) >= 2
+                   and _cross(points[pile[-2]], points[pile[-1]],
+                              points[i]) <= 0):
+                pile.pop()
+            pile.append(i)
+        return pile
+
+    inferieure = chaine(ordre)
+    superieure = chaine(reversed(ordre))
+    enveloppe = inferieure[:-1] + superieure[:-1]
+
+    # Points tous confondus : les deux chaînes se réduisent au même point
+    if len(enveloppe) == 2 and points[enveloppe[0]] == points[enveloppe[1]]:
+        return enveloppe[:1]
+    return enveloppe
+
+
+def is_convex_polygon(points: Sequence[Tuple[float, float]],
+                      enveloppe: Optional[List[int]] = None) -> bool:
+    """
+    True si les points, pris dans leur ordre, forment un polygone
+    strictement convexe (dans un sens ou dans l'autre) : tous sont des
+    sommets de l'enveloppe, parcourue dans l'ordre.
+    """
+    n = len(points)
+    if enveloppe is None:
+        enveloppe = convex_hull(points)
+    if n < 3 or len(enveloppe) != n:
+        return False
+
+    debut = enveloppe.index(0)
+    tour = enveloppe[debut:] + enveloppe[:debut]
+    if tour[1] == 1:
+        return tour == list(range(n))
+    return tour == [0] + list(range(n - 1, 0, -1))
+
+
+def fast_path_triangulation(
+    points: Sequence[Tuple[float, float]]
+) -> Optional[List[Tuple[int, int, int]]]:
+    """
+    Triangulation directe des cas simples d'un polygone, ou None.
+
+    Returns:
+        [] si tous les points sont alignés ; l'éventail depuis le premier
+        sommet si le polygone est strictement convexe ; None sinon (le
+        moteur général doit être utilisé).
+    """
+    enveloppe = convex_hull(points)
+    if len(enveloppe) < 3:
+        return []
+
+    if is_convex_polygon(points, enveloppe):
+        return [(0, i, i + 1) for i in range(1, len(points) - 1)]
+    return None
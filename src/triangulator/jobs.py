@@ -0,0 +1,234 @@
+"""
+File de travaux asynchrones pour les triangulations longues.
+
+Un travail est soumis, reçoit immédiatement un identifiant, puis est
+exécuté par un thread de fond ; le client vient ensuite chercher son état
+et son résultat. Ce module fournit :
+- une file bornée : au-delà de `max_pending` travaux en attente, la
+  soumission est refusée (`QueueFullError`) ;
+- un ordonnancement selon la taille : le plus petit travail en attente
+  passe en premier, sauf si le plus ancien attend depuis plus de
+  `starvation_delay` secondes (un gros travail n'attend pas indéfiniment) ;
+- l'expiration des résultats : un travail terminé est oublié `ttl`
+  secondes après sa fin.
+
+Les threads de fond ne font qu'orchestrer : le calcul lui-même passe par
+le `ComputeExecutor` appelé dans la fonction du travail.
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import heapq
+import threading
+import time
+import uuid
+
+from .compute import QueueFullError
+
+# États d'un travail
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """Un travail soumis et son issue."""
+
+    def __init__(self, fonction: Callable[[], Any], cout: int, soumis: float):
+        self.id = uuid.uuid4().hex
+        self.fonction = fonction
+        self.cout = cout
+        self.status = QUEUED
+        self.soumis = soumis
+        self.termine: Optional[float] = None
+        self.resultat: Any = None
+        self.erreur: Optional[BaseException] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation JSON de l'état du travail."""
+        return {"job_id": self.id, "status": self.status}
+
+
+class JobQueue:
+    """
+    File de travaux bornée, exécutés par des threads de fond.
+
+    Args:
+        workers: nombre de threads d'exécution.
+        max_pending: nombre maximal de travaux en attente.
+        ttl: durée de conservation d'un travail terminé, en secondes.
+        starvation_delay: attente au-delà de laquelle le plus ancien
+            travail passe devant les plus petits, en secondes.
+        horloge: source de temps (injectable pour les tests).
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 64,
+        ttl: float = 600.0,
+        starvation_delay: float = 30.0,
+        horloge: Callable[[], float] = time.monotonic,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.starvation_delay = starvation_delay
+        self._horloge = horloge
+
+        self._travaux: Dict[str, Job] = {}
+        # Travaux en attente : tas (coût, ordre) et file d'arrivée ; un
+        # travail déjà pris par l'une des deux structures est ignoré par
+        # l'autre (état différent de QUEUED).
+        self._tas: List[Tuple[int, int, Job]] = []
+        self._arrivees: Deque[Job] = deque()
+        self._attente = 0
+        self._ordre = 0
+
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._arret = False
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "expired": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # SOUMISSION ET CONSULTATION
+    # ------------------------------------------------------------------
+
+    def submit(self, fonction: Callable[[], Any], cout: int = 0) -> Job:
+        """
+        Met `fonction` en file ; `cout` (ex. nombre de points) sert à
+        l'ordonnancement.
+
+        Raises:
+            QueueFullError: si la file d'attente est pleine.
+        """
+        with self._condition:
+            self._purger()
+            if self._attente >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise QueueFullError("File de travaux pleine.")
+
+            job = Job(fonction, cout, self._horloge())
+            self._travaux[job.id] = job
+            heapq.heappush(self._tas, (cout, self._ordre, job))
+            self._arrivees.append(job)
+            self._ordre += 1
+            self._attente += 1
+            self._stats["submitted"] += 1
+
+            self._demarrer()
+            self._condition.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Retourne le travail `job_id`, ou None (inconnu ou expiré)."""
+        with self._condition:
+            self._purger()
+            return self._travaux.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs cumulés, travaux en attente et conservés."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = self._attente
+            stats["jobs"] = len(self._travaux)
+        return stats
+
+    def shutdown(self) -> None:
+        """Arrête les threads ; les travaux en attente ne sont pas exécutés."""
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+    # ------------------------------------------------------------------
+    # ORDONNANCEMENT (verrou déjà pris)
+    # ------------------------------------------------------------------
+
+    def _demarrer(self) -> None:
+        """Lance les threads au premier usage (rien n'est lancé à l'import)."""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._boucle, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _suivant(self) -> Optional[Job]:
+        """Retire le prochain travail à exécuter."""
+        while self._arrivees and self._arrivees[0].status != QUEUED:
+            self._arrivees.popleft()
+        if not self._arrivees:
+            return None
+
+        # Le plus ancien passe devant s'il attend depuis trop longtemps
+        plus_ancien = self._arrivees[0]
+        if self._horloge() - plus_ancien.soumis >= self.starvation_delay:
+            job = self._arrivees.popleft()
+        else:
+            while True:
+                _, _, job = heapq.heappop(self._tas)
+                if job.status == QUEUED:
+                    break
+
+        job.status = RUNNING
+        self._attente -= 1
+        return job
+
+    def _purger(self) -> None:
+        """Oublie les travaux terminés depuis plus de `ttl` secondes."""
+        limite = self._horloge() - self.ttl
+        expires = [
+            job_id for job_id, job in self._travaux.items()
+            if job.termine is not None and job.termine < limite
+        ]
+        for job_id in expires:
+            del self._travaux[job_id]
+        self._stats["expired"] += len(expires)
+
+        # Tas et file d'arrivée ne gardent pas indéfiniment (avec leurs
+        # résultats) les travaux déjà pris par l'autre structure
+        if len(self._tas) > 2 * self._attente + 64:
+            self._tas = [e for e in self._tas if e[2].status == QUEUED]
+            heapq.heapify(self._tas)
+        if len(self._arrivees) > 2 * self._attente + 64:
+            self._arrivees = deque(
+                job for job in self._arrivees if job.status == QUEUED
+            )
+
+    # ------------------------------------------------------------------
+    # EXÉCUTION
+    # ------------------------------------------------------------------
+
+    def _boucle(self) -> None:
+        while True:
+            with self._condition:
+                job = None
+                while job is None:
+                    if self._arret:
+                        return
+                    job = self._suivant()
+                    if job is None:
+                        self._condition.wait()
+
+            try:
+                job.resultat = job.fonction()
+                status = DONE
+            except BaseException as e:
+                job.erreur = e
+                status = FAILED
+
+            with self._condition:
+                # La fonction (et ses arguments) n'est plus nécessaire
+                job.fonction = None
+                job.status = status
+                job.termine = self._horloge()
+                self._stats["completed" if status == DONE else "failed"] += 1
@@ -0,0 +1,170 @@
+"""
+Localisation de points dans une triangulation.
+
+`PointLocator` construit une fois un index spatial sur un maillage, puis
+répond à des lots de requêtes « quel triangle contient ce point ? » sans
+parcourir tous les triangles :
+- index : une grille uniforme sur la boîte englobante des sommets,
+  d'environ une cellule par triangle ; chaque cellule liste les triangles
+  dont la boîte englobante la recouvre ;
+- requête : seuls les triangles de la cellule du point sont testés
+  (boîte englobante, puis `predicates.orient2d` sur les trois arêtes).
+
+Un lot de requêtes est traité cellule par cellule : les points d'une
+même cellule partagent la même liste de triangles candidats.
+
+Un point sur une arête commune est attribué au premier triangle trouvé ;
+un point hors de tout triangle reçoit -1.
+"""
+
+from __future__ import annotations
+from array import array
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+import math
+
+from .mesh import PointSet, TriangleMesh
+from .predicates import orient2d
+
+# Résultat d'un point hors de la triangulation
+HORS_MAILLAGE = -1
+
+
+def _a_plat(valeurs, classe, attribut: str) -> list:
+    """Tampon à plat d'un PointSet / TriangleMesh, ou d'une liste de tuples."""
+    if isinstance(valeurs, classe):
+        return getattr(valeurs, attribut).tolist()
+    if isinstance(valeurs, (array, memoryview)):
+        return valeurs.tolist()
+    return list(chain.from_iterable(valeurs))
+
+
+class PointLocator:
+    """
+    Index de localisation sur une triangulation.
+
+    Args:
+        points: sommets (liste de (x, y), `PointSet` ou tampon à plat).
+        triangles: triangles (liste de (a, b, c), `TriangleMesh` ou tampon
+            d'indices à plat). Les triangles plats sont ignorés.
+    """
+
+    def __init__(self, points, triangles):
+        coords = _a_plat(points, PointSet, "coords")
+        indices = _a_plat(triangles, TriangleMesh, "indices")
+        xs = coords[0::2]
+        ys = coords[1::2]
+
+        # Triangles orientés dans le sens trigonométrique, avec leur boîte
+        self._sommets: List[Tuple[float, ...]] = []
+        self._numeros: List[int] = []
+        boites = []
+        for t in range(len(indices) // 3):
+            a, b, c = indices[3 * t:3 * t + 3]
+            ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+            orientation = orient2d(ax, ay, bx, by, cx, cy)
+            if orientation == 0:
+                continue
+            if orientation < 0:
+                bx, by, cx, cy = cx, cy, bx, by
+            self._sommets.append((ax, ay, bx, by, cx, cy))
+            self._numeros.append(t)
+            boites.append((min(ax, bx, cx), min(ay, by, cy),
+                           max(ax, bx, cx), max(ay, by, cy)))
+        self._boites = boites
+
+        # Grille : environ une cellule par triangle, cellules carrées
+        if boites:
+            self.min_x = min(b[0] for b in boites)
+            self.min_y = min(b[1] for b in boites)
+            self.max_x = max(b[2] for b in boites)
+            self.max_y = max(b[3] for b in boites)
+        else:
+            self.min_x = self.min_y = 0.0
+            self.max_x = self.max_y = -1.0
+        largeur = max(self.max_x - self.min_x, 0.0)
+        hauteur = max(self.max_y - self.min_y, 0.0)
+        cote = math.sqrt(largeur * hauteur / len(boites)) if boites else 0.0
+        if cote > 0:
+            self.nx = max(1, min(int(largeur / cote) + 1, 1 << 12))
+            self.ny = max(1, min(int(hauteur / cote) + 1, 1 << 12))
+        else:
+            self.nx = self.ny = 1
+        self._sx = self.nx / largeur if largeur > 0 else 0.0
+        self._sy = self.ny / hauteur if hauteur > 0 else 0.0
+
+        self._cellules: List[List[int]] = [[] for _ in range(self.nx * self.ny)]
+        for k, (x0, y0, x1, y1) in enumerate(boites):
+            i0, j0 = self._cellule(x0, y0)
+            i1, j1 = self._cellule(x1, y1)
+            for j in range(j0, j1 + 1):
+                ligne = j * self.nx
+                for i in range(i0, i1 + 1):
+                    self._cellules[ligne + i].append(k)
+
+    def __len__(self) -> int:
+        """Nombre de triangles indexés (non plats)."""
+        return len(self._numeros)
+
+    def _cellule(self, x: float, y: float) -> Tuple[int, int]:
+        """Cellule (i, j) de la grille contenant (x, y), bornée à la grille."""
+        i = int((x - self.min_x) * self._sx)
+        j = int((y - self.min_y) * self._sy)
+        return min(max(i, 0), self.nx - 1), min(max(j, 0), self.ny - 1)
+
+    def _chercher(self, candidats: List[int], x: float, y: float) -> int:
+        boites, sommets = self._boites, self._sommets
+        for k in candidats:
+            x0, y0, x1, y1 = boites[k]
+            if not (x0 <= x <= x1 and y0 <= y <= y1):
+                continue
+            ax, ay, bx, by, cx, cy = sommets[k]
+            if (orient2d(ax, ay, bx, by, x, y) >= 0
+                    and orient2d(bx, by, cx, cy, x, y) >= 0
+                    and orient2d(cx, cy, ax, ay, x, y) >= 0):
+                return self._numeros[k]
+        return HORS_MAILLAGE
+
+    def locate(self, x: float, y: float) -> int:
+        """Indice du triangle contenant (x, y), ou -1."""
+        if not (self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y):
+            return HORS_MAILLAGE
+        i, j = self._cellule(x, y)
+        return self._chercher(self._cellules[j * self.nx + i], x, y)
+
+    def locate_many(self, queries) -> array:
+        """
+        Localise un lot de points (liste de (x, y), `PointSet` ou tampon
+        de coordonnées à plat).
+
+        Returns:
+            `array("i")` : pour chaque point, l'indice de son triangle ou -1.
+        """
+        coords = _a_plat(queries, PointSet, "coords")
+        xs = coords[0::2]
+        ys = coords[1::2]
+        resultat = array("i", [HORS_MAILLAGE]) * len(xs)
+
+        # Regroupement par cellule (les points hors de la boîte restent à -1)
+        min_x, min_y, max_x, max_y = self.min_x, self.min_y, self.max_x, self.max_y
+        groupes: Dict[int, List[int]] = {}
+        for q in range(len(xs)):
+            x, y = xs[q], ys[q]
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                i, j = self._cellule(x, y)
+                groupes.setdefault(j * self.nx + i, []).append(q)
+
+        for cellule, requetes in groupes.items():
+            candidats = self._cellules[cellule]
+            for q in requetes:
+                resultat[q] = self._chercher(candidats, xs[q], ys[q])
+        return resultat
+
+
+def locate_points(
+    points,
+    triangles,
+    queries: Sequence[Tuple[float, float]],
+) -> array:
+    """Raccourci : construit un `PointLocator` et localise `queries`."""
+    return PointLocator(points, triangles).locate_many(queries)
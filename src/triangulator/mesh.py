@@ -0,0 +1,193 @@
+"""
+Types compacts pour les PointSet et les maillages de triangles.
+
+Une liste de tuples Python coûte plus de 100 octets par point et disperse
+les valeurs en mémoire. `PointSet` et `TriangleMesh` stockent au contraire
+les coordonnées et les indices dans des tampons contigus, au format du
+fil (float32 / uint32) :
+- `array("f")` / `array("I")`, ou une `memoryview` de même format (ex. sur
+  le corps d'une requête : construction sans copie via `from_bytes`) ;
+- une interface de séquence en lecture (`len`, indice, tranche,
+  itération) qui produit les mêmes tuples (x, y) / (a, b, c) que l'API
+  listes, pour rester compatible avec le code existant.
+
+Les coordonnées sont stockées en float32 : un point construit depuis des
+flottants Python est arrondi comme il le serait par `pointset_to_binary`.
+"""
+
+from __future__ import annotations
+from array import array
+from collections.abc import Sequence
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+Point = Tuple[float, float]
+Triangle = Tuple[int, int, int]
+
+
+def _tampon(valeurs, code: str):
+    """`valeurs` telle quelle si c'est déjà un tampon `code`, sinon copiée."""
+    if isinstance(valeurs, array) and valeurs.typecode == code:
+        return valeurs
+    if isinstance(valeurs, memoryview) and valeurs.format == code:
+        return valeurs
+    return array(code, valeurs)
+
+
+def _indice(i: int, n: int) -> int:
+    if i < 0:
+        i += n
+    if not 0 <= i < n:
+        raise IndexError("Indice hors limites.")
+    return i
+
+
+class PointSet(Sequence):
+    """
+    Ensemble de points sur un tampon float32 à plat (x0, y0, x1, y1, ...).
+
+    Se comporte comme une séquence de tuples (x, y).
+    """
+
+    __slots__ = ("coords",)
+
+    def __init__(self, coords: Optional[Iterable[float]] = None):
+        coords = _tampon(() if coords is None else coords, "f")
+        if len(coords) % 2:
+            raise ValueError("Nombre impair de coordonnées.")
+        self.coords = coords
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]) -> "PointSet":
+        """Construit un PointSet depuis des tuples (x, y)."""
+        return cls(array("f", chain.from_iterable(points)))
+
+    @classmethod
+    def from_bytes(cls, data) -> "PointSet":
+        """
+        Décode un PointSet binaire ; sans copie sur une machine
+        little-endian (le PointSet garde une vue sur `data`).
+
+        Raises:
+            ValueError: si les données sont trop courtes ou incohérentes.
+        """
+        # Import local : serialisation dépend de ce module.
+        from .serialisation import binary_to_coords
+        return cls(binary_to_coords(data))
+
+    def to_bytes(self) -> bytes:
+        """Encode au format PointSet."""
+        from .serialisation import coords_to_binary
+        return coords_to_binary(self.coords)
+
+    def tolist(self) -> List[Point]:
+        """Liste de tuples (x, y) (forme attendue par les moteurs)."""
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.coords) // 2
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            debut, fin, pas = i.indices(len(self))
+            if pas == 1:
+                return PointSet(self.coords[2 * debut:2 * max(debut, fin)])
+            return PointSet.from_points(self[k] for k in range(debut, fin, pas))
+        i = _indice(i, len(self))
+        return (self.coords[2 * i], self.coords[2 * i + 1])
+
+    def __iter__(self) -> Iterator[Point]:
+        valeurs = iter(self.coords.tolist())
+        return zip(valeurs, valeurs)
+
+    def __eq__(self, autre) -> bool:
+        if isinstance(autre, PointSet):
+            return self.coords.tolist() == autre.coords.tolist()
+        if isinstance(autre, Sequence):
+            return self.tolist() == [tuple(p) for p in autre]
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PointSet({len(self)} points)"
+
+
+class TriangleMesh(Sequence):
+    """
+    Maillage : un PointSet et un tampon uint32 d'indices à plat
+    (a0, b0, c0, a1, ...).
+
+    Se comporte comme une séquence de tuples (a, b, c).
+    """
+
+    __slots__ = ("points", "indices")
+
+    def __init__(self, points, indices: Optional[Iterable[int]] = None):
+        if not isinstance(points, PointSet):
+            points = PointSet.from_points(points)
+        indices = _tampon(() if indices is None else indices, "I")
+        if len(indices) % 3:
+            raise ValueError("Nombre d'indices non multiple de 3.")
+        self.points = points
+        self.indices = indices
+
+    @classmethod
+    def from_triangles(cls, points, triangles: Iterable[Triangle]) -> "TriangleMesh":
+        """Construit un maillage depuis des tuples (a, b, c)."""
+        return cls(points, array("I", chain.from_iterable(triangles)))
+
+    @classmethod
+    def from_bytes(cls, data) -> "TriangleMesh":
+        """
+        Décode une structure Triangles ; sans copie sur une machine
+        little-endian.
+
+        Raises:
+            ValueError: si les données sont trop courtes ou incohérentes.
+        """
+        from .serialisation import binary_to_triangle_buffers
+        coords, indices = binary_to_triangle_buffers(data)
+        return cls(PointSet(coords), indices)
+
+    def to_bytes(self) -> bytes:
+        """Encode au format Triangles."""
+        from .serialisation import triangle_buffers_to_binary
+        return triangle_buffers_to_binary(self.points.coords, self.indices)
+
+    def tolist(self) -> List[Triangle]:
+        """Liste de tuples (a, b, c)."""
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.indices) // 3
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            debut, fin, pas = i.indices(len(self))
+            if pas == 1:
+                return TriangleMesh(
+                    self.points, self.indices[3 * debut:3 * max(debut, fin)]
+                )
+            return TriangleMesh.from_triangles(
+                self.points, (self[k] for k in range(debut, fin, pas))
+            )
+        i = _indice(i, len(self))
+        return tuple(self.indices[3 * i:3 * i + 3])
+
+    def __iter__(self) -> Iterator[Triangle]:
+        valeurs = iter(self.indices.tolist())
+        return zip(valeurs, valeurs, valeurs)
+
+    def __eq__(self, autre) -> bool:
+        if isinstance(autre, TriangleMesh):
+            return (self.points == autre.points
+                    and self.indices.tolist() == autre.indices.tolist())
+        if isinstance(autre, Sequence):
+            return self.tolist() == [tuple(t) for t in autre]
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TriangleMesh({len(self.points)} points, {len(self)} triangles)"
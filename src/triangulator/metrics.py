@@ -0,0 +1,246 @@
+"""
+Métriques du service au format texte de Prometheus.
+
+Trois types, chacun avec des étiquettes (labels) optionnelles :
+- `Counter` : compteur cumulé (ex. erreurs par branche) ;
+- `Gauge` : valeur courante, tenue à jour (`inc` / `dec`) ou lue à
+  l'export depuis une fonction (ex. taille d'une file) ;
+- `Histogram` : répartition de valeurs observées dans des seaux cumulés
+  (ex. latences, tailles d'entrée).
+
+Une observation coûte un verrou et quelques opérations (recherche
+dichotomique du seau) : l'instrumentation reste négligeable devant le
+traitement d'une requête. Le texte n'est construit qu'à l'export
+(`MetricsRegistry.render`, route /metrics).
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import threading
+import time
+
+# Type MIME de l'exposition texte de Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seaux par défaut : latences en secondes, de 1 ms à 1 min
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Seaux de tailles (points, triangles, octets) : puissances de 10
+SIZE_BUCKETS = tuple(10.0 ** k for k in range(1, 10))
+
+Labels = Tuple[str, ...]
+
+
+def _valeur(x: float) -> str:
+    """Nombre au format Prometheus (+Inf, entiers sans partie décimale)."""
+    if x == math.inf:
+        return "+Inf"
+    if x == -math.inf:
+        return "-Inf"
+    if x == int(x) and abs(x) < 1e15:
+        return str(int(x))
+    return repr(float(x))
+
+
+def _echapper(valeur: str) -> str:
+    return (valeur.replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _etiquettes(noms: Sequence[str], valeurs: Sequence[str]) -> str:
+    if not noms:
+        return ""
+    paires = ",".join(
+        f'{nom}="{_echapper(str(valeur))}"' for nom, valeur in zip(noms, valeurs)
+    )
+    return "{" + paires + "}"
+
+
+class _Metrique:
+    """Base commune : nom, aide, noms d'étiquettes et verrou."""
+
+    type = "untyped"
+
+    def __init__(self, nom: str, aide: str, etiquettes: Sequence[str] = ()):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = tuple(etiquettes)
+        self._verrou = threading.Lock()
+
+    def _cle(self, labels: Labels) -> Labels:
+        if len(labels) != len(self.etiquettes):
+            raise ValueError(
+                f"{self.nom} : {len(self.etiquettes)} étiquettes attendues."
+            )
+        return labels
+
+    def _lignes(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Bloc texte de la métrique (HELP, TYPE et échantillons)."""
+        entete = [f"# HELP {self.nom} {_echapper(self.aide)}",
+                  f"# TYPE {self.nom} {self.type}"]
+        return "\n".join(entete + list(self._lignes())) + "\n"
+
+
+class Counter(_Metrique):
+    """Compteur cumulé, par combinaison d'étiquettes."""
+
+    type = "counter"
+
+    def __init__(self, nom: str, aide: str, etiquettes: Sequence[str] = ()):
+        super().__init__(nom, aide, etiquettes)
+        self._valeurs: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), valeur: float = 1) -> None:
+        cle = self._cle(labels)
+        with self._verrou:
+            self._valeurs[cle] = self._valeurs.get(cle, 0) + valeur
+
+    def get(self, labels: Labels = ()) -> float:
+        with self._verrou:
+            return self._valeurs.get(labels, 0)
+
+    def _lignes(self):
+        with self._verrou:
+            valeurs = sorted(self._valeurs.items())
+        for labels, valeur in valeurs:
+            yield (f"{self.nom}{_etiquettes(self.etiquettes, labels)} "
+                   f"{_valeur(valeur)}")
+
+
+class Gauge(Counter):
+    """
+    Valeur courante. Avec `fonction`, la valeur est lue à l'export :
+    `fonction()` retourne un nombre, ou un dictionnaire
+    {tuple d'étiquettes: valeur}.
+    """
+
+    type = "gauge"
+
+    def __init__(self, nom: str, aide: str, etiquettes: Sequence[str] = (),
+                 fonction: Optional[Callable[[], object]] = None):
+        super().__init__(nom, aide, etiquettes)
+        self._fonction = fonction
+
+    def dec(self, labels: Labels = (), valeur: float = 1) -> None:
+        self.inc(labels, -valeur)
+
+    def set(self, valeur: float, labels: Labels = ()) -> None:
+        cle = self._cle(labels)
+        with self._verrou:
+            self._valeurs[cle] = valeur
+
+    def _lignes(self):
+        if self._fonction is not None:
+            valeurs = self._fonction()
+            if not isinstance(valeurs, dict):
+                valeurs = {(): valeurs}
+            with self._verrou:
+                self._valeurs = dict(valeurs)
+        yield from super()._lignes()
+
+
+class _Chrono:
+    """Contexte qui observe sa durée dans un histogramme."""
+
+    __slots__ = ("histogramme", "labels", "debut")
+
+    def __init__(self, histogramme: "Histogram", labels: Labels):
+        self.histogramme = histogramme
+        self.labels = labels
+
+    def __enter__(self):
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogramme.observe(time.perf_counter() - self.debut, self.labels)
+        return False
+
+
+class Histogram(_Metrique):
+    """
+    Histogramme à seaux cumulés (`le`), avec somme et nombre
+    d'observations, par combinaison d'étiquettes.
+    """
+
+    type = "histogram"
+
+    def __init__(self, nom: str, aide: str, etiquettes: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(nom, aide, etiquettes)
+        self.buckets = tuple(sorted(buckets))
+        # Par étiquettes : [effectifs par seau (+Inf en dernier), somme]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, valeur: float, labels: Labels = ()) -> None:
+        cle = self._cle(labels)
+        k = bisect_left(self.buckets, valeur)
+        with self._verrou:
+            serie = self._series.get(cle)
+            if serie is None:
+                serie = self._series[cle] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][k] += 1
+            serie[1] += valeur
+
+    def time(self, labels: Labels = ()) -> _Chrono:
+        """Contexte `with` qui observe la durée du bloc (secondes)."""
+        return _Chrono(self, self._cle(labels))
+
+    def count(self, labels: Labels = ()) -> int:
+        with self._verrou:
+            serie = self._series.get(labels)
+            return sum(serie[0]) if serie else 0
+
+    def _lignes(self):
+        with self._verrou:
+            series = sorted(
+                (labels, list(effectifs), somme)
+                for labels, (effectifs, somme) in self._series.items()
+            )
+        noms = self.etiquettes + ("le",)
+        for labels, effectifs, somme in series:
+            cumul = 0
+            for borne, effectif in zip(self.buckets + (math.inf,), effectifs):
+                cumul += effectif
+                yield (f"{self.nom}_bucket"
+                       f"{_etiquettes(noms, labels + (_valeur(borne),))} {cumul}")
+            suffixe = _etiquettes(self.etiquettes, labels)
+            yield f"{self.nom}_sum{suffixe} {_valeur(somme)}"
+            yield f"{self.nom}_count{suffixe} {cumul}"
+
+
+class MetricsRegistry:
+    """Ensemble des métriques d'un service, exporté d'un bloc."""
+
+    def __init__(self):
+        self._metriques: List[_Metrique] = []
+
+    def _ajouter(self, metrique):
+        if any(m.nom == metrique.nom for m in self._metriques):
+            raise ValueError(f"Métrique déjà déclarée : {metrique.nom}")
+        self._metriques.append(metrique)
+        return metrique
+
+    def counter(self, nom: str, aide: str,
+                etiquettes: Sequence[str] = ()) -> Counter:
+        return self._ajouter(Counter(nom, aide, etiquettes))
+
+    def gauge(self, nom: str, aide: str, etiquettes: Sequence[str] = (),
+              fonction: Optional[Callable[[], object]] = None) -> Gauge:
+        return self._ajouter(Gauge(nom, aide, etiquettes, fonction))
+
+    def histogram(self, nom: str, aide: str, etiquettes: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._ajouter(Histogram(nom, aide, etiquettes, buckets))
+
+    def render(self) -> str:
+        """Exposition texte de toutes les métriques."""
+        return "".join(m.render() for m in self._metriques)
@@ -0,0 +1,258 @@
+"""
+Triangulation de Delaunay parallèle par bandes.
+
+Les moteurs sont du Python pur : un gros PointSet occupe un seul cœur.
+`parallel_delaunay` découpe l'ensemble de points en bandes verticales
+(même nombre de points par bande), triangule chaque bande dans un pool de
+processus, puis recoud les coutures :
+
+1. Dans chaque bande (processus de travail), un triangle de Delaunay local
+   dont le cercle circonscrit reste strictement entre les bandes voisines
+   ne peut contenir aucun point des autres bandes : il est définitif.
+2. Les autres triangles, les arêtes de bord du maillage local et les
+   points isolés désignent les sommets de couture. Un sommet dont tout le
+   voisinage local est définitif a déjà tous ses triangles : seuls les
+   sommets de couture peuvent appartenir aux triangles manquants.
+3. La triangulation de Delaunay des sommets de couture contient tous les
+   triangles manquants, plus des triangles qui recouvrent la zone déjà
+   couverte. Ceux-ci sont écartés : au sommet d'un tel triangle, la
+   direction de son centre de gravité tombe dans l'angle d'un triangle
+   définitif.
+
+Le résultat est celui du moteur "delaunay" mono-cœur (à l'ordre près),
+au traitement des points cocycliques près.
+"""
+
+from __future__ import annotations
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+import multiprocessing
+import os
+
+from .delaunay import delaunay_triangulation
+from .predicates import orient2d
+
+# En dessous de ce nombre de points par bande, le découpage ne paie pas le
+# coût des échanges entre processus.
+MIN_POINTS_BANDE = 5000
+
+# Marge relative (à l'étendue des points) appliquée au test du cercle
+# circonscrit : un triangle douteux part simplement dans la couture.
+_TOLERANCE = 1e-9
+
+
+def _octets_vers_indices(data: bytes) -> array:
+    indices = array("I")
+    indices.frombytes(data)
+    return indices
+
+
+def _trianguler_bande(
+    data: bytes,
+    gauche: float,
+    droite: float,
+    tolerance: float,
+) -> Tuple[bytes, bytes, bytes]:
+    """
+    Côté worker : triangule une bande (coordonnées float64 à plat) et trie
+    ses triangles.
+
+    Returns:
+        (triangles définitifs, sommets de couture, triangles définitifs
+        touchant un sommet de couture), en indices locaux uint32.
+    """
+    coords = array("d")
+    coords.frombytes(data)
+    valeurs = iter(coords.tolist())
+    points = list(zip(valeurs, valeurs))
+
+    triangles = delaunay_triangulation(points)
+    definitifs = array("I")
+    couture = set()
+    aretes = set()
+    n = len(points)
+    limite_gauche = gauche + tolerance
+    limite_droite = droite - tolerance
+
+    for a, b, c in triangles:
+        aretes.add(a * n + b)
+        aretes.add(b * n + c)
+        aretes.add(c * n + a)
+
+        # Cercle circonscrit (centre relatif à a)
+        ax, ay = points[a]
+        bx, by = points[b][0] - ax, points[b][1] - ay
+        cx, cy = points[c][0] - ax, points[c][1] - ay
+        d = 2.0 * (bx * cy - by * cx)
+        if d == 0.0:
+            # Triangle très aplati (non plat pour les prédicats exacts) :
+            # centre incalculable en flottants, il part dans la couture
+            couture.update((a, b, c))
+            continue
+        b2 = bx * bx + by * by
+        c2 = cx * cx + cy * cy
+        ux = (cy * b2 - by * c2) / d
+        uy = (bx * c2 - cx * b2) / d
+        rayon = math.sqrt(ux * ux + uy * uy)
+        centre = ax + ux
+
+        if (math.isfinite(centre) and math.isfinite(rayon)
+                and limite_gauche < centre - rayon
+                and centre + rayon < limite_droite):
+            definitifs.extend((a, b, c))
+        else:
+            couture.update((a, b, c))
+
+    # Arêtes de bord (sans triangle de l'autre côté) et points isolés
+    utilises = set()
+    for a, b, c in triangles:
+        utilises.update((a, b, c))
+        for p, q in ((a, b), (b, c), (c, a)):
+            if q * n + p not in aretes:
+                couture.add(p)
+                couture.add(q)
+    couture.update(set(range(n)) - utilises)
+
+    bordure = array("I")
+    for t in range(0, len(definitifs), 3):
+        a, b, c = definitifs[t], definitifs[t + 1], definitifs[t + 2]
+        if a in couture or b in couture or c in couture:
+            bordure.extend((a, b, c))
+
+    return (
+        definitifs.tobytes(),
+        array("I", sorted(couture)).tobytes(),
+        bordure.tobytes(),
+    )
+
+
+def parallel_delaunay(
+    points: Sequence[Tuple[float, float]],
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    min_points_bande: int = MIN_POINTS_BANDE,
+) -> List[Tuple[int, int, int]]:
+    """
+    Triangulation de Delaunay calculée par bandes sur plusieurs cœurs.
+
+    Args:
+        points: Liste de points (x, y)
+        workers: nombre de bandes (None : nombre de cœurs).
+        executor: pool à utiliser, tout objet offrant `submit` (ex.
+            `ProcessPoolExecutor` existant) ;
+            None : un pool de `workers` processus est créé pour l'appel.
+        min_points_bande: nombre minimal de points par bande ; en dessous
+            de deux bandes, le moteur mono-cœur est utilisé directement.
+
+    Returns:
+        Liste de triangles (indices dans `points`, sens trigonométrique),
+        comme `delaunay.delaunay_triangulation`.
+    """
+    n = len(points)
+    nb_bandes = workers or os.cpu_count() or 1
+    nb_bandes = min(nb_bandes, n // max(min_points_bande, 1))
+    if nb_bandes < 2:
+        return delaunay_triangulation(points)
+
+    points = [(float(x), float(y)) for x, y in points]
+
+    # Doublons : un seul exemplaire par position (le premier), sinon un
+    # sommet de couture pourrait être la copie d'un sommet déjà triangulé
+    premiers: Dict[Tuple[float, float], int] = {}
+    for i, p in enumerate(points):
+        premiers.setdefault(p, i)
+    if len(premiers) < n:
+        uniques = list(premiers.values())
+        triangles = parallel_delaunay(
+            list(premiers), workers, executor, min_points_bande
+        )
+        return [(uniques[a], uniques[b], uniques[c]) for a, b, c in triangles]
+
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    etendue = max(max(xs) - min(xs), max(ys) - min(ys))
+    tolerance = _TOLERANCE * etendue
+
+    # Bandes : même nombre de points, par abscisse croissante
+    ordre = sorted(range(n), key=points.__getitem__)
+    taille = -(-n // nb_bandes)
+    bandes = [ordre[i:i + taille] for i in range(0, n, taille)]
+
+    pool = executor
+    if pool is None:
+        pool = ProcessPoolExecutor(
+            max_workers=len(bandes),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    try:
+        futurs = []
+        for k, bande in enumerate(bandes):
+            coords = array("d")
+            for i in bande:
+                coords.extend(points[i])
+            gauche = xs[bandes[k - 1][-1]] if k > 0 else -math.inf
+            droite = xs[bandes[k + 1][0]] if k + 1 < len(bandes) else math.inf
+            futurs.append(pool.submit(
+                _trianguler_bande, coords.tobytes(), gauche, droite, tolerance
+            ))
+
+        # Indices locaux → indices globaux
+        definitifs = array("I")
+        couture: List[int] = []
+        bordure = array("I")
+        for bande, futur in zip(bandes, futurs):
+            data_definitifs, data_couture, data_bordure = futur.result()
+            definitifs.extend(
+                map(bande.__getitem__, _octets_vers_indices(data_definitifs))
+            )
+            couture.extend(
+                map(bande.__getitem__, _octets_vers_indices(data_couture))
+            )
+            bordure.extend(
+                map(bande.__getitem__, _octets_vers_indices(data_bordure))
+            )
+    finally:
+        if executor is None:
+            pool.shutdown(wait=True)
+
+    return _recoudre(points, definitifs, couture, bordure)
+
+
+def _recoudre(
+    points: List[Tuple[float, float]],
+    definitifs: array,
+    couture: List[int],
+    bordure: array,
+) -> List[Tuple[int, int, int]]:
+    """Ajoute aux triangles définitifs ceux de la couture (étape 3)."""
+    # Angles des triangles définitifs en chaque sommet de couture
+    angles: Dict[int, List[Tuple[int, int]]] = {}
+    for t in range(0, len(bordure), 3):
+        a, b, c = bordure[t], bordure[t + 1], bordure[t + 2]
+        angles.setdefault(a, []).append((b, c))
+        angles.setdefault(b, []).append((c, a))
+        angles.setdefault(c, []).append((a, b))
+
+    valeurs = iter(definitifs.tolist())
+    resultat = list(zip(valeurs, valeurs, valeurs))
+
+    sommets = [points[i] for i in couture]
+    for a, b, c in delaunay_triangulation(sommets):
+        a, b, c = couture[a], couture[b], couture[c]
+        (ax, ay), (bx, by), (cx, cy) = points[a], points[b], points[c]
+        gx = (ax + bx + cx) / 3.0
+        gy = (ay + by + cy) / 3.0
+
+        recouvert = False
+        for p, q in angles.get(a, ()):
+            (px, py), (qx, qy) = points[p], points[q]
+            if (orient2d(ax, ay, px, py, gx, gy) >= 0
+                    and orient2d(ax, ay, qx, qy, gx, gy) <= 0):
+                recouvert = True
+                break
+        if not recouvert:
+            resultat.append((a, b, c))
+
+    return resultat
@@ -0,0 +1,133 @@
+"""
+Prédicats géométriques robustes : orientation et cercle circonscrit.
+
+Un déterminant calculé naïvement en flottants peut avoir le mauvais signe
+quand les points sont presque alignés (ou presque cocycliques) : un moteur
+de triangulation prend alors des décisions incohérentes (« polygone non
+simple », maillage invalide).
+
+Les prédicats suivent l'approche adaptative de Shewchuk (« Adaptive
+Precision Floating-Point Arithmetic and Fast Robust Geometric
+Predicates », 1997) :
+- le déterminant est d'abord calculé en flottants, avec une borne
+  d'erreur a priori (fonction de la somme des valeurs absolues des
+  termes) ;
+- si sa valeur absolue dépasse la borne, son signe est certain : c'est le
+  cas courant, pour quelques opérations de plus que le calcul naïf ;
+- sinon, il est recalculé exactement. Un flottant est un rationnel
+  dyadique : `fractions.Fraction` le représente sans perte, et le calcul
+  exact donne le signe vrai.
+
+Les étapes intermédiaires de Shewchuk (expansions flottantes) ne sont pas
+reprises : en Python, le calcul exact sur `Fraction` n'intervient que sur
+les cas presque dégénérés et reste simple à vérifier.
+"""
+
+from __future__ import annotations
+from fractions import Fraction
+import math
+
+# Epsilon machine au sens de Shewchuk : 2^-53 (moitié de l'ulp de 1.0)
+_EPSILON = 2.0 ** -53
+
+# Bornes d'erreur relatives du calcul flottant (Shewchuk, ccwerrboundA et
+# iccerrboundA)
+CCW_ERRBOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+ICC_ERRBOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+
+# Plus petit flottant positif (résultat exact non nul arrondi à 0.0)
+_PLUS_PETIT = math.ulp(0.0)
+
+
+def _vers_float(exact: Fraction) -> float:
+    """Convertit un déterminant exact en flottant de même signe."""
+    valeur = float(exact)
+    if valeur == 0.0 and exact:
+        return math.copysign(_PLUS_PETIT, exact)
+    return valeur
+
+
+def orient2d(ax: float, ay: float, bx: float, by: float,
+             cx: float, cy: float) -> float:
+    """
+    Orientation du triangle (a, b, c) : > 0 si a, b, c tournent dans le
+    sens trigonométrique, < 0 dans le sens horaire, 0 s'ils sont alignés.
+
+    La valeur est (une approximation de) deux fois l'aire signée ; son
+    signe est toujours exact.
+    """
+    gauche = (ax - cx) * (by - cy)
+    droite = (ay - cy) * (bx - cx)
+    det = gauche - droite
+
+    # Termes de signes opposés (ou nul) : pas d'annulation, signe certain
+    if gauche > 0.0:
+        if droite <= 0.0:
+            return det
+        somme = gauche + droite
+    elif gauche < 0.0:
+        if droite >= 0.0:
+            return det
+        somme = -gauche - droite
+    else:
+        return det
+
+    borne = CCW_ERRBOUND * somme
+    if det >= borne or -det >= borne:
+        return det
+    return _orient2d_exact(ax, ay, bx, by, cx, cy)
+
+
+def _orient2d_exact(ax, ay, bx, by, cx, cy) -> float:
+    ax, ay, bx, by, cx, cy = map(Fraction, (ax, ay, bx, by, cx, cy))
+    return _vers_float((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def incircle(ax: float, ay: float, bx: float, by: float,
+             cx: float, cy: float, dx: float, dy: float) -> float:
+    """
+    Position de d par rapport au cercle circonscrit de (a, b, c), pris
+    dans le sens trigonométrique : > 0 si d est strictement à l'intérieur,
+    < 0 à l'extérieur, 0 sur le cercle. Le signe est toujours exact.
+    """
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    alift = adx * adx + ady * ady
+
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    blift = bdx * bdx + bdy * bdy
+
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    clift = cdx * cdx + cdy * cdy
+
+    det = (alift * (bdxcdy - cdxbdy)
+           + blift * (cdxady - adxcdy)
+           + clift * (adxbdy - bdxady))
+
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift
+                 + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    borne = ICC_ERRBOUND * permanent
+    if det > borne or -det > borne:
+        return det
+    return _incircle_exact(ax, ay, bx, by, cx, cy, dx, dy)
+
+
+def _incircle_exact(ax, ay, bx, by, cx, cy, dx, dy) -> float:
+    ax, ay, bx, by, cx, cy, dx, dy = map(
+        Fraction, (ax, ay, bx, by, cx, cy, dx, dy)
+    )
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    return _vers_float(
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
@@ -0,0 +1,134 @@
+"""
+Profilage à la demande des triangulations.
+
+Certains PointSet se triangulent bien plus lentement que d'autres de même
+taille. Pour les analyser hors ligne, le mode debug de l'API peut :
+- mesurer chaque étape d'une requête et la renvoyer dans l'en-tête
+  `Server-Timing` (`server_timing_header`) ;
+- exécuter la triangulation sous `cProfile` et conserver le profil dans
+  un répertoire borné (`ProfileStore`), sous un nom qui contient
+  l'empreinte du PointSet.
+
+Un profil se relit avec `python -m pstats <fichier>` (ou tout outil
+acceptant le format de `pstats`).
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterable, List, Tuple
+import cProfile
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+
+_EXTENSION = ".prof"
+
+# Caractères admis dans un nom de métrique Server-Timing (token HTTP)
+_HORS_TOKEN = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+def server_timing_header(mesures: Iterable[Tuple[str, float]]) -> str:
+    """
+    Valeur de l'en-tête `Server-Timing` pour des mesures (nom, secondes),
+    durées en millisecondes.
+    """
+    return ", ".join(
+        f"{_HORS_TOKEN.sub('_', nom)};dur={duree * 1000:.3f}"
+        for nom, duree in mesures
+    )
+
+
+class ProfileStore:
+    """
+    Répertoire borné de profils `cProfile`.
+
+    Args:
+        repertoire: répertoire des profils (créé au premier profil).
+        max_files: nombre maximal de profils conservés ; les plus anciens
+            sont supprimés au-delà.
+        sample_rate: proportion des demandes de profil effectivement
+            profilées (entre 0 et 1), pour limiter le surcoût en charge.
+        aleatoire: source de tirage (injectable pour les tests).
+    """
+
+    def __init__(self, repertoire: str, max_files: int = 100,
+                 sample_rate: float = 1.0,
+                 aleatoire: Callable[[], float] = random.random):
+        self.repertoire = repertoire
+        self.max_files = max_files
+        self.sample_rate = sample_rate
+        self._aleatoire = aleatoire
+        self._verrou = threading.Lock()
+
+    def sampled(self) -> bool:
+        """True si une demande de profil doit être honorée (tirage)."""
+        return self.sample_rate >= 1.0 or self._aleatoire() < self.sample_rate
+
+    def files(self) -> List[str]:
+        """Chemins des profils conservés, du plus ancien au plus récent."""
+        try:
+            noms = [nom for nom in os.listdir(self.repertoire)
+                    if nom.endswith(_EXTENSION)]
+        except FileNotFoundError:
+            return []
+        # Les noms commencent par l'horodatage : l'ordre alphabétique est
+        # l'ordre chronologique
+        return [os.path.join(self.repertoire, nom) for nom in sorted(noms)]
+
+    def profile(self, cle: str, fonction: Callable, *args):
+        """
+        Exécute `fonction(*args)` sous `cProfile` et conserve le profil,
+        même si `fonction` échoue.
+
+        Returns:
+            (résultat, nom du fichier de profil).
+        """
+        profil = cProfile.Profile()
+        try:
+            resultat = profil.runcall(fonction, *args)
+        finally:
+            nom = self.save(profil, cle)
+        return resultat, nom
+
+    def save(self, profil: cProfile.Profile, cle: str) -> str:
+        """
+        Écrit un profil nommé `<horodatage UTC>-<cle>.prof`, puis supprime les
+        plus anciens au-delà de `max_files`. Retourne le nom du fichier.
+        """
+        os.makedirs(self.repertoire, exist_ok=True)
+        secondes, nanosecondes = divmod(time.time_ns(), 10 ** 9)
+        horodatage = time.strftime("%Y%m%dT%H%M%S", time.gmtime(secondes))
+        nom = f"{horodatage}.{nanosecondes:09d}-{cle}{_EXTENSION}"
+
+        # Fichier temporaire renommé : un profil n'est jamais lu à moitié
+        descripteur, temporaire = tempfile.mkstemp(
+            dir=self.repertoire, suffix=".tmp"
+        )
+        os.close(descripteur)
+        try:
+            profil.dump_stats(temporaire)
+            os.replace(temporaire, os.path.join(self.repertoire, nom))
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.unlink(temporaire)
+            raise
+
+        with self._verrou:
+            self._evict()
+        return nom
+
+    def _evict(self) -> None:
+        """Supprime les profils les plus anciens (verrou déjà pris)."""
+        fichiers = self.files()
+        for chemin in fichiers[:max(len(fichiers) - self.max_files, 0)]:
+            try:
+                os.unlink(chemin)
+            except FileNotFoundError:
+                pass
+
+
+def default_profile_dir() -> str:
+    """Répertoire par défaut des profils, dans le répertoire temporaire."""
+    return os.path.join(tempfile.gettempdir(), "triangulator-profiles")
@@ -1,43 +1,181 @@
 from __future__ import annotations
-from typing import List, Tuple
+from array import array
+from itertools import chain
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
 import struct
+import sys
 
-Point = Tuple[float, float]
-Triangle = Tuple[int, int, int]
+from .mesh import Point, PointSet, Triangle, TriangleMesh
+from .strips import stripify, unstrip
 
+# Le format filaire est little-endian : sur une machine little-endian, les
+# tampons float32 / uint32 natifs ont exactement la même représentation et
+# peuvent être lus sans copie.
+_NATIF_LITTLE_ENDIAN = sys.byteorder == "little"
 
-def pointset_to_binary(points: List[Point]) -> bytes:
+# Taille cible (en octets) des blocs produits par l'encodeur en flux.
+TAILLE_BLOC = 1 << 16
+
+
+class PointSetTooLargeError(ValueError):
+    """Le PointSet annoncé dépasse la taille maximale autorisée."""
+
+
+# ---------------------------------------------------------------------------
+#                     CODEC TAMPONS (float32 / uint32 à plat)
+# ---------------------------------------------------------------------------
+
+def _view(data: bytes, debut: int, fin: int, code: str) -> Sequence:
     """
-    Sérialise un ensemble de points (PointSet) en binaire.
+    Vue typée (`code` : "f" ou "I") sur data[debut:fin].
 
-    Args:
-        points: liste de tuples (x, y)
+    Sans copie sur une machine little-endian ; sinon une copie `array`
+    remise dans l'ordre natif.
+    """
+    if _NATIF_LITTLE_ENDIAN:
+        return memoryview(data)[debut:fin].cast("B").cast(code)
 
-    Returns:
-        Bytes représentant le PointSet au format défini dans le sujet.
+    valeurs = array(code, bytes(data[debut:fin]))
+    valeurs.byteswap()
+    return valeurs
+
+
+def _buffer_to_bytes(valeurs: Sequence, code: str) -> bytes:
+    """Encode un tampon ou une séquence de nombres en little-endian."""
+    deja_type = (
+        isinstance(valeurs, (array, memoryview)) and _format(valeurs) == code
+    )
+    if _NATIF_LITTLE_ENDIAN and deja_type:
+        return valeurs.tobytes()
+
+    valeurs = array(code, valeurs)
+    if not _NATIF_LITTLE_ENDIAN:
+        valeurs.byteswap()
+    return valeurs.tobytes()
+
+
+def _format(valeurs) -> str:
+    """Code de type d'un `array` ou d'une `memoryview`."""
+    if isinstance(valeurs, array):
+        return valeurs.typecode
+    return valeurs.format
+
+
+def binary_to_coords(data: bytes) -> Sequence[float]:
     """
-    nb_points = len(points)
+    Décode un PointSet binaire en tampon de coordonnées à plat.
+
+    Le résultat contient x0, y0, x1, y1, ... en float32. Sur une machine
+    little-endian, c'est une `memoryview` sur `data` (aucune copie).
+
+    Raises:
+        ValueError: si les données sont trop courtes ou incohérentes.
+    """
+    if len(data) < 4:
+        raise ValueError("Données trop courtes pour contenir un PointSet.")
 
-    # 4 premiers octets : nombre de points
-    blocs = [struct.pack("<I", nb_points)]
+    (nb_points,) = struct.unpack_from("<I", data, 0)
 
-    # Ensuite, pour chaque point : X (float32) puis Y (float32)
-    for x, y in points:
-        blocs.append(struct.pack("<f", float(x)))
-        blocs.append(struct.pack("<f", float(y)))
+    taille_attendue = 4 + nb_points * 8
+    if len(data) < taille_attendue:
+        raise ValueError("Données incomplètes pour le nombre de points annoncé.")
 
-    return b"".join(blocs)
+    return _view(data, 4, taille_attendue, "f")
 
 
-def binary_to_pointset(data: bytes) -> List[Point]:
+def coords_to_points(coords: Sequence[float]) -> List[Point]:
+    """Convertit un tampon de coordonnées à plat en liste de points (x, y)."""
+    valeurs = iter(coords.tolist())
+    return list(zip(valeurs, valeurs))
+
+
+def read_pointset_stream(
+    flux: BinaryIO,
+    max_points: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    taille_bloc: int = TAILLE_BLOC,
+) -> Sequence[float]:
     """
-    Désérialise un PointSet binaire en liste de points (x, y).
+    Lit un PointSet binaire depuis un flux, sans le bufferiser au préalable.
+
+    L'en-tête (nombre de points) est lu en premier et confronté aux
+    limites avant toute allocation ; les coordonnées sont ensuite lues
+    bloc par bloc dans un tampon préalloué à la taille exacte.
 
     Args:
-        data: données binaires au format PointSet
+        flux: flux binaire (ex. `request.stream`)
+        max_points: nombre maximal de points accepté (None : illimité)
+        max_bytes: taille maximale du PointSet en octets (None : illimitée)
+        taille_bloc: taille des lectures successives, en octets.
 
     Returns:
-        Liste de points (x, y).
+        Tampon de coordonnées à plat (voir `binary_to_coords`).
+
+    Raises:
+        PointSetTooLargeError: si le PointSet annoncé dépasse les limites.
+        ValueError: si le flux est trop court ou incohérent.
+    """
+    entete = flux.read(4)
+    while 0 < len(entete) < 4:
+        suite = flux.read(4 - len(entete))
+        if not suite:
+            break
+        entete += suite
+    if len(entete) < 4:
+        raise ValueError("Données trop courtes pour contenir un PointSet.")
+
+    (nb_points,) = struct.unpack("<I", entete)
+
+    if max_points is not None and nb_points > max_points:
+        raise PointSetTooLargeError(
+            f"PointSet trop volumineux : {nb_points} points "
+            f"(maximum {max_points})."
+        )
+    if max_bytes is not None and 4 + nb_points * 8 > max_bytes:
+        raise PointSetTooLargeError(
+            f"PointSet trop volumineux : {4 + nb_points * 8} octets "
+            f"(maximum {max_bytes})."
+        )
+
+    tampon = bytearray(nb_points * 8)
+    vue = memoryview(tampon)
+    lu = 0
+    while lu < len(tampon):
+        fin = min(lu + taille_bloc, len(tampon))
+        if hasattr(flux, "readinto"):
+            n = flux.readinto(vue[lu:fin])
+        else:
+            bloc = flux.read(fin - lu)
+            n = len(bloc)
+            vue[lu:lu + n] = bloc
+        if not n:
+            raise ValueError(
+                "Données incomplètes pour le nombre de points annoncé."
+            )
+        lu += n
+
+    return _view(tampon, 0, len(tampon), "f")
+
+
+def coords_to_binary(coords: Sequence[float]) -> bytes:
+    """
+    Encode un tampon de coordonnées à plat (x0, y0, x1, y1, ...) en PointSet.
+
+    Un `array("f")` ou une `memoryview` de format "f" est recopié d'un bloc.
+    """
+    nb_points = len(coords) // 2
+    return struct.pack("<I", nb_points) + _buffer_to_bytes(coords, "f")
+
+
+def binary_to_triangle_buffers(
+    data: bytes,
+) -> Tuple[Sequence[float], Sequence[int]]:
+    """
+    Décode une structure Triangles en (coordonnées, indices) à plat.
+
+    Les coordonnées sont en float32 (x0, y0, ...), les indices en uint32
+    (a0, b0, c0, a1, ...). Sur une machine little-endian, ce sont des vues
+    sur `data` (aucune copie).
 
     Raises:
         ValueError: si les données sont trop courtes ou incohérentes.
@@ -45,26 +183,237 @@ def binary_to_pointset(data: bytes) -> List[Point]:
     if len(data) < 4:
         raise ValueError("Données trop courtes pour contenir un PointSet.")
 
-    offset = 0
+    (nb_points,) = struct.unpack_from("<I", data, 0)
 
-    # Nombre de points
-    (nb_points,) = struct.unpack_from("<I", data, offset)
-    offset += 4
+    taille_points = 4 + nb_points * 8
+    if len(data) < taille_points + 4:
+        raise ValueError("Données incomplètes pour points + triangles.")
 
-    taille_attendue = 4 + nb_points * 8  # 4 octets (count) + 8 par point
+    (nb_triangles,) = struct.unpack_from("<I", data, taille_points)
+
+    taille_attendue = taille_points + 4 + nb_triangles * 12
     if len(data) < taille_attendue:
+        raise ValueError("Données incomplètes pour la liste de triangles.")
+
+    coords = _view(data, 4, taille_points, "f")
+    indices = _view(data, taille_points + 4, taille_attendue, "I")
+    return coords, indices
+
+
+def triangle_buffers_to_binary(
+    coords: Sequence[float],
+    indices: Sequence[int],
+) -> bytes:
+    """
+    Encode des tampons à plat (coordonnées float32, indices uint32) au
+    format Triangles.
+    """
+    nb_triangles = len(indices) // 3
+    return b"".join((
+        coords_to_binary(coords),
+        struct.pack("<I", nb_triangles),
+        _buffer_to_bytes(indices, "I"),
+    ))
+
+
+def pack_pointset_into(tampon, coords: Sequence[float]) -> int:
+    """
+    Écrit un PointSet (en-tête + coordonnées) au début de `tampon`
+    (bytearray, mmap, mémoire partagée...) sans passer par un `bytes`
+    intermédiaire quand `coords` est déjà un tampon float32.
+
+    Returns:
+        Nombre d'octets écrits.
+    """
+    nb_points = len(coords) // 2
+    taille = 4 + nb_points * 8
+    struct.pack_into("<I", tampon, 0, nb_points)
+
+    if _NATIF_LITTLE_ENDIAN and isinstance(coords, (array, memoryview)) \
+            and _format(coords) == "f":
+        memoryview(tampon)[4:taille] = memoryview(coords).cast("B")
+    else:
+        memoryview(tampon)[4:taille] = _buffer_to_bytes(coords, "f")
+    return taille
+
+
+def iter_triangle_buffers_binary(
+    coords: Sequence[float],
+    indices: Sequence[int],
+    taille_bloc: int = TAILLE_BLOC,
+) -> Iterator[bytes]:
+    """
+    Équivalent en flux de `triangle_buffers_to_binary` : blocs d'au plus
+    `taille_bloc` octets, découpés directement dans les tampons.
+    """
+    yield struct.pack("<I", len(coords) // 2)
+    pas = max(2, taille_bloc // 8 * 2)
+    for debut in range(0, len(coords), pas):
+        yield _buffer_to_bytes(coords[debut:debut + pas], "f")
+
+    yield struct.pack("<I", len(indices) // 3)
+    pas = max(3, taille_bloc // 12 * 3)
+    for debut in range(0, len(indices), pas):
+        yield _buffer_to_bytes(indices[debut:debut + pas], "I")
+
+
+def typed_triangle_buffers(
+    coords: Sequence[float],
+    indices: Sequence[int],
+) -> Tuple[Sequence[float], Sequence[int]]:
+    """
+    Tampons float32 / uint32 (sans copie s'ils le sont déjà), de longueurs
+    cohérentes avec `triangles_binary_size`. Leur encodage en flux par
+    `iter_triangle_buffers_binary` ne peut alors plus échouer : à vérifier
+    avant d'annoncer la taille d'une réponse envoyée en flux.
+
+    Raises:
+        ValueError: si les longueurs sont incohérentes ou si une valeur
+            n'est pas représentable (ex. indice négatif ou hors uint32).
+    """
+    if len(coords) % 2 or len(indices) % 3:
+        raise ValueError("Tampons Triangles de longueurs incohérentes.")
+    try:
+        return _typed_buffer(coords, "f"), _typed_buffer(indices, "I")
+    except (TypeError, OverflowError) as e:
+        raise ValueError("Valeur non représentable dans Triangles.") from e
+
+
+def _typed_buffer(valeurs: Sequence, code: str) -> Sequence:
+    if isinstance(valeurs, (array, memoryview)) and _format(valeurs) == code:
+        return valeurs
+    return array(code, valeurs)
+
+
+# ---------------------------------------------------------------------------
+#                     FLUX MULTI-RÉSULTATS (TRAMES)
+# ---------------------------------------------------------------------------
+#
+# Réponse de la triangulation par lot : une suite de trames, chacune :
+#   - 2 octets : longueur L de l'identifiant (unsigned short)
+#   - L octets : identifiant du PointSet (UTF-8)
+#   - 2 octets : statut (code HTTP, unsigned short)
+#   - 4 octets : longueur P de la charge utile (unsigned long)
+#   - P octets : structure Triangles si statut 200, message d'erreur
+#                (UTF-8) sinon
+
+def frame_header(pointset_id: str, status: int, taille: int) -> bytes:
+    """En-tête d'une trame (la charge utile de `taille` octets suit)."""
+    identifiant = str(pointset_id).encode("utf-8")
+    return (
+        struct.pack("<H", len(identifiant)) + identifiant
+        + struct.pack("<HI", status, taille)
+    )
+
+
+def frame_to_binary(pointset_id: str, status: int, payload: bytes) -> bytes:
+    """Encode une trame complète."""
+    return frame_header(pointset_id, status, len(payload)) + payload
+
+
+def binary_to_frames(data: bytes) -> List[Tuple[str, int, bytes]]:
+    """
+    Décode un flux de trames en liste de (identifiant, statut, charge).
+
+    Raises:
+        ValueError: si une trame est tronquée.
+    """
+    trames = []
+    offset = 0
+    while offset < len(data):
+        if len(data) < offset + 2:
+            raise ValueError("Trame tronquée.")
+        (longueur,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+
+        if len(data) < offset + longueur + 6:
+            raise ValueError("Trame tronquée.")
+        identifiant = bytes(data[offset:offset + longueur]).decode("utf-8")
+        offset += longueur
+        status, taille = struct.unpack_from("<HI", data, offset)
+        offset += 6
+
+        if len(data) < offset + taille:
+            raise ValueError("Trame tronquée.")
+        trames.append((identifiant, status, bytes(data[offset:offset + taille])))
+        offset += taille
+
+    return trames
+
+
+# ---------------------------------------------------------------------------
+#                        LOCALISATION DE POINTS
+# ---------------------------------------------------------------------------
+#
+# Réponse de la localisation : 4 octets (unsigned long) de nombre de points,
+# puis pour chaque point l'indice (signed long) du triangle qui le contient,
+# -1 s'il est hors de la triangulation.
+
+def locations_to_binary(locations: Sequence[int]) -> bytes:
+    """Encode les indices de triangles d'une localisation."""
+    return struct.pack("<I", len(locations)) + _buffer_to_bytes(locations, "i")
+
+
+def binary_to_locations(data: bytes) -> Sequence[int]:
+    """
+    Décode une réponse de localisation en tampon d'indices (int32) ; sans
+    copie sur une machine little-endian.
+
+    Raises:
+        ValueError: si les données sont trop courtes ou incohérentes.
+    """
+    if len(data) < 4:
+        raise ValueError("Données trop courtes pour une localisation.")
+
+    (nb_points,) = struct.unpack_from("<I", data, 0)
+    if len(data) < 4 + nb_points * 4:
         raise ValueError("Données incomplètes pour le nombre de points annoncé.")
 
-    points: List[Point] = []
+    return _view(data, 4, 4 + nb_points * 4, "i")
+
+
+# ---------------------------------------------------------------------------
+#                        API LISTES (tuples Python)
+# ---------------------------------------------------------------------------
 
-    for _ in range(nb_points):
-        x = struct.unpack_from("<f", data, offset)[0]
-        offset += 4
-        y = struct.unpack_from("<f", data, offset)[0]
-        offset += 4
-        points.append((x, y))
+def pointset_to_binary(points: List[Point]) -> bytes:
+    """
+    Sérialise un ensemble de points (PointSet) en binaire.
+
+    Args:
+        points: liste de tuples (x, y), ou `PointSet` (recopié d'un bloc)
+
+    Returns:
+        Bytes représentant le PointSet au format défini dans le sujet.
+    """
+    if isinstance(points, PointSet):
+        return coords_to_binary(points.coords)
+
+    nb_points = len(points)
+
+    # 4 premiers octets : nombre de points, puis X et Y (float32) par point.
+    # Un seul appel à struct.pack pour tout l'ensemble.
+    return struct.pack(
+        f"<I{2 * nb_points}f",
+        nb_points,
+        *map(float, chain.from_iterable(points)),
+    )
+
+
+def binary_to_pointset(data: bytes) -> List[Point]:
+    """
+    Désérialise un PointSet binaire en liste de points (x, y).
+
+    Args:
+        data: données binaires au format PointSet
+
+    Returns:
+        Liste de points (x, y).
 
-    return points
+    Raises:
+        ValueError: si les données sont trop courtes ou incohérentes.
+    """
+    return coords_to_points(binary_to_coords(data))
 
 
 def triangles_to_binary(points: List[Point], triangles: List[Triangle]) -> bytes:
@@ -75,35 +424,90 @@ def triangles_to_binary(points: List[Point], triangles: List[Triangle]) -> bytes
     la deuxième partie est la liste des triangles sous forme d'indices.
 
     Args:
-        points: liste de sommets (x, y)
-        triangles: liste de triangles (a, b, c) où a, b, c sont des indices dans points.
+        points: liste de sommets (x, y), ou `PointSet`
+        triangles: liste de triangles (a, b, c) où a, b, c sont des indices
+            dans points, ou `TriangleMesh` (ses indices sont recopiés d'un bloc)
 
     Returns:
         Bytes représentant la structure Triangles.
     """
+    if isinstance(triangles, TriangleMesh):
+        return pointset_to_binary(points) + struct.pack(
+            "<I", len(triangles)
+        ) + _buffer_to_bytes(triangles.indices, "I")
+
     nb_triangles = len(triangles)
 
     # Première partie : les points (PointSet)
-    blocs = [pointset_to_binary(points)]
+    # Deuxième partie : nombre de triangles puis 3 x uint32 par triangle
+    return pointset_to_binary(points) + struct.pack(
+        f"<I{3 * nb_triangles}I",
+        nb_triangles,
+        *map(int, chain.from_iterable(triangles)),
+    )
 
-    # Deuxième partie : nombre de triangles
-    blocs.append(struct.pack("<I", nb_triangles))
 
-    # Puis pour chaque triangle : 3 x unsigned int 32 bits
-    for a, b, c in triangles:
-        blocs.append(struct.pack("<I", int(a)))
-        blocs.append(struct.pack("<I", int(b)))
-        blocs.append(struct.pack("<I", int(c)))
+def triangles_binary_size(nb_points: int, nb_triangles: int) -> int:
+    """Taille en octets de la structure Triangles, connue sans l'encoder."""
+    return 4 + nb_points * 8 + 4 + nb_triangles * 12
 
-    return b"".join(blocs)
 
+def iter_triangles_binary(
+    points: List[Point],
+    triangles: List[Triangle],
+    taille_bloc: int = TAILLE_BLOC,
+) -> Iterator[bytes]:
+    """
+    Encode une structure Triangles par blocs d'au plus `taille_bloc` octets.
+
+    Produit le même flux d'octets que `triangles_to_binary`, sans jamais
+    le matérialiser entièrement : la mémoire utilisée reste bornée quelle
+    que soit la taille du maillage.
+
+    Args:
+        points: liste de sommets (x, y)
+        triangles: liste de triangles (a, b, c)
+        taille_bloc: taille cible des blocs, en octets.
 
-def binary_to_triangles(data: bytes) -> Tuple[List[Point], List[Triangle]]:
+    Yields:
+        Les blocs successifs du format Triangles.
+    """
+    if isinstance(points, PointSet) and isinstance(triangles, TriangleMesh):
+        yield from iter_triangle_buffers_binary(
+            points.coords, triangles.indices, taille_bloc
+        )
+        return
+
+    # Première partie : les points (PointSet)
+    yield struct.pack("<I", len(points))
+    par_bloc = max(1, taille_bloc // 8)
+    for debut in range(0, len(points), par_bloc):
+        bloc = points[debut:debut + par_bloc]
+        yield struct.pack(
+            f"<{2 * len(bloc)}f", *map(float, chain.from_iterable(bloc))
+        )
+
+    # Deuxième partie : les triangles
+    yield struct.pack("<I", len(triangles))
+    par_bloc = max(1, taille_bloc // 12)
+    for debut in range(0, len(triangles), par_bloc):
+        bloc = triangles[debut:debut + par_bloc]
+        yield struct.pack(
+            f"<{3 * len(bloc)}I", *map(int, chain.from_iterable(bloc))
+        )
+
+
+def binary_to_triangles(
+    data: bytes,
+    indices_format: str = "uint32",
+) -> Tuple[List[Point], List[Triangle]]:
     """
     Désérialise une structure Triangles en (points, triangles).
 
     Args:
         data: données binaires au format Triangles.
+        indices_format: format de la liste des triangles, parmi
+            `TRIANGLE_INDEX_FORMATS` (voir les variantes compactes).
 
     Returns:
         Tuple (points, triangles) où :
@@ -113,46 +517,192 @@ def binary_to_triangles(data: bytes) -> Tuple[List[Point], List[Triangle]]:
     Raises:
         ValueError: si les données sont trop courtes ou incohérentes.
     """
-    if len(data) < 4:
-        raise ValueError("Données trop courtes pour contenir un PointSet.")
+    coords, indices = binary_to_compact_triangle_buffers(data, indices_format)
 
-    offset = 0
-
-    # Lire le nombre de points
-    (nb_points,) = struct.unpack_from("<I", data, offset)
-    offset += 4
+    points = coords_to_points(coords)
 
-    # Taille de la partie PointSet
-    taille_points = 4 + nb_points * 8
-    if len(data) < taille_points + 4:
-        raise ValueError("Données incomplètes pour points + triangles.")
+    valeurs = iter(indices.tolist())
+    triangles = list(zip(valeurs, valeurs, valeurs))
 
-    # On réutilise binary_to_pointset pour la première partie
-    points = binary_to_pointset(data[:taille_points])
-
-    offset = taille_points
-
-    # Nombre de triangles
-    (nb_triangles,) = struct.unpack_from("<I", data, offset)
-    offset += 4
-
-    triangles: List[Triangle] = []
+    return points, triangles
 
-    taille_attendue = taille_points + 4 + nb_triangles * 12
-    if len(data) < taille_attendue:
-        raise ValueError("Données incomplètes pour la liste de triangles.")
 
-    for _ in range(nb_triangles):
-        a = struct.unpack_from("<I", data, offset)[0]
-        offset += 4
-        b = struct.unpack_from("<I", data, offset)[0]
-        offset += 4
-        c = struct.unpack_from("<I", data, offset)[0]
-        offset += 4
-        triangles.append((a, b, c))
+# ---------------------------------------------------------------------------
+#                    VARIANTES COMPACTES DES TRIANGLES
+# ---------------------------------------------------------------------------
+#
+# Le PointSet est inchangé ; seule la liste des triangles change de format
+# (paramètre `indices` du type de média, "uint32" étant le format ci-dessus) :
+#   - uint16 : 4 octets de nombre de triangles, puis 3 x uint16 par triangle
+#              (PointSet de moins de 65536 points seulement) ;
+#   - varint : 4 octets de nombre de triangles, puis les 3 indices de chaque
+#              triangle, chacun codé par son écart à l'indice précédent
+#              (zigzag, puis varint LEB128 : 1 octet de -64 à 63) ;
+#   - strip  : 4 octets de nombre de triangles, 4 octets de nombre de bandes
+#              (voir `triangulator.strips`), puis pour chaque bande son
+#              nombre de sommets (varint) et ses sommets (écarts en varint,
+#              la suite des écarts continuant d'une bande à l'autre).
+# Les triangles d'une structure "strip" sont restitués dans l'ordre des
+# bandes, chacun à une rotation près de ses sommets (même orientation).
+
+TRIANGLE_INDEX_FORMATS = ("uint32", "uint16", "varint", "strip")
+
+# Nombre maximal d'octets d'un varint (entier sur 35 bits)
+_VARINT_MAX = 5
+
+
+def _ecarts_zigzag(valeurs: Sequence[int], sortie: List[int],
+                   precedent: int = 0) -> int:
+    """
+    Ajoute à `sortie` les écarts successifs de `valeurs` en zigzag
+    (0, -1, 1, -2... -> 0, 1, 2, 3...) ; retourne la dernière valeur.
+    """
+    for v in valeurs:
+        d = v - precedent
+        precedent = v
+        sortie.append(d << 1 if d >= 0 else (-d << 1) - 1)
+    return precedent
+
+
+def _varints(entiers: Sequence[int]) -> bytes:
+    """Encode des entiers positifs en varints LEB128."""
+    sortie = bytearray()
+    for z in entiers:
+        while z >= 0x80:
+            sortie.append((z & 0x7F) | 0x80)
+            z >>= 7
+        sortie.append(z)
+    return bytes(sortie)
+
+
+def _lire_varint(data, position: int) -> Tuple[int, int]:
+    """Lit un varint : (valeur, position suivante)."""
+    valeur = 0
+    for k in range(_VARINT_MAX):
+        if position >= len(data):
+            raise ValueError("Données incomplètes pour la liste de triangles.")
+        octet = data[position]
+        position += 1
+        valeur |= (octet & 0x7F) << (7 * k)
+        if octet < 0x80:
+            return valeur, position
+    raise ValueError("Varint trop long.")
+
+
+def _lire_indices(data, position: int, nombre: int, indices: array,
+                  precedent: int) -> Tuple[int, int]:
+    """
+    Lit `nombre` indices codés en écarts zigzag, ajoutés à `indices` ;
+    retourne (position suivante, dernier indice).
+    """
+    for _ in range(nombre):
+        z, position = _lire_varint(data, position)
+        precedent += (z >> 1) ^ -(z & 1)
+        indices.append(precedent)
+    return position, precedent
+
+
+def triangle_buffers_to_compact_binary(
+    coords: Sequence[float],
+    indices: Sequence[int],
+    indices_format: str,
+) -> bytes:
+    """
+    Encode des tampons à plat au format Triangles, liste des triangles au
+    format `indices_format` (parmi `TRIANGLE_INDEX_FORMATS`).
 
-    return points, triangles
+    Raises:
+        ValueError: format inconnu, ou "uint16" avec 65536 points ou plus.
+    """
+    nb_points = len(coords) // 2
+    nb_triangles = len(indices) // 3
+    entete = coords_to_binary(coords) + struct.pack("<I", nb_triangles)
+
+    if indices_format == "uint32":
+        return entete + _buffer_to_bytes(indices, "I")
+
+    if indices_format == "uint16":
+        if nb_points >= 0x10000:
+            raise ValueError("Indices uint16 : moins de 65536 points requis.")
+        return entete + _buffer_to_bytes(indices, "H")
+
+    if indices_format == "varint":
+        ecarts: List[int] = []
+        _ecarts_zigzag(indices, ecarts)
+        return entete + _varints(ecarts)
+
+    if indices_format == "strip":
+        bandes = stripify(indices)
+        entiers: List[int] = []
+        precedent = 0
+        for bande in bandes:
+            entiers.append(len(bande))
+            precedent = _ecarts_zigzag(bande, entiers, precedent)
+        return entete + struct.pack("<I", len(bandes)) + _varints(entiers)
+
+    raise ValueError(f"Format d'indices inconnu : {indices_format}")
+
+
+def binary_to_compact_triangle_buffers(
+    data: bytes,
+    indices_format: str,
+) -> Tuple[Sequence[float], Sequence[int]]:
+    """
+    Décode une structure Triangles dont la liste des triangles est au
+    format `indices_format`, en (coordonnées, indices) à plat comme
+    `binary_to_triangle_buffers`.
 
+    Raises:
+        ValueError: si les données sont trop courtes ou incohérentes, ou
+            si le format est inconnu.
+    """
+    if indices_format == "uint32":
+        return binary_to_triangle_buffers(data)
+    if indices_format not in TRIANGLE_INDEX_FORMATS:
+        raise ValueError(f"Format d'indices inconnu : {indices_format}")
+
+    coords = binary_to_coords(data)
+    position = 4 + len(coords) * 4
+    if len(data) < position + 4:
+        raise ValueError("Données incomplètes pour points + triangles.")
+    (nb_triangles,) = struct.unpack_from("<I", data, position)
+    position += 4
+
+    if indices_format == "uint16":
+        fin = position + nb_triangles * 6
+        if len(data) < fin:
+            raise ValueError("Données incomplètes pour la liste de triangles.")
+        return coords, array("I", _view(data, position, fin, "H"))
+
+    indices = array("I")
+    try:
+        if indices_format == "varint":
+            _lire_indices(data, position, 3 * nb_triangles, indices, 0)
+            return coords, indices
+
+        if len(data) < position + 4:
+            raise ValueError("Données incomplètes pour la liste de bandes.")
+        (nb_bandes,) = struct.unpack_from("<I", data, position)
+        position += 4
+
+        bandes = []
+        precedent = 0
+        for _ in range(nb_bandes):
+            taille, position = _lire_varint(data, position)
+            if taille < 3:
+                raise ValueError("Bande de moins de 3 sommets.")
+            bande = array("I")
+            position, precedent = _lire_indices(
+                data, position, taille, bande, precedent
+            )
+            bandes.append(bande)
+    except OverflowError:
+        raise ValueError("Indice de triangle hors limites.")
+
+    indices.extend(chain.from_iterable(unstrip(bandes)))
+    if len(indices) != 3 * nb_triangles:
+        raise ValueError("Nombre de triangles incohérent avec les bandes.")
+    return coords, indices
 
 
 #Module de sérialisation / désérialisation pour les structures
@@ -0,0 +1,78 @@
+"""
+Regroupement des appels concurrents identiques (« single-flight »).
+
+Quand plusieurs threads demandent le même travail (même clé) en même
+temps, seul le premier l'exécute ; les suivants attendent son résultat.
+Une exception levée par le premier est relancée chez chacun d'eux.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+
+
+class _Appel:
+    """Un travail en cours et son issue."""
+
+    def __init__(self):
+        self.termine = threading.Event()
+        self.resultat: Any = None
+        self.erreur: Optional[BaseException] = None
+        self.partages = 0
+
+
+class SingleFlight:
+    """Exécute au plus un travail à la fois par clé."""
+
+    def __init__(self):
+        self._en_cours: Dict[Hashable, _Appel] = {}
+        self._verrou = threading.Lock()
+        self.executions = 0
+        self.partages = 0
+
+    def do(self, cle: Hashable, fonction: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Exécute `fonction` pour `cle`, ou attend l'exécution déjà en cours.
+
+        Returns:
+            (résultat, partagé) : partagé vaut True si le résultat vient
+            d'une exécution lancée par un autre appelant.
+
+        Raises:
+            L'exception levée par `fonction`, pour chacun des appelants.
+        """
+        with self._verrou:
+            appel = self._en_cours.get(cle)
+            if appel is not None:
+                appel.partages += 1
+                self.partages += 1
+                meneur = False
+            else:
+                appel = self._en_cours[cle] = _Appel()
+                self.executions += 1
+                meneur = True
+
+        if not meneur:
+            appel.termine.wait()
+            if appel.erreur is not None:
+                raise appel.erreur
+            return appel.resultat, True
+
+        try:
+            appel.resultat = fonction()
+        except BaseException as e:
+            appel.erreur = e
+            raise
+        finally:
+            # Les appels suivants relancent le travail : le résultat n'est
+            # partagé qu'avec les appelants arrivés pendant son exécution.
+            with self._verrou:
+                del self._en_cours[cle]
+            appel.termine.set()
+
+        return appel.resultat, False
+
+    def in_flight(self) -> int:
+        """Nombre de travaux en cours."""
+        with self._verrou:
+            return len(self._en_cours)
@@ -0,0 +1,95 @@
+"""
+Décomposition d'un maillage en bandes de triangles (« triangle strips »).
+
+Une bande est une suite de sommets s0, s1, s2, ... où chaque sommet à
+partir du troisième ajoute un triangle formé avec les deux précédents :
+t triangles coûtent t + 2 indices au lieu de 3t. L'orientation alterne
+d'un triangle au suivant ; pour la conserver, le triangle i d'une bande
+est (s[i], s[i+1], s[i+2]) si i est pair, (s[i+1], s[i], s[i+2]) sinon.
+
+`stripify` construit les bandes par un parcours glouton des triangles
+voisins (arête commune), en O(n) ; `unstrip` reconstruit les triangles.
+Chaque triangle est restitué avec la même orientation, à une rotation
+près de ses sommets ; l'ordre des triangles suit celui des bandes.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+
+
+def stripify(indices: Sequence[int]) -> List[List[int]]:
+    """
+    Bandes couvrant chaque triangle une fois exactement.
+
+    Args:
+        indices: indices à plat (a0, b0, c0, a1, ...).
+
+    Returns:
+        Liste de bandes (listes d'au moins 3 sommets).
+    """
+    indices = list(indices)
+    nb_triangles = len(indices) // 3
+    if not nb_triangles:
+        return []
+    n = max(indices) + 1
+
+    # Arête orientée a -> b (clé a * n + b) : (triangle, troisième sommet)
+    aretes: Dict[int, Tuple[int, int]] = {}
+    for t in range(nb_triangles):
+        a, b, c = indices[3 * t:3 * t + 3]
+        aretes[a * n + b] = (t, c)
+        aretes[b * n + c] = (t, a)
+        aretes[c * n + a] = (t, b)
+
+    utilise = bytearray(nb_triangles)
+
+    def voisin(p: int, q: int) -> int:
+        """Troisième sommet du triangle libre portant l'arête p -> q, ou -1."""
+        trouve = aretes.get(p * n + q)
+        if trouve is None or utilise[trouve[0]]:
+            return -1
+        utilise[trouve[0]] = 1
+        return trouve[1]
+
+    def libre(p: int, q: int) -> bool:
+        trouve = aretes.get(p * n + q)
+        return trouve is not None and not utilise[trouve[0]]
+
+    bandes: List[List[int]] = []
+    for t in range(nb_triangles):
+        if utilise[t]:
+            continue
+        utilise[t] = 1
+        a, b, c = indices[3 * t:3 * t + 3]
+
+        # Rotation de départ : celle dont l'arête (b, c) a un voisin libre
+        for rotation in ((a, b, c), (b, c, a), (c, a, b)):
+            if libre(rotation[2], rotation[1]):
+                a, b, c = rotation
+                break
+        bande = [a, b, c]
+
+        # Triangle i pair : arête s[i+1] -> s[i+2] ; impair : l'inverse
+        while True:
+            p, q = bande[-2], bande[-1]
+            if len(bande) % 2:
+                suivant = voisin(q, p)
+            else:
+                suivant = voisin(p, q)
+            if suivant < 0:
+                break
+            bande.append(suivant)
+        bandes.append(bande)
+    return bandes
+
+
+def unstrip(bandes: Sequence[Sequence[int]]) -> List[Tuple[int, int, int]]:
+    """Triangles des bandes, dans l'ordre des bandes."""
+    triangles: List[Tuple[int, int, int]] = []
+    for bande in bandes:
+        for i in range(len(bande) - 2):
+            if i % 2:
+                triangles.append((bande[i + 1], bande[i], bande[i + 2]))
+            else:
+                triangles.append((bande[i], bande[i + 1], bande[i + 2]))
+    return triangles
@@ -4,7 +4,12 @@ Ce module fournit les briques mathématiques nécessaires à la triangulation.
 """
 
 from __future__ import annotations
-from typing import List, Tuple
+from itertools import chain, compress, repeat
+from operator import ge, gt, le, lt, not_
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .mesh import PointSet, TriangleMesh
+from .predicates import CCW_ERRBOUND, orient2d
 
 
 def validate_triangle_indices(
@@ -42,15 +47,12 @@ def triangle_area(p1: Tuple[float, float],
 
     Aire = |(x1(y2 - y3) + x2(y3 - y1) + x3(y1 - y2)) / 2|
 
-    Retourne une valeur positive, ou 0 si les points sont alignés.
+    Retourne une valeur positive, ou 0 si et seulement si les points sont
+    alignés (voir `predicates.orient2d`).
     """
     (x1, y1), (x2, y2), (x3, y3) = p1, p2, p3
 
-    return abs(
-        x1 * (y2 - y3)
-        + x2 * (y3 - y1)
-        + x3 * (y1 - y2)
-    ) / 2.0
+    return abs(orient2d(x1, y1, x2, y2, x3, y3)) / 2.0
 
 
 def are_points_collinear(p1: Tuple[float, float],
@@ -60,9 +62,12 @@ def are_points_collinear(p1: Tuple[float, float],
     """
     Retourne True si les trois points sont alignés.
 
-    On considère que l’aire ≈ 0 implique colinéarité.
+    On considère que l’aire < `epsilon` implique colinéarité ; avec
+    `epsilon=0.0`, le test est exact (voir `predicates.orient2d`).
     """
-    return triangle_area(p1, p2, p3) < epsilon
+    if epsilon > 0:
+        return triangle_area(p1, p2, p3) < epsilon
+    return orient2d(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1]) == 0
 
 
 def validate_triangulation(points: List[Tuple[float, float]],
@@ -73,13 +78,180 @@ def validate_triangulation(points: List[Tuple[float, float]],
     Conditions :
     - Chaque triangle doit avoir des indices valides.
     - Aucun triangle ne doit être dégénéré (aire = 0).
+
+    Voir `validate_triangle_buffers` pour le rapport détaillé.
     """
-    for a, b, c in triangles:
-        if not validate_triangle_indices(points, a, b, c):
-            return False
+    coords = (points.coords if isinstance(points, PointSet)
+              else list(chain.from_iterable(points)))
+    indices = (triangles.indices if isinstance(triangles, TriangleMesh)
+               else list(chain.from_iterable(triangles)))
 
-        p1, p2, p3 = points[a], points[b], points[c]
-        if are_points_collinear(p1, p2, p3):
-            return False
+    rapport = validate_triangle_buffers(
+        coords, indices, orientation=False, duplicates=False
+    )
+    return not (rapport.out_of_bounds or rapport.repeated_indices
+                or rapport.degenerate)
 
-    return True
+
+# ---------------------------------------------------------------------------
+#                     VALIDATION PAR LOTS (tampons à plat)
+# ---------------------------------------------------------------------------
+#
+# Les contrôles sont des passes sur des colonnes entières (indices a, b, c
+# extraits par tranches des tampons à plat) : min / max / sum / compress
+# tournent en C, les calculs par triangle sont des compréhensions sans
+# appel de fonction. Sans dépendance numérique (numpy n'est pas une
+# dépendance autorisée), c'est la forme la plus rapide en Python pur.
+
+class ValidationReport:
+    """
+    Rapport de validation : numéros des triangles fautifs, par contrôle.
+
+    Attributs :
+    - out_of_bounds : indice de sommet hors de [0, nb_points) ;
+    - repeated_indices : deux sommets identiques (même indice) ;
+    - degenerate : aire inférieure à `epsilon` (points alignés) ;
+    - flipped : orientation opposée à celle de la majorité ;
+    - duplicates : même triangle déjà présent (à permutation près).
+
+    Un triangle hors bornes n'est soumis à aucun autre contrôle ; un
+    triangle dégénéré n'a pas d'orientation.
+    """
+
+    __slots__ = ("nb_triangles", "orientation", "out_of_bounds",
+                 "repeated_indices", "degenerate", "flipped", "duplicates")
+
+    def __init__(self, nb_triangles: int):
+        self.nb_triangles = nb_triangles
+        # 1 : sens trigonométrique majoritaire, -1 : horaire, 0 : aucun
+        self.orientation = 0
+        self.out_of_bounds: List[int] = []
+        self.repeated_indices: List[int] = []
+        self.degenerate: List[int] = []
+        self.flipped: List[int] = []
+        self.duplicates: List[int] = []
+
+    @property
+    def valid(self) -> bool:
+        """True si aucun contrôle n'a relevé de triangle fautif."""
+        return not (self.out_of_bounds or self.repeated_indices
+                    or self.degenerate or self.flipped or self.duplicates)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation JSON du rapport."""
+        rapport = {nom: getattr(self, nom) for nom in self.__slots__}
+        rapport["valid"] = self.valid
+        return rapport
+
+
+def _colonne(tampon: Sequence, debut: int, pas: int) -> list:
+    """Colonne tampon[debut::pas] sous forme de liste Python."""
+    colonne = tampon[debut::pas]
+    return colonne.tolist() if hasattr(colonne, "tolist") else list(colonne)
+
+
+def validate_triangle_buffers(
+    coords: Sequence[float],
+    indices: Sequence[int],
+    epsilon: float = 1e-10,
+    orientation: bool = True,
+    duplicates: bool = True,
+) -> ValidationReport:
+    """
+    Valide une triangulation donnée sous forme de tampons à plat :
+    coordonnées (x0, y0, x1, ...) et indices (a0, b0, c0, a1, ...), par
+    ex. `PointSet.coords` et `TriangleMesh.indices`.
+
+    Args:
+        epsilon: aire en dessous de laquelle un triangle est dégénéré
+            (0.0 : seuls les triangles exactement plats le sont).
+        orientation: contrôler la cohérence des orientations.
+        duplicates: rechercher les triangles en double.
+
+    Returns:
+        Un `ValidationReport` (voir ses attributs pour les contrôles).
+    """
+    nb_points = len(coords) // 2
+    nb_triangles = len(indices) // 3
+    rapport = ValidationReport(nb_triangles)
+    if not nb_triangles:
+        return rapport
+
+    a = _colonne(indices, 0, 3)
+    b = _colonne(indices, 1, 3)
+    c = _colonne(indices, 2, 3)
+    numeros = range(nb_triangles)
+
+    # Bornes : un min / max sur le tampon suffit dans le cas courant
+    if min(indices) < 0 or max(indices) >= nb_points:
+        hors = [not (0 <= i < nb_points and 0 <= j < nb_points
+                     and 0 <= k < nb_points) for i, j, k in zip(a, b, c)]
+        rapport.out_of_bounds = list(compress(numeros, hors))
+        # Les triangles hors bornes sont retirés des passes suivantes
+        gardes = [not h for h in hors]
+        numeros = list(compress(numeros, gardes))
+        a = list(compress(a, gardes))
+        b = list(compress(b, gardes))
+        c = list(compress(c, gardes))
+
+    # Indices distincts
+    repetes = [i == j or j == k or k == i for i, j, k in zip(a, b, c)]
+    if any(repetes):
+        rapport.repeated_indices = list(compress(numeros, repetes))
+
+    # Aire signée (x2), calculée comme `orient2d`
+    xs = _colonne(coords, 0, 2)
+    ys = _colonne(coords, 1, 2)
+    aires = [
+        (xs[i] - xs[k]) * (ys[j] - ys[k]) - (ys[i] - ys[k]) * (xs[j] - xs[k])
+        for i, j, k in zip(a, b, c)
+    ]
+
+    # Filtre : au-delà de la borne d'erreur de `orient2d` (majorée avec
+    # l'étendue des points), le signe est certain ; les rares triangles
+    # presque plats sont recalculés avec le prédicat exact
+    if xs:
+        etendue = (max(xs) - min(xs)) * (max(ys) - min(ys))
+        borne = 4.0 * CCW_ERRBOUND * etendue
+        douteux = map(le, map(abs, aires), repeat(borne))
+        for t in compress(range(len(aires)), douteux):
+            i, j, k = a[t], b[t], c[t]
+            aires[t] = orient2d(xs[i], ys[i], xs[j], ys[j], xs[k], ys[k])
+
+    # Dégénérés : |aire| / 2 < epsilon (voir `are_points_collinear`)
+    seuil = 2 * epsilon
+    if seuil > 0:
+        degeneres = map(gt, repeat(seuil), map(abs, aires))
+    else:
+        degeneres = map(not_, aires)
+    rapport.degenerate = list(compress(numeros, degeneres))
+
+    # Orientation : celle de la majorité des triangles non dégénérés
+    if orientation:
+        if seuil > 0:
+            positifs = list(map(ge, aires, repeat(seuil)))
+            negatifs = list(map(le, aires, repeat(-seuil)))
+        else:
+            positifs = list(map(gt, aires, repeat(0.0)))
+            negatifs = list(map(lt, aires, repeat(0.0)))
+        nb_positifs = sum(positifs)
+        nb_negatifs = sum(negatifs)
+        if nb_positifs or nb_negatifs:
+            rapport.orientation = 1 if nb_positifs >= nb_negatifs else -1
+            minorite = negatifs if rapport.orientation == 1 else positifs
+            rapport.flipped = list(compress(numeros, minorite))
+
+    # Doublons : les polynômes symétriques (somme, somme des produits deux
+    # à deux, produit) identifient un triplet à permutation près ; ils
+    # sont codés en un seul entier
+    if duplicates:
+        m1 = 3 * nb_points
+        m2 = 3 * nb_points * nb_points
+        cles = [(i * j * k * m2 + i * j + j * k + k * i) * m1 + i + j + k
+                for i, j, k in zip(a, b, c)]
+        if len(set(cles)) != len(cles):
+            vues = set()
+            doublons = [cle in vues or vues.add(cle) for cle in cles]
+            rapport.duplicates = list(compress(numeros, doublons))
+
+    return rapport
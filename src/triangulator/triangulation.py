@@ -1,42 +1,91 @@
 """
 Module d’algorithme de triangulation.
 
-Cette implémentation utilise une version simplifiée de l’algorithme
-Ear-Clipping, suffisant pour le cadre du TP.
+Quatre moteurs sont disponibles :
+- "ear_clipping" (par défaut) : version simplifiée de l’algorithme
+  Ear-Clipping, qui traite les points comme un polygone ;
+- "earcut" : Ear-Clipping sur anneau chaîné avec index en ordre z (voir
+  `triangulator.earcut`), presque linéaire sur les polygones usuels ;
+- "delaunay" : triangulation de Delaunay de l’ensemble de points
+  (Bowyer–Watson, voir `triangulator.delaunay`), proche de O(n log n) ;
+- "delaunay_parallel" : la même triangulation, calculée par bandes sur
+  plusieurs cœurs pour les gros ensembles (voir `triangulator.parallel`).
+
+Une pré-analyse en O(n log n) (enveloppe convexe, voir
+`triangulator.hull`) traite d'abord les cas simples : points tous alignés
+(aucun triangle) et, pour les moteurs de polygone, polygone convexe
+(triangulation en éventail, O(n)).
 """
 
 from __future__ import annotations
-from typing import List, Tuple
-from .triangles import triangle_area, are_points_collinear
+from concurrent.futures import Executor
+from typing import List, Optional, Tuple
+from .hull import convex_hull, fast_path_triangulation
+from .mesh import PointSet
+from .predicates import orient2d
+from .triangles import triangle_area
+
+METHODS = ("ear_clipping", "earcut", "delaunay", "delaunay_parallel")
 
 
 def simple_triangulation(
-    points: List[Tuple[float, float]]
+    points: List[Tuple[float, float]],
+    method: str = "ear_clipping",
+    executor: Optional[Executor] = None,
 ) -> List[Tuple[int, int, int]]:
     """
     Calcule une triangulation simple d’un ensemble de points.
 
     Args:
-        points: Liste de points (x, y)
+        points: Liste de points (x, y), ou `PointSet`
+        method: Moteur de triangulation, parmi `METHODS`.
+        executor: pool des bandes de "delaunay_parallel" (None : pool
+            créé pour l'appel, voir `parallel.parallel_delaunay`).
 
     Returns:
         Liste de triangles sous forme de triplets d’indices.
 
     Raises:
-        ValueError: Si moins de 3 points ou si tous les points sont alignés.
+        ValueError: Si moins de 3 points, si la méthode est inconnue ou
+            si tous les points sont alignés.
     """
+    if method not in METHODS:
+        raise ValueError(f"Méthode de triangulation inconnue : {method}.")
+
+    # Les moteurs accèdent aux points un par un : une seule conversion
+    if isinstance(points, PointSet):
+        points = points.tolist()
 
     # Minimum requis
     if len(points) < 3:
         raise ValueError("Impossible de trianguler : moins de 3 points.")
 
-    # Vérifier si colinéaires
-    collinear_count = 0
-    for i in range(len(points) - 2):
-        if are_points_collinear(points[i], points[i + 1], points[i + 2]):
-            collinear_count += 1
-    if collinear_count == len(points) - 2:
-        return []
+    if method in ("delaunay", "delaunay_parallel"):
+        # Points tous alignés : aucun triangle
+        if len(convex_hull(points)) < 3:
+            return []
+        if method == "delaunay_parallel":
+            from .parallel import parallel_delaunay
+            return parallel_delaunay(points, executor=executor)
+        from .delaunay import delaunay_triangulation
+        return delaunay_triangulation(points)
+
+    # Polygone convexe ou points alignés : pas besoin du moteur général
+    triangles = fast_path_triangulation(points)
+    if triangles is not None:
+        return triangles
+
+    if method == "earcut":
+        from .earcut import earcut_triangulation
+        return earcut_triangulation(points)
+
+    return _ear_clipping(points)
+
+
+def _ear_clipping(
+    points: List[Tuple[float, float]]
+) -> List[Tuple[int, int, int]]:
+    """Triangulation par Ear-Clipping (points pris comme un polygone)."""
 
     # Indices de travail
     remaining = list(range(len(points)))
@@ -51,9 +100,7 @@ def simple_triangulation(
         ax, ay = points[a]
         bx, by = points[b]
         cx, cy = points[c]
-
-        def area(px, py, qx, qy, rx, ry):
-            return (qx - px) * (ry - py) - (qy - py) * (rx - px)
+        area = orient2d
 
         for p in remaining:
             if p in (a, b, c):
@@ -136,7 +183,7 @@ def is_point_in_triangle(
     """
 
     def det(u, v, w):
-        return (v[0] - u[0]) * (w[1] - u[1]) - (v[1] - u[1]) * (w[0] - u[0])
+        return orient2d(u[0], u[1], v[0], v[1], w[0], w[1])
 
     d1 = det(p, a, b)
     d2 = det(p, b, c)
@@ -1,7 +1,30 @@
+from concurrent.futures.process import BrokenProcessPool
 from unittest.mock import patch
+import gzip
+import os
+import random
+import threading
+import time
+import zlib
+
 import pytest
 
-from triangulator.api import app
+from triangulator import api, parallel
+from triangulator.api import app, result_cache
+from triangulator.cache import content_key
+from triangulator.compute import ComputeExecutor
+from triangulator.disk_cache import DiskTriangulationCache
+from triangulator.client import PointSetManagerError
+from triangulator.jobs import JobQueue
+from triangulator.profiling import ProfileStore
+from triangulator.serialisation import (
+    PointSetTooLargeError,
+    binary_to_frames,
+    binary_to_locations,
+    binary_to_triangles,
+    pointset_to_binary,
+)
+from triangulator.triangles import validate_triangulation
 
 
 # ---------------------------------------------------------------------------
@@ -11,6 +34,7 @@ from triangulator.api import app
 @pytest.fixture
 def client():
     app.config["TESTING"] = True
+    result_cache.clear()
     with app.test_client() as client:
         yield client
 
@@ -53,6 +77,16 @@ def test_triangulate_psm_offline(mock_fetch, client):
     assert res.status_code == 503
 
 
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_psm_pointset_too_large(mock_fetch, client):
+    erreur = PointSetManagerError("PointSet PSM trop volumineux")
+    erreur.__cause__ = PointSetTooLargeError()
+    mock_fetch.side_effect = erreur
+
+    res = client.post("/triangulate", json={"pointset_id": "123"})
+    assert res.status_code == 413
+
+
 # ---------------------------------------------------------------------------
 # TRIANGULATE – CONVERSION BINAIRE
 # ---------------------------------------------------------------------------
@@ -98,6 +132,803 @@ def test_triangulate_happy_path(mock_fetch, client):
     assert res.status_code == 200
     assert res.mimetype == "application/octet-stream"
     assert len(res.data) > 0
+    assert res.headers["Content-Length"] == str(len(res.data))
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_delaunay_method(mock_fetch, client):
+    mock_fetch.return_value = (
+        b"\x03\x00\x00\x00"
+        b"\x00\x00\x00\x00\x00\x00\x00\x00"
+        b"\x00\x00\x80?\x00\x00\x00\x00"
+        b"\x00\x00\x00\x00\x00\x00\x80?"
+    )
+
+    res = client.post("/triangulate", json={"pointset_id": "123",
+                                            "method": "delaunay"})
+    assert res.status_code == 200
+    # 4 + 3*8 (points) + 4 + 1*12 (triangle)
+    assert len(res.data) == 44
+
+
+def test_triangulate_unknown_method(client):
+    res = client.post("/triangulate?method=inconnue", data=b"\x00" * 4)
+    assert res.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# TRIANGULATE – CORPS BINAIRE
+# ---------------------------------------------------------------------------
+
+POINTSET_3 = (
+    b"\x03\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x80?\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x80?"
+)
+
+
+def test_triangulate_binary_happy_path(client):
+    res = client.post("/triangulate", data=POINTSET_3,
+                      content_type="application/octet-stream")
+    assert res.status_code == 200
+    assert res.data[:28] == POINTSET_3
+
+
+def test_triangulate_binary_truncated(client):
+    res = client.post("/triangulate", data=POINTSET_3[:-4],
+                      content_type="application/octet-stream")
+    assert res.status_code == 400
+
+
+def test_triangulate_binary_too_many_points(client):
+    app.config["TRIANGULATOR_MAX_POINTS"] = 2
+    try:
+        res = client.post("/triangulate", data=POINTSET_3,
+                          content_type="application/octet-stream")
+    finally:
+        app.config["TRIANGULATOR_MAX_POINTS"] = 10_000_000
+    assert res.status_code == 413
+
+
+# ---------------------------------------------------------------------------
+# TRIANGULATE – CACHE DES RÉSULTATS
+# ---------------------------------------------------------------------------
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_cache_by_pointset_id(mock_fetch, client):
+    mock_fetch.return_value = POINTSET_3
+
+    res1 = client.post("/triangulate", json={"pointset_id": "abc"})
+    res2 = client.post("/triangulate", json={"pointset_id": "abc"})
+
+    assert res1.headers["X-Cache"] == "MISS"
+    assert res2.headers["X-Cache"] == "HIT"
+    assert res1.data == res2.data
+    assert mock_fetch.call_count == 1
+
+
+@patch("triangulator.api.simple_triangulation")
+def test_triangulate_cache_by_body_hash(mock_algo, client):
+    mock_algo.return_value = [(0, 1, 2)]
+
+    for _ in range(2):
+        res = client.post("/triangulate", data=POINTSET_3,
+                          content_type="application/octet-stream")
+        assert res.status_code == 200
+
+    assert mock_algo.call_count == 1
+    stats = client.get("/cache/stats").json
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_disk_cache_after_restart(mock_fetch, client, tmp_path,
+                                              monkeypatch):
+    mock_fetch.return_value = POINTSET_3
+    monkeypatch.setattr(api, "disk_cache",
+                        DiskTriangulationCache(str(tmp_path)))
+    res1 = client.post("/triangulate", json={"pointset_id": "abc"})
+
+    # Redémarrage : cache mémoire vide, nouveau cache disque sur le même
+    # répertoire.
+    result_cache.clear()
+    monkeypatch.setattr(api, "disk_cache",
+                        DiskTriangulationCache(str(tmp_path)))
+    with patch("triangulator.api.simple_triangulation") as mock_algo:
+        res2 = client.post("/triangulate", json={"pointset_id": "abc"})
+        assert mock_algo.call_count == 0
+
+    assert res2.headers["X-Cache"] == "HIT-DISK"
+    assert res1.data == res2.data
+
+
+# ---------------------------------------------------------------------------
+# TRIANGULATE – REQUÊTES CONCURRENTES REGROUPÉES
+# ---------------------------------------------------------------------------
+
+def requetes_concurrentes(n, corps):
+    """Envoie n requêtes JSON simultanées, chacune avec son client."""
+    reponses = []
+
+    def envoyer():
+        with app.test_client() as c:
+            reponses.append(c.post("/triangulate", json=corps))
+
+    threads = [threading.Thread(target=envoyer) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return reponses
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_concurrent_requests_coalesced(mock_fetch, client):
+    def fetch_lent(_):
+        time.sleep(0.2)
+        return POINTSET_3
+    mock_fetch.side_effect = fetch_lent
+
+    reponses = requetes_concurrentes(6, {"pointset_id": "populaire"})
+
+    assert mock_fetch.call_count == 1
+    assert all(r.status_code == 200 for r in reponses)
+    assert len({r.data for r in reponses}) == 1
+    assert sum(r.headers.get("X-Coalesced") == "1" for r in reponses) == 5
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_concurrent_failure_shared(mock_fetch, client):
+    def fetch_en_panne(_):
+        time.sleep(0.2)
+        raise RuntimeError("PSM down")
+    mock_fetch.side_effect = fetch_en_panne
+
+    reponses = requetes_concurrentes(4, {"pointset_id": "panne"})
+
+    assert mock_fetch.call_count == 1
+    assert [r.status_code for r in reponses] == [503] * 4
+
+
+# ---------------------------------------------------------------------------
+# TRIANGULATE – POOL DE PROCESSUS
+# ---------------------------------------------------------------------------
+
+def test_triangulate_in_process_pool(client, monkeypatch):
+    executor = ComputeExecutor(max_workers=1, inline_threshold=0)
+    monkeypatch.setattr(api, "executor", executor)
+    try:
+        res = client.post("/triangulate", data=POINTSET_3,
+                          content_type="application/octet-stream")
+    finally:
+        executor.shutdown()
+
+    assert res.status_code == 200
+    assert executor.stats()["submitted"] == 1
+
+
+def test_triangulate_compute_queue_full(client, monkeypatch):
+    monkeypatch.setattr(api, "executor",
+                        ComputeExecutor(max_pending=0, inline_threshold=0))
+    res = client.post("/triangulate", data=POINTSET_3,
+                      content_type="application/octet-stream")
+    assert res.status_code == 503
+
+
+def test_triangulate_delaunay_parallel(client, monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_POINTS_BANDE", 100)
+    executor = ComputeExecutor(max_workers=2, inline_threshold=10)
+    monkeypatch.setattr(api, "executor", executor)
+    random.seed(11)
+    points = [(random.random(), random.random()) for _ in range(400)]
+    try:
+        res = client.post("/triangulate?method=delaunay_parallel",
+                          data=pointset_to_binary(points),
+                          content_type="application/octet-stream")
+    finally:
+        executor.shutdown()
+
+    assert res.status_code == 200
+    sommets, triangles = binary_to_triangles(res.data)
+    assert len(sommets) == 400
+    assert validate_triangulation(sommets, triangles)
+    # Chaque bande est un calcul du pool
+    assert executor.stats()["submitted"] == 2
+
+
+def test_triangulate_delaunay_parallel_small_input(client):
+    res = client.post("/triangulate?method=delaunay_parallel",
+                      data=POINTSET_3,
+                      content_type="application/octet-stream")
+    assert res.status_code == 200
+    assert binary_to_triangles(res.data)[1] == [(0, 1, 2)]
+
+
+# ---------------------------------------------------------------------------
+# TRIANGULATE – PAR LOT
+# ---------------------------------------------------------------------------
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_batch_frames(mock_fetch, client):
+    def fetch(pointset_id):
+        if pointset_id == "absent":
+            raise RuntimeError("PSM down")
+        return POINTSET_3
+    mock_fetch.side_effect = fetch
+
+    res = client.post("/triangulate/batch",
+                      json={"pointset_ids": ["a", "absent", "b", "a"]})
+
+    assert res.status_code == 200
+    trames = {i: (status, payload)
+              for i, status, payload in binary_to_frames(res.data)}
+    assert sorted(trames) == ["a", "absent", "b"]
+
+    assert trames["absent"] == (503, "Erreur PSM".encode("utf-8"))
+    for pointset_id in ("a", "b"):
+        status, payload = trames[pointset_id]
+        assert status == 200
+        _, triangles = binary_to_triangles(payload)
+        assert triangles == [(0, 1, 2)]
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_triangulate_batch_concurrent_fetches(mock_fetch, client):
+    def fetch_lent(_):
+        time.sleep(0.2)
+        return POINTSET_3
+    mock_fetch.side_effect = fetch_lent
+
+    debut = time.perf_counter()
+    res = client.post("/triangulate/batch",
+                      json={"pointset_ids": [str(i) for i in range(8)]})
+    duree = time.perf_counter() - debut
+
+    assert len(binary_to_frames(res.data)) == 8
+    # 8 récupérations de 0,2 s en parallèle, pas 1,6 s
+    assert duree < 1.0
+
+
+def test_triangulate_batch_bad_requests(client):
+    assert client.post("/triangulate/batch").status_code == 400
+    assert client.post("/triangulate/batch",
+                       json={"pointset_ids": []}).status_code == 400
+    assert client.post("/triangulate/batch",
+                       json={"pointset_ids": ["a"],
+                             "method": "inconnue"}).status_code == 400
+
+    trop = {"pointset_ids": [str(i) for i in range(1001)]}
+    assert client.post("/triangulate/batch", json=trop).status_code == 413
+
+
+# ---------------------------------------------------------------------------
+# TRAVAUX ASYNCHRONES
+# ---------------------------------------------------------------------------
+
+def attendre_resultat(client, job_id, delai=5.0):
+    """Interroge /jobs/<id>/result jusqu'à une réponse finale."""
+    fin = time.monotonic() + delai
+    while True:
+        res = client.get(f"/jobs/{job_id}/result")
+        if res.status_code != 202 or time.monotonic() > fin:
+            return res
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    file = JobQueue(workers=1, max_pending=2)
+    monkeypatch.setattr(api, "jobs", file)
+    yield file
+    file.shutdown()
+
+
+def test_job_binary_happy_path(client, jobs):
+    res = client.post("/jobs", data=POINTSET_3,
+                      content_type="application/octet-stream")
+    assert res.status_code == 202
+    job_id = res.json["job_id"]
+    assert res.headers["Location"] == f"/jobs/{job_id}"
+
+    resultat = attendre_resultat(client, job_id)
+    assert resultat.status_code == 200
+    assert binary_to_triangles(resultat.data)[1] == [(0, 1, 2)]
+    assert client.get(f"/jobs/{job_id}").json["status"] == "done"
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_job_failure_keeps_error_status(mock_fetch, client, jobs):
+    mock_fetch.side_effect = Exception("PSM down")
+
+    job_id = client.post("/jobs", json={"pointset_id": "123"}).json["job_id"]
+
+    res = attendre_resultat(client, job_id)
+    assert res.status_code == 503
+    etat = client.get(f"/jobs/{job_id}").json
+    assert etat["status"] == "failed"
+    assert etat["error"] == "Erreur PSM"
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_job_pending_then_queue_full(mock_fetch, client, jobs):
+    liberer = threading.Event()
+
+    def fetch_bloque(_):
+        liberer.wait()
+        return POINTSET_3
+    mock_fetch.side_effect = fetch_bloque
+
+    ids = [client.post("/jobs", json={"pointset_id": "0"}).json["job_id"]]
+    while client.get(f"/jobs/{ids[0]}").json["status"] != "running":
+        time.sleep(0.01)
+    ids += [client.post("/jobs", json={"pointset_id": str(i)}).json["job_id"]
+            for i in (1, 2)]
+    assert client.get(f"/jobs/{ids[-1]}/result").status_code == 202
+
+    res = client.post("/jobs", json={"pointset_id": "de trop"})
+    assert res.status_code == 503
+    assert "Retry-After" in res.headers
+
+    liberer.set()
+    assert all(attendre_resultat(client, i).status_code == 200 for i in ids)
+
+
+def test_job_unknown(client):
+    assert client.get("/jobs/inconnu").status_code == 404
+    assert client.get("/jobs/inconnu/result").status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# GET /triangulation/<pointSetId>
+# ---------------------------------------------------------------------------
+
+UUID_PS = "123e4567-e89b-12d3-a456-426614174000"
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_get_triangulation_etag(mock_fetch, client):
+    mock_fetch.return_value = POINTSET_3
+
+    res = client.get(f"/triangulation/{UUID_PS}")
+    assert res.status_code == 200
+    assert binary_to_triangles(res.data)[1] == [(0, 1, 2)]
+    assert "max-age" in res.headers["Cache-Control"]
+    etag = res.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    with patch("triangulator.api._triangulate_coords") as mock_calcul:
+        res = client.get(f"/triangulation/{UUID_PS}",
+                         headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.data == b""
+    assert res.headers["ETag"] == etag
+    mock_calcul.assert_not_called()
+
+    # Autre méthode : autre représentation, autre ETag
+    res = client.get(f"/triangulation/{UUID_PS}?method=delaunay",
+                     headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_get_triangulation_delaunay_parallel(mock_fetch, client):
+    mock_fetch.return_value = POINTSET_3
+
+    res = client.get(f"/triangulation/{UUID_PS}?method=delaunay_parallel")
+    assert res.status_code == 200
+    assert binary_to_triangles(res.data)[1] == [(0, 1, 2)]
+
+
+def test_get_triangulation_invalid_id(client):
+    res = client.get("/triangulation/pas-un-uuid")
+    assert res.status_code == 400
+    assert res.json["code"] == "INVALID_REQUEST"
+    assert "message" in res.json
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_get_triangulation_psm_errors(mock_fetch, client):
+    mock_fetch.side_effect = PointSetManagerError(status=404)
+    res = client.get(f"/triangulation/{UUID_PS}")
+    assert res.status_code == 404
+    assert res.json["code"] == "POINTSET_NOT_FOUND"
+
+    mock_fetch.side_effect = PointSetManagerError()
+    res = client.get(f"/triangulation/{UUID_PS}")
+    assert res.status_code == 503
+
+
+# ---------------------------------------------------------------------------
+# POST /locate/<pointSetId>
+# ---------------------------------------------------------------------------
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_locate_happy_path(mock_fetch, client):
+    mock_fetch.return_value = pointset_to_binary(
+        [(0, 0), (1, 0), (1, 1), (0, 1)]
+    )
+    requetes = pointset_to_binary([(0.9, 0.1), (0.1, 0.9), (2, 2)])
+
+    res = client.post("/locate/123", data=requetes,
+                      content_type="application/octet-stream")
+    assert res.status_code == 200
+    assert res.mimetype == "application/octet-stream"
+    # Carré en éventail : (0, 1, 2) puis (0, 2, 3)
+    assert list(binary_to_locations(res.data)) == [0, 1, -1]
+
+    # Deuxième lot : triangulation servie par le cache
+    res = client.post("/locate/123", data=requetes,
+                      content_type="application/octet-stream")
+    assert res.headers["X-Cache"] == "HIT"
+    assert mock_fetch.call_count == 1
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_locate_in_process_pool(mock_fetch, client, monkeypatch):
+    mock_fetch.return_value = pointset_to_binary(
+        [(0, 0), (1, 0), (1, 1), (0, 1)]
+    )
+    requetes = pointset_to_binary([(0.9, 0.1), (0.1, 0.9), (2, 2)])
+    executor = ComputeExecutor(max_workers=1, inline_threshold=0)
+    monkeypatch.setattr(api, "executor", executor)
+    try:
+        res = client.post("/locate/123", data=requetes,
+                          content_type="application/octet-stream")
+    finally:
+        executor.shutdown()
+
+    assert res.status_code == 200
+    assert list(binary_to_locations(res.data)) == [0, 1, -1]
+    # Triangulation puis index et requêtes : deux calculs du pool
+    assert executor.stats()["submitted"] == 2
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_locate_compute_queue_full(mock_fetch, client, monkeypatch):
+    mock_fetch.return_value = POINTSET_3
+    client.post("/triangulate", json={"pointset_id": "123"})
+    monkeypatch.setattr(api, "executor",
+                        ComputeExecutor(max_pending=0, inline_threshold=0))
+
+    res = client.post("/locate/123", data=pointset_to_binary([(0.1, 0.1)]),
+                      content_type="application/octet-stream")
+    assert res.status_code == 503
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_locate_errors(mock_fetch, client):
+    res = client.post("/locate/123?method=inconnue", data=b"\x00" * 4,
+                      content_type="application/octet-stream")
+    assert res.status_code == 400
+
+    res = client.post("/locate/123")
+    assert res.status_code == 400
+
+    mock_fetch.side_effect = PointSetManagerError(status=404)
+    res = client.post("/locate/123", data=pointset_to_binary([(0, 0)]),
+                      content_type="application/octet-stream")
+    assert res.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# COMPRESSION (Content-Encoding)
+# ---------------------------------------------------------------------------
+
+POINTSET_CARRE = pointset_to_binary(
+    [(float(i), float(j)) for i in range(20) for j in range(20)]
+)
+
+
+def test_response_compressed_when_accepted(client):
+    res = client.post("/triangulate?method=delaunay", data=POINTSET_CARRE,
+                      content_type="application/octet-stream")
+    brut = res.data
+    assert "Content-Encoding" not in res.headers
+    assert "Accept-Encoding" in res.headers["Vary"]
+
+    res = client.post("/triangulate?method=delaunay", data=POINTSET_CARRE,
+                      content_type="application/octet-stream",
+                      headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert int(res.headers["Content-Length"]) == len(res.data) < len(brut)
+    assert gzip.decompress(res.data) == brut
+
+
+def test_small_response_not_compressed(client):
+    res = client.post("/triangulate", data=POINTSET_3,
+                      content_type="application/octet-stream",
+                      headers={"Accept-Encoding": "gzip, deflate"})
+    assert res.status_code == 200
+    assert "Content-Encoding" not in res.headers
+    assert res.data[:28] == POINTSET_3
+
+
+def test_streamed_response_compressed(client, monkeypatch):
+    # Cache trop petit : réponse encodée en flux
+    monkeypatch.setattr(api, "result_cache", api.TriangulationCache(max_bytes=0))
+    res = client.post("/triangulate?method=delaunay", data=POINTSET_CARRE,
+                      content_type="application/octet-stream",
+                      headers={"Accept-Encoding": "deflate"})
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "deflate"
+    assert "Content-Length" not in res.headers
+    _, triangles = binary_to_triangles(zlib.decompress(res.data))
+    assert len(triangles) == 2 * 19 * 19
+
+
+def test_streamed_response_encode_error(client, monkeypatch):
+    # Erreur d'encodage détectée avant l'envoi : 500, pas de flux tronqué
+    monkeypatch.setattr(api, "result_cache", api.TriangulationCache(max_bytes=0))
+    monkeypatch.setattr(api, "triangulate_buffers",
+                        lambda *args, **kwargs: [0, 1, 2 ** 40])
+    res = client.post("/triangulate", data=POINTSET_3,
+                      content_type="application/octet-stream")
+    assert res.status_code == 500
+    assert res.get_json() == {"error": "Erreur conversion triangles"}
+
+
+def test_compute_worker_lost(client, monkeypatch):
+    def perdu(*args, **kwargs):
+        raise BrokenProcessPool("processus arrêté")
+
+    monkeypatch.setattr(api, "triangulate_buffers", perdu)
+    res = client.post("/triangulate", data=POINTSET_3,
+                      content_type="application/octet-stream")
+    assert res.status_code == 503
+    assert res.get_json() == {"error": "Processus de calcul interrompu"}
+
+
+def test_compressed_request_body(client):
+    for encoding, corps in (("gzip", gzip.compress(POINTSET_CARRE)),
+                            ("deflate", zlib.compress(POINTSET_CARRE))):
+        res = client.post("/triangulate?method=delaunay", data=corps,
+                          content_type="application/octet-stream",
+                          headers={"Content-Encoding": encoding})
+        assert res.status_code == 200
+        assert res.data[:len(POINTSET_CARRE)] == POINTSET_CARRE
+
+    res = client.post("/triangulate", data=b"pas du gzip",
+                      content_type="application/octet-stream",
+                      headers={"Content-Encoding": "gzip"})
+    assert res.status_code == 400
+
+    res = client.post("/triangulate", data=POINTSET_CARRE,
+                      content_type="application/octet-stream",
+                      headers={"Content-Encoding": "br"})
+    assert res.status_code == 415
+
+
+def test_compressed_request_body_limits(client, monkeypatch):
+    # Quelques Ko compressés annonçant 100 000 points : refusé sur l'en-tête
+    monkeypatch.setitem(app.config, "TRIANGULATOR_MAX_POINTS", 1000)
+    corps = gzip.compress(pointset_to_binary([(0.0, 0.0)] * 100_000))
+    res = client.post("/triangulate", data=corps,
+                      content_type="application/octet-stream",
+                      headers={"Content-Encoding": "gzip"})
+    assert res.status_code == 413
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_get_triangulation_compressed_etag(mock_fetch, client):
+    mock_fetch.return_value = POINTSET_CARRE
+
+    res = client.get(f"/triangulation/{UUID_PS}?method=delaunay",
+                     headers={"Accept-Encoding": "gzip"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    etag = res.headers["ETag"]
+    assert etag.endswith('-gzip"')
+
+    res = client.get(f"/triangulation/{UUID_PS}?method=delaunay",
+                     headers={"Accept-Encoding": "gzip",
+                              "If-None-Match": etag})
+    assert res.status_code == 304
+    # Mêmes validateurs que la réponse 200 remplacée
+    assert res.headers["ETag"] == etag
+    assert {"Accept", "Accept-Encoding"} <= set(res.vary)
+
+    # Plusieurs variantes connues : celle du codage négocié est renvoyée
+    brut = etag[:-len('-gzip"')] + '"'
+    res = client.get(f"/triangulation/{UUID_PS}?method=delaunay",
+                     headers={"Accept-Encoding": "gzip",
+                              "If-None-Match": f"{brut}, {etag}"})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+
+    res = client.get(f"/triangulation/{UUID_PS}?method=delaunay",
+                     headers={"Accept-Encoding": "identity",
+                              "If-None-Match": f"{brut}, {etag}"})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == brut
+
+
+# ---------------------------------------------------------------------------
+# VARIANTES COMPACTES (paramètre `indices` de l'en-tête Accept)
+# ---------------------------------------------------------------------------
+
+def test_compact_variants_via_accept(client):
+    res = client.post("/triangulate?method=delaunay", data=POINTSET_CARRE,
+                      content_type="application/octet-stream")
+    assert res.content_type == "application/octet-stream"
+    assert "Accept" in res.headers["Vary"]
+    _, reference = binary_to_triangles(res.data)
+    tailles = {"uint32": len(res.data)}
+
+    for indices_format in ("uint16", "varint", "strip"):
+        res = client.post(
+            "/triangulate?method=delaunay", data=POINTSET_CARRE,
+            content_type="application/octet-stream",
+            headers={"Accept": "application/octet-stream; "
+                               f"indices={indices_format}"},
+        )
+        assert res.status_code == 200
+        assert res.headers["X-Cache"] == "HIT"
+        assert res.content_type == \
+            f"application/octet-stream; indices={indices_format}"
+        _, triangles = binary_to_triangles(res.data, indices_format)
+        if indices_format == "strip":
+            assert sorted(map(sorted, triangles)) == \
+                sorted(map(sorted, reference))
+        else:
+            assert triangles == reference
+        tailles[indices_format] = len(res.data)
+
+    assert tailles["strip"] < tailles["varint"] < tailles["uint16"] \
+        < tailles["uint32"]
+
+
+def test_compact_variant_fallbacks(client, monkeypatch):
+    # Variante inconnue : format par défaut
+    res = client.post("/triangulate", data=POINTSET_3,
+                      content_type="application/octet-stream",
+                      headers={"Accept": "application/octet-stream;indices=zip"})
+    assert res.content_type == "application/octet-stream"
+    assert binary_to_triangles(res.data)[1] == [(0, 1, 2)]
+
+    # uint16 impossible au-delà de 65535 points : format par défaut
+    grand = pointset_to_binary([(float(i), float(i % 7)) for i in range(70000)])
+    monkeypatch.setattr(api.executor, "inline_threshold", 100_000)
+    with patch("triangulator.api.simple_triangulation",
+               return_value=[(0, 1, 2)]):
+        res = client.post("/triangulate", data=grand,
+                          content_type="application/octet-stream",
+                          headers={"Accept": "*/*; indices=uint16"})
+    assert res.status_code == 200
+    assert res.content_type == "application/octet-stream"
+    assert binary_to_triangles(res.data)[1] == [(0, 1, 2)]
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_get_triangulation_variant_etag(mock_fetch, client):
+    mock_fetch.return_value = POINTSET_3
+    entetes = {"Accept": "application/octet-stream; indices=strip"}
+
+    res = client.get(f"/triangulation/{UUID_PS}", headers=entetes)
+    assert res.status_code == 200
+    etag = res.headers["ETag"]
+    assert etag.endswith('-strip"')
+    assert binary_to_triangles(res.data, "strip")[1] == [(0, 1, 2)]
+
+    res = client.get(f"/triangulation/{UUID_PS}",
+                     headers={**entetes, "If-None-Match": etag})
+    assert res.status_code == 304
+
+    # Même ETag, autre variante : nouvelle réponse
+    res = client.get(f"/triangulation/{UUID_PS}",
+                     headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# GET /metrics
+# ---------------------------------------------------------------------------
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_metrics_stages_and_errors(mock_fetch, client):
+    etapes = api.stage_seconds
+    avant = {
+        etape: etapes.count((etape,))
+        for etape in ("fetch_pointset", "binary_to_pointset",
+                      "simple_triangulation", "triangles_to_binary")
+    }
+    erreurs_psm = api.errors_total.get(("psm_not_found",))
+
+    mock_fetch.return_value = pointset_to_binary([(0, 0), (1, 0), (0, 1)])
+    res = client.post("/triangulate", json={"pointset_id": "metrics"})
+    assert res.status_code == 200
+
+    mock_fetch.side_effect = PointSetManagerError(status=404)
+    res = client.post("/triangulate", json={"pointset_id": "absent"})
+    assert res.status_code == 404
+
+    for etape, nombre in avant.items():
+        attendu = nombre + (2 if etape == "fetch_pointset" else 1)
+        assert etapes.count((etape,)) == attendu
+    assert api.errors_total.get(("psm_not_found",)) == erreurs_psm + 1
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.content_type.startswith("text/plain; version=0.0.4")
+    texte = res.get_data(as_text=True)
+    assert "# TYPE triangulator_stage_seconds histogram" in texte
+    assert 'triangulator_stage_seconds_bucket{stage="fetch_pointset",le="+Inf"}' \
+        in texte
+    assert 'triangulator_errors_total{branch="psm_not_found"}' in texte
+    assert 'triangulator_requests_total{endpoint="triangulate",status="404"}' \
+        in texte
+    assert "triangulator_input_points_count" in texte
+    assert "triangulator_output_triangles_count" in texte
+    # La requête /metrics elle-même est en cours pendant l'export
+    assert 'triangulator_requests_in_flight{endpoint="metrics_endpoint"} 1' \
+        in texte
+    assert "triangulator_triangulations_in_flight 0" in texte
+
+
+# ---------------------------------------------------------------------------
+# MODE DEBUG : SERVER-TIMING ET PROFILS
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def debug(monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, "TRIANGULATOR_DEBUG", True)
+    store = ProfileStore(str(tmp_path), max_files=2)
+    monkeypatch.setattr(api, "profile_store", store)
+    return store
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_debug_disabled_by_default(mock_fetch, client):
+    mock_fetch.return_value = pointset_to_binary([(0, 0), (1, 0), (0, 1)])
+    res = client.post("/triangulate", json={"pointset_id": "dbg"},
+                      headers={"X-Triangulator-Debug": "profile"})
+    assert res.status_code == 200
+    assert "Server-Timing" not in res.headers
+    assert "X-Profile" not in res.headers
+
+
+@patch("triangulator.api.pointset_client.fetch_pointset")
+def test_debug_server_timing(mock_fetch, client, debug):
+    mock_fetch.return_value = pointset_to_binary([(0, 0), (1, 0), (0, 1)])
+
+    res = client.post("/triangulate", json={"pointset_id": "dbg"})
+    assert "Server-Timing" not in res.headers
+
+    res = client.post("/triangulate", json={"pointset_id": "dbg"},
+                      headers={"X-Triangulator-Debug": "timing"})
+    assert res.status_code == 200
+    assert res.headers["Server-Timing"].startswith("total;dur=")  # cache HIT
+
+    result_cache.clear()
+    res = client.post("/triangulate", json={"pointset_id": "dbg"},
+                      headers={"X-Triangulator-Debug": "timing"})
+    etapes = [m.split(";")[0]
+              for m in res.headers["Server-Timing"].split(", ")]
+    assert etapes == ["fetch_pointset", "binary_to_pointset",
+                      "simple_triangulation", "triangles_to_binary", "total"]
+    assert "X-Profile" not in res.headers
+    assert debug.files() == []
+
+
+def test_debug_profile_bypasses_cache(client, debug):
+    corps = pointset_to_binary([(0, 0), (1, 0), (1, 1), (0, 1), (0.5, 0.2)])
+    entetes = {"X-Triangulator-Debug": "profile"}
+
+    res = client.post("/triangulate", data=corps,
+                      content_type="application/octet-stream")
+    assert res.headers["X-Cache"] == "MISS"
+
+    res = client.post("/triangulate", data=corps, headers=entetes,
+                      content_type="application/octet-stream")
+    assert res.status_code == 200
+    assert res.headers["X-Cache"] == "MISS"
+    assert len(binary_to_triangles(res.data)[1]) == 3
+
+    nom = res.headers["X-Profile"]
+    assert nom.endswith(f"-ear_clipping-{content_key(corps[4:])}.prof")
+    assert [os.path.basename(f) for f in debug.files()] == [nom]
+    assert "simple_triangulation" in res.headers["Server-Timing"]
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,162 @@
+import gzip
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from triangulator.client import PointSetManagerClient, PointSetManagerError
+from triangulator.serialisation import PointSetTooLargeError, pointset_to_binary
+
+
+# ---------------------------------------------------------------------------
+# FAUX POINTSETMANAGER (serveur HTTP/1.1 local)
+# ---------------------------------------------------------------------------
+
+class FauxPSM(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Réponses programmées par les tests : liste de (statut, corps, délai)
+    reponses = []
+    connexions = 0
+    # Codage appliqué aux corps si le client l'accepte (None : aucun)
+    encoding = None
+    accept_encoding = None
+
+    def setup(self):
+        super().setup()
+        type(self).connexions += 1
+
+    def do_GET(self):
+        statut, corps, delai = (
+            self.reponses.pop(0) if self.reponses else (200, b"ok", 0)
+        )
+        time.sleep(delai)
+        type(self).accept_encoding = self.headers.get("Accept-Encoding")
+        self.send_response(statut)
+        if self.encoding == "gzip" and "gzip" in self.accept_encoding:
+            corps = gzip.compress(corps)
+            self.send_header("Content-Encoding", "gzip")
+        elif self.encoding not in (None, "gzip"):
+            # Codage imposé, accepté ou non par le client
+            self.send_header("Content-Encoding", self.encoding)
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def psm():
+    FauxPSM.reponses = []
+    FauxPSM.connexions = 0
+    FauxPSM.encoding = None
+    serveur = ThreadingHTTPServer(("127.0.0.1", 0), FauxPSM)
+    thread = threading.Thread(target=serveur.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{serveur.server_port}"
+    serveur.shutdown()
+    serveur.server_close()
+
+
+# ---------------------------------------------------------------------------
+# TESTS
+# ---------------------------------------------------------------------------
+
+def test_keep_alive_reuses_connection(psm):
+    client = PointSetManagerClient(psm)
+
+    for _ in range(3):
+        assert client.fetch_pointset("123") == b"ok"
+
+    stats = client.pool_stats()
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 2
+    assert stats["idle"] == 1
+    assert FauxPSM.connexions == 1
+    client.close()
+
+
+def test_not_found_is_not_retried(psm):
+    FauxPSM.reponses = [(404, b"", 0)]
+    client = PointSetManagerClient(psm, backoff=0)
+
+    with pytest.raises(PointSetManagerError) as erreur:
+        client.fetch_pointset("inconnu")
+
+    assert erreur.value.status == 404
+    assert client.pool_stats()["retries"] == 0
+
+
+def test_unavailable_is_retried(psm):
+    FauxPSM.reponses = [(503, b"", 0), (503, b"", 0), (200, b"data", 0)]
+    client = PointSetManagerClient(psm, max_retries=2, backoff=0)
+
+    assert client.fetch_pointset("123") == b"data"
+    assert client.pool_stats()["retries"] == 2
+
+
+def test_read_timeout(psm):
+    FauxPSM.reponses = [(200, b"lent", 1.0)]
+    client = PointSetManagerClient(psm, read_timeout=0.1, max_retries=0)
+
+    debut = time.perf_counter()
+    with pytest.raises(PointSetManagerError):
+        client.fetch_pointset("123")
+    assert time.perf_counter() - debut < 0.9
+    assert client.pool_stats()["failures"] == 1
+
+
+def test_connection_refused():
+    client = PointSetManagerClient("http://127.0.0.1:1", max_retries=1,
+                                   backoff=0)
+    with pytest.raises(PointSetManagerError) as erreur:
+        client.fetch_pointset("123")
+    assert erreur.value.status is None
+
+
+def test_compressed_response_decoded(psm):
+    FauxPSM.encoding = "gzip"
+    FauxPSM.reponses = [(200, b"pointset" * 100, 0)] * 2
+    client = PointSetManagerClient(psm)
+
+    assert client.fetch_pointset("123") == b"pointset" * 100
+    assert "gzip" in FauxPSM.accept_encoding
+
+    # Sans compression annoncée, le PSM répond en clair
+    client = PointSetManagerClient(psm, compression=False)
+    assert client.fetch_pointset("123") == b"pointset" * 100
+    assert "gzip" not in FauxPSM.accept_encoding
+
+
+def test_compressed_response_limits(psm):
+    # Quelques Ko compressés, 16 Mo une fois décompressés
+    FauxPSM.encoding = "gzip"
+    enorme = struct.pack("<I", 2_000_000) + bytes(16_000_000)
+    FauxPSM.reponses = [(200, enorme, 0)]
+    client = PointSetManagerClient(psm, max_retries=2, backoff=0,
+                                   max_points=1000, max_bytes=4 + 8000)
+
+    with pytest.raises(PointSetManagerError) as erreur:
+        client.fetch_pointset("123")
+    assert isinstance(erreur.value.__cause__, PointSetTooLargeError)
+    assert client.pool_stats()["retries"] == 0
+
+    # En-tête honnête suivi d'un flot de zéros : seuls les octets
+    # annoncés sont décompressés
+    pointset = pointset_to_binary([(0, 0), (1, 0), (0, 1)])
+    FauxPSM.reponses = [(200, pointset + bytes(16_000_000), 0)]
+    assert client.fetch_pointset("123") == pointset
+
+
+def test_unknown_encoding_not_retried(psm):
+    FauxPSM.encoding = "br"
+    FauxPSM.reponses = [(200, b"data", 0)]
+    client = PointSetManagerClient(psm, max_retries=2, backoff=0)
+
+    with pytest.raises(PointSetManagerError):
+        client.fetch_pointset("123")
+    assert client.pool_stats()["retries"] == 0
@@ -1,13 +1,25 @@
+from array import array
+import math
+import os
 import time
 import random
 import pytest
 
+from triangulator.delaunay import IncrementalDelaunay, delaunay_triangulation
+from triangulator.locate import PointLocator
+from triangulator.mesh import PointSet, TriangleMesh
+from triangulator.parallel import parallel_delaunay
+from triangulator.triangles import validate_triangle_buffers
 from triangulator.triangulation import simple_triangulation
 from triangulator.serialisation import (
     pointset_to_binary,
     binary_to_pointset,
     triangles_to_binary,
     binary_to_triangles,
+    binary_to_coords,
+    coords_to_binary,
+    binary_to_compact_triangle_buffers,
+    triangle_buffers_to_compact_binary,
 )
 
 
@@ -56,6 +68,124 @@ def test_triangulation_100_points():
     assert len(tris) > 0
 
 
+@pytest.mark.perf
+def test_triangulation_delaunay_10000_points():
+    points = [(random.random(), random.random()) for _ in range(10000)]
+    debut = time.perf_counter()
+
+    tris = simple_triangulation(points, method="delaunay")
+
+    duree = time.perf_counter() - debut
+    assert duree < 5.0  # 5 secondes
+    assert len(tris) > 19000
+
+
+@pytest.mark.perf
+def test_triangulation_earcut_10000_points():
+    # Polygone non convexe : rayon aléatoire à angles réguliers
+    points = []
+    for k in range(10000):
+        rayon = 1 + 0.05 * random.random()
+        angle = 2 * math.pi * k / 10000
+        points.append((rayon * math.cos(angle), rayon * math.sin(angle)))
+    debut = time.perf_counter()
+
+    tris = simple_triangulation(points, method="earcut")
+
+    duree = time.perf_counter() - debut
+    assert duree < 2.0  # 2 secondes
+    assert len(tris) == 9998
+
+
+@pytest.mark.perf
+def test_triangulation_convexe_100000_points():
+    n = 100000
+    points = [(math.cos(2 * math.pi * k / n), math.sin(2 * math.pi * k / n))
+              for k in range(n)]
+    debut = time.perf_counter()
+
+    tris = simple_triangulation(points)
+
+    duree = time.perf_counter() - debut
+    assert duree < 1.0  # 1 seconde
+    assert len(tris) == n - 2
+
+
+@pytest.mark.perf
+def test_triangulation_incrementale_100_points():
+    points = [(random.random(), random.random()) for _ in range(20100)]
+    maillage = IncrementalDelaunay(points[:20000])
+    debut = time.perf_counter()
+
+    maillage.add_points(points[20000:])
+    data = maillage.to_bytes()
+
+    duree = time.perf_counter() - debut
+    assert duree < 0.2  # 200 millisecondes
+    assert len(data) > 4 + 20100 * 8
+
+
+@pytest.mark.perf
+@pytest.mark.skipif((os.cpu_count() or 1) < 4, reason="au moins 4 cœurs")
+def test_triangulation_parallele_100000_points():
+    points = [(random.random(), random.random()) for _ in range(100000)]
+
+    debut = time.perf_counter()
+    sequentiel = delaunay_triangulation(points)
+    duree_sequentielle = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    parallele = parallel_delaunay(points, workers=4)
+    duree_parallele = time.perf_counter() - debut
+
+    assert len(parallele) == len(sequentiel)
+    assert duree_sequentielle / duree_parallele > 1.5
+
+
+@pytest.mark.perf
+def test_validation_grille_500000_triangles():
+    cote = 500
+    points = PointSet.from_points(
+        (float(i), float(j)) for j in range(cote + 1) for i in range(cote + 1)
+    )
+    triangles = []
+    for j in range(cote):
+        for i in range(cote):
+            p = j * (cote + 1) + i
+            triangles.append((p, p + 1, p + cote + 2))
+            triangles.append((p, p + cote + 2, p + cote + 1))
+    mesh = TriangleMesh.from_triangles(points, triangles)
+    debut = time.perf_counter()
+
+    rapport = validate_triangle_buffers(points.coords, mesh.indices)
+
+    duree = time.perf_counter() - debut
+    assert duree < 3.0  # 3 secondes
+    assert rapport.valid
+
+
+@pytest.mark.perf
+def test_localisation_100000_points():
+    cote = 200
+    points = [(float(i), float(j))
+              for j in range(cote + 1) for i in range(cote + 1)]
+    triangles = []
+    for j in range(cote):
+        for i in range(cote):
+            p = j * (cote + 1) + i
+            triangles.append((p, p + 1, p + cote + 2))
+            triangles.append((p, p + cote + 2, p + cote + 1))
+    requetes = [(random.uniform(-1, cote + 1), random.uniform(-1, cote + 1))
+                for _ in range(100000)]
+    debut = time.perf_counter()
+
+    resultats = PointLocator(points, triangles).locate_many(requetes)
+
+    duree = time.perf_counter() - debut
+    assert duree < 3.0  # 3 secondes
+    assert len(resultats) == 100000
+
+
 # ------------------------------------------------------------
 # TESTS PERFORMANCE SERIALISATION
 # ------------------------------------------------------------
@@ -85,3 +215,39 @@ def test_serialisation_triangles_500():
 
     assert len(tris2) == len(triangles)
     assert duree < 0.2  # 200 ms
+
+
+@pytest.mark.perf
+def test_serialisation_buffers_1000000_points():
+    points = [(random.random(), random.random()) for _ in range(1000000)]
+    data = pointset_to_binary(points)
+
+    debut = time.perf_counter()
+    coords = binary_to_coords(data)
+    data2 = coords_to_binary(coords)
+    duree = time.perf_counter() - debut
+
+    assert data2 == data
+    assert duree < 0.1  # 100 ms
+
+
+@pytest.mark.perf
+def test_serialisation_bandes_100000_triangles():
+    n = 224  # grille 224 x 224 : ~100 000 triangles
+    coords = array("f", [v for j in range(n) for i in range(n) for v in (i, j)])
+    indices = array("I")
+    for j in range(n - 1):
+        for i in range(n - 1):
+            a = j * n + i
+            indices.extend((a, a + 1, a + n + 1, a, a + n + 1, a + n))
+
+    debut = time.perf_counter()
+    data = triangle_buffers_to_compact_binary(coords, indices, "strip")
+    _, decodes = binary_to_compact_triangle_buffers(data, "strip")
+    duree = time.perf_counter() - debut
+
+    assert len(decodes) == len(indices)
+    taille_indices = len(data) - 4 - len(coords) * 4
+    assert taille_indices * 3 < len(indices) * 4  # au moins 3x plus petit
+    assert duree < 2.0
+
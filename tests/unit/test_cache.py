@@ -0,0 +1,53 @@
+from triangulator.cache import TriangulationCache, content_key
+
+
+class HorlogeFactice:
+    """Horloge contrôlée par le test."""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class TestTriangulationCache:
+
+    def test_hit_and_miss(self):
+        cache = TriangulationCache(max_bytes=100)
+        assert cache.get("a") is None
+        cache.put("a", b"xyz")
+        assert cache.get("a") == b"xyz"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_by_bytes(self):
+        cache = TriangulationCache(max_bytes=10, max_entry_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")              # "a" devient la plus récente
+        cache.put("c", b"1234")     # dépasse 10 octets : "b" est évincée
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1234"
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 8
+
+    def test_ttl_expiration(self):
+        horloge = HorlogeFactice()
+        cache = TriangulationCache(max_bytes=100, ttl=10, horloge=horloge)
+        cache.put("a", b"1")
+
+        horloge.t = 11
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_entry_too_large(self):
+        cache = TriangulationCache(max_bytes=100)
+        assert cache.put("a", b"x" * 30) is False  # > 100 // 4
+        assert cache.stats()["entries"] == 0
+
+    def test_content_key(self):
+        assert content_key(b"abc") == content_key(bytearray(b"abc"))
+        assert content_key(b"abc") != content_key(b"abd")
@@ -0,0 +1,206 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+
+import pytest
+
+from triangulator import parallel
+from triangulator.compute import (
+    ComputeExecutor,
+    ComputeTimeoutError,
+    QueueFullError,
+    _arreter_processus,
+    triangulate_buffers,
+)
+from triangulator.serialisation import binary_to_coords, pointset_to_binary
+from triangulator.triangulation import simple_triangulation
+
+
+def blocs_partages():
+    """Blocs SharedMemory existants (Linux : /dev/shm/psm_*)."""
+    if not os.path.isdir("/dev/shm"):
+        return set()
+    return {nom for nom in os.listdir("/dev/shm") if nom.startswith("psm_")}
+
+
+def normaliser(triangles):
+    """Triangles comparables : rotation commençant au plus petit indice."""
+    resultat = set()
+    for t in triangles:
+        k = t.index(min(t))
+        resultat.add(tuple(t[k:]) + tuple(t[:k]))
+    return resultat
+
+
+@pytest.fixture
+def executor():
+    ex = ComputeExecutor(max_workers=1, max_pending=1, inline_threshold=10)
+    yield ex
+    ex.shutdown()
+
+
+class TestComputeExecutor:
+
+    def test_small_input_runs_inline(self, executor):
+        # Une lambda n'est pas picklable : elle ne peut tourner qu'en ligne
+        assert executor.run(lambda: 3, cout=5) == 3
+        assert executor.stats()["inline"] == 1
+        assert executor.stats()["submitted"] == 0
+
+    def test_large_input_runs_in_pool(self, executor):
+        points = [(0, 0), (1, 0), (1, 1), (0, 1)] * 5
+        tris = executor.run(simple_triangulation, points[:4], "delaunay",
+                            cout=len(points))
+        assert len(tris) == 2
+        assert executor.stats()["submitted"] == 1
+
+    def test_errors_are_propagated(self, executor):
+        with pytest.raises(ValueError):
+            executor.run(simple_triangulation, [(0, 0)], cout=100)
+
+    def test_timeout(self, executor):
+        with pytest.raises(ComputeTimeoutError):
+            executor.run(time.sleep, 2, cout=100, timeout=0.5)
+        assert executor.stats()["timeouts"] == 1
+
+    def test_queue_full(self, executor):
+        # Un calcul en cours occupe l'unique place jusqu'à sa fin
+        occupant = threading.Thread(
+            target=executor.run, args=(time.sleep, 1), kwargs={"cout": 100}
+        )
+        occupant.start()
+        while executor.stats()["pending"] == 0:
+            time.sleep(0.01)
+        with pytest.raises(QueueFullError):
+            executor.run(time.sleep, 0, cout=100)
+        assert executor.stats()["rejected"] == 1
+        occupant.join()
+
+    def test_timeout_recycles_pool(self, executor):
+        avant = executor.run(os.getpid, cout=100)
+        with pytest.raises(ComputeTimeoutError):
+            executor.run(time.sleep, 30, cout=100, timeout=0.5)
+
+        # Processus arrêté et place rendue : l'unique place est libre tout
+        # de suite, sur un nouveau processus
+        debut = time.monotonic()
+        assert executor.run(os.getpid, cout=100) != avant
+        assert time.monotonic() - debut < 10
+        assert executor.stats()["recycled"] == 1
+
+    def test_timeout_terminates_hung_worker(self, executor):
+        executor.run(os.getpid, cout=100)
+        processus = list(executor._pool._processes.values())
+        with pytest.raises(ComputeTimeoutError):
+            executor.run(time.sleep, 30, cout=100, timeout=0.5)
+
+        # Le processus bloqué est bien arrêté, pas seulement abandonné
+        for p in processus:
+            p.join(timeout=10)
+            assert not p.is_alive()
+
+    def test_stop_without_private_processes(self, monkeypatch):
+        # Attribut privé absent : repli sur l'annulation des calculs
+        pool = ProcessPoolExecutor(max_workers=1)
+        appels = []
+        monkeypatch.setattr(pool, "_processes", None)
+        monkeypatch.setattr(pool, "shutdown",
+                            lambda **kwargs: appels.append(kwargs))
+        _arreter_processus(pool)
+        assert appels == [{"wait": False, "cancel_futures": True}]
+
+    def test_broken_pool_is_rebuilt(self, executor):
+        # Processus du calcul arrêté brutalement
+        with pytest.raises(BrokenProcessPool):
+            executor.run(os._exit, 1, cout=100)
+        assert executor.run(os.getpid, cout=100) != os.getpid()
+
+        # Processus tué entre deux calculs (ex. par le système)
+        pool = executor._pool
+        for processus in list(pool._processes.values()):
+            processus.kill()
+        while not pool._broken:
+            time.sleep(0.01)
+        assert executor.run(os.getpid, cout=100) != os.getpid()
+        assert executor.stats()["recycled"] == 2
+
+    def test_other_jobs_resubmitted_after_recycle(self):
+        ex = ComputeExecutor(max_workers=2, max_pending=2, inline_threshold=10)
+        erreurs = []
+
+        def voisin():
+            try:
+                ex.run(time.sleep, 2, cout=100)
+            except Exception as e:
+                erreurs.append(e)
+
+        try:
+            thread = threading.Thread(target=voisin)
+            thread.start()
+            with pytest.raises(ComputeTimeoutError):
+                ex.run(time.sleep, 30, cout=100, timeout=1)
+            thread.join()
+        finally:
+            ex.shutdown()
+        assert erreurs == []
+        assert ex.stats()["resubmitted"] == 1
+
+    def test_disabled_pool_runs_inline(self):
+        ex = ComputeExecutor(max_workers=0)
+        assert ex.run(lambda: "ok", cout=10 ** 9) == "ok"
+
+
+class TestTriangulateBuffers:
+
+    def test_shared_memory_matches_inline(self, executor):
+        points = [(random.random(), random.random()) for _ in range(200)]
+        coords = binary_to_coords(pointset_to_binary(points))
+        avant = blocs_partages()
+
+        indices = triangulate_buffers(executor, coords, "delaunay")
+
+        attendu = simple_triangulation(
+            [tuple(coords[i:i + 2]) for i in range(0, len(coords), 2)],
+            "delaunay",
+        )
+        assert list(indices) == list(chain.from_iterable(attendu))
+        assert executor.stats()["submitted"] == 1
+        # Les blocs partagés sont libérés
+        assert blocs_partages() <= avant
+
+    def test_inline_path(self, executor):
+        coords = binary_to_coords(pointset_to_binary([(0, 0), (1, 0), (0, 1)]))
+        assert list(triangulate_buffers(executor, coords, "delaunay")) == [
+            0, 1, 2
+        ]
+        assert executor.stats()["inline"] == 1
+
+    def test_delaunay_parallel_strips_go_through_pool(self, monkeypatch):
+        monkeypatch.setattr(parallel, "MIN_POINTS_BANDE", 100)
+        random.seed(7)
+        points = [(random.random(), random.random()) for _ in range(400)]
+        coords = binary_to_coords(pointset_to_binary(points))
+        ex = ComputeExecutor(max_workers=2, inline_threshold=10)
+        try:
+            indices = triangulate_buffers(ex, coords, "delaunay_parallel")
+        finally:
+            ex.shutdown()
+
+        attendu = simple_triangulation(
+            [tuple(coords[i:i + 2]) for i in range(0, len(coords), 2)],
+            "delaunay",
+        )
+        obtenu = [tuple(indices[i:i + 3]) for i in range(0, len(indices), 3)]
+        assert normaliser(obtenu) == normaliser(attendu)
+        # Une soumission par bande
+        assert ex.stats()["submitted"] == 2
+
+    def test_delaunay_parallel_single_strip_fallback(self, executor):
+        coords = binary_to_coords(pointset_to_binary([(0, 0), (1, 0), (0, 1)]))
+        indices = triangulate_buffers(executor, coords, "delaunay_parallel")
+        assert list(indices) == [0, 1, 2]
+        assert executor.stats()["inline"] == 1
@@ -0,0 +1,98 @@
+import gzip
+import io
+import zlib
+
+import pytest
+
+from triangulator.content_encoding import (
+    DecompressingReader,
+    UnsupportedEncodingError,
+    compress,
+    decompress,
+    iter_compress,
+    negotiate,
+)
+from triangulator.serialisation import pointset_to_binary, read_pointset_stream
+
+
+class TestNegotiate:
+
+    def test_no_header(self):
+        assert negotiate(None) is None
+        assert negotiate("") is None
+
+    def test_server_preference_on_tie(self):
+        assert negotiate("deflate, gzip", ("gzip", "deflate")) == "gzip"
+
+    def test_quality_wins(self):
+        assert negotiate("gzip;q=0.5, deflate", ("gzip", "deflate")) == "deflate"
+
+    def test_refused_and_wildcard(self):
+        assert negotiate("gzip;q=0", ("gzip",)) is None
+        assert negotiate("identity") is None
+        assert negotiate("*", ("gzip", "deflate")) == "gzip"
+        assert negotiate("br", ("gzip",)) is None
+
+
+class TestCompression:
+
+    @pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+    def test_streaming_round_trip(self, encoding):
+        blocs = [bytes(range(256)) * 40 for _ in range(10)]
+        compresse = b"".join(iter_compress(iter(blocs), encoding))
+
+        assert len(compresse) < sum(map(len, blocs))
+        assert decompress(compresse, encoding) == b"".join(blocs)
+
+    def test_standard_formats(self):
+        data = b"triangulator" * 100
+        assert gzip.decompress(compress(data, "gzip")) == data
+        assert zlib.decompress(compress(data, "deflate")) == data
+
+    def test_source_closed(self):
+        fermes = []
+
+        def blocs():
+            try:
+                yield b"a" * 100
+                yield b"b" * 100
+            finally:
+                fermes.append(True)
+
+        flux = iter_compress(blocs(), "gzip")
+        next(flux)
+        flux.close()
+        assert fermes == [True]
+
+    def test_unsupported(self):
+        with pytest.raises(UnsupportedEncodingError):
+            compress(b"x", "br")
+        with pytest.raises(UnsupportedEncodingError):
+            DecompressingReader(io.BytesIO(b""), "br")
+
+
+class TestDecompressingReader:
+
+    def test_bounded_reads(self):
+        # 64 Mo de zéros : seuls les octets demandés sont produits
+        compresse = compress(bytes(64 * 1024 * 1024), "gzip")
+        lecteur = DecompressingReader(io.BytesIO(compresse), "gzip")
+
+        assert lecteur.read(4) == bytes(4)
+        assert len(lecteur.read(1000)) <= 1000
+
+    def test_pointset_stream(self):
+        points = [(float(i), float(-i)) for i in range(5000)]
+        data = pointset_to_binary(points)
+        lecteur = DecompressingReader(
+            io.BytesIO(compress(data, "deflate")), "deflate", taille_bloc=512
+        )
+
+        coords = read_pointset_stream(lecteur, taille_bloc=1000)
+        assert list(coords[:4]) == [0.0, 0.0, 1.0, -1.0]
+        assert len(coords) == 10000
+        assert lecteur.read() == b""
+
+    def test_invalid_data(self):
+        with pytest.raises(ValueError):
+            decompress(b"pas du gzip", "gzip")
@@ -0,0 +1,215 @@
+import random
+from fractions import Fraction
+
+from triangulator.delaunay import (
+    DelaunayTriangulation,
+    IncrementalDelaunay,
+    delaunay_triangulation,
+    hilbert_order,
+)
+from triangulator.hull import convex_hull
+from triangulator.serialisation import (
+    binary_to_pointset,
+    binary_to_triangle_buffers,
+    binary_to_triangles,
+    pointset_to_binary,
+)
+from triangulator.triangles import (
+    validate_triangle_buffers,
+    validate_triangulation,
+)
+
+
+def cercle_vide(points, triangles):
+    """Vérifie le critère de Delaunay (aucun point dans un cercle)."""
+    for a, b, c in triangles:
+        (ax, ay), (bx, by), (cx, cy) = points[a], points[b], points[c]
+        for i, (px, py) in enumerate(points):
+            if i in (a, b, c):
+                continue
+            adx, ady = ax - px, ay - py
+            bdx, bdy = bx - px, by - py
+            cdx, cdy = cx - px, cy - py
+            det = (
+                (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+                + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+                + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+            )
+            if det > 1e-9:
+                return False
+    return True
+
+
+def double_aire_exacte(points, triangles):
+    """Somme exacte des doubles aires signées des triangles."""
+    total = Fraction(0)
+    for a, b, c in triangles:
+        (ax, ay), (bx, by), (cx, cy) = (
+            (Fraction(x), Fraction(y)) for x, y in (points[a], points[b], points[c])
+        )
+        total += (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return total
+
+
+def double_aire_enveloppe(points):
+    h = convex_hull(points)
+    return double_aire_exacte(
+        points, [(h[0], h[i], h[i + 1]) for i in range(1, len(h) - 1)]
+    )
+
+
+class TestDelaunayReal:
+
+    def test_simple_triangle(self):
+        assert delaunay_triangulation([(0, 0), (1, 0), (0, 1)]) == [(0, 1, 2)]
+
+    def test_square(self):
+        pts = [(0, 0), (1, 0), (1, 1), (0, 1)]
+        tris = delaunay_triangulation(pts)
+        assert len(tris) == 2
+        assert validate_triangulation(pts, tris)
+
+    def test_collinear_points(self):
+        assert delaunay_triangulation([(0, 0), (1, 1), (2, 2), (3, 3)]) == []
+
+    def test_duplicate_points(self):
+        pts = [(0, 0), (1, 0), (0, 1), (1, 0)]
+        tris = delaunay_triangulation(pts)
+        assert len(tris) == 1
+        assert validate_triangulation(pts, tris)
+
+    def test_random_points_are_delaunay(self):
+        random.seed(42)
+        pts = [(random.random(), random.random()) for _ in range(150)]
+        tris = delaunay_triangulation(pts)
+        assert validate_triangulation(pts, tris)
+        assert cercle_vide(pts, tris)
+
+    def test_grid_triangle_count(self):
+        # Grille 10x10 : 2 * (9 * 9) triangles
+        pts = [(float(i), float(j)) for i in range(10) for j in range(10)]
+        tris = delaunay_triangulation(pts)
+        assert len(tris) == 162
+        assert validate_triangulation(pts, tris)
+
+    def test_add_point(self):
+        pts = [(0, 0), (4, 0), (0, 4)]
+        maillage = DelaunayTriangulation()
+        maillage.add_points(pts)
+        assert maillage.add_point(1, 1) is True
+        assert maillage.add_point(1, 1) is False  # doublon
+        assert len(maillage.triangles()) == 3
+
+    def test_thin_point_set_covers_hull(self):
+        # Nuages très allongés : l'enveloppe convexe est entièrement
+        # triangulée (aucun triangle perdu sur le bord)
+        for largeur, hauteur in ((1000.0, 1e-3), (100.0, 0.1)):
+            random.seed(3)
+            pts = [(random.uniform(0, largeur), random.uniform(0, hauteur))
+                   for _ in range(300)]
+            tris = delaunay_triangulation(pts)
+            assert validate_triangulation(pts, tris)
+            assert double_aire_exacte(pts, tris) == double_aire_enveloppe(pts)
+            # Points en position générale : 2n - 2 - h triangles
+            assert len(tris) == 2 * len(pts) - 2 - len(convex_hull(pts))
+
+    def test_points_on_hull_edges(self):
+        # Points ajoutés sur les arêtes et dans le prolongement des arêtes
+        # de l'enveloppe
+        pts = [(0, 0), (4, 0), (0, 4), (2, 0), (0, 2), (6, 0), (-1, 5),
+               (2, 2), (8, 0)]
+        tris = delaunay_triangulation(pts)
+        assert validate_triangulation(pts, tris)
+        assert double_aire_exacte(pts, tris) == double_aire_enveloppe(pts)
+        assert cercle_vide(pts, tris)
+
+    def test_hilbert_order_is_permutation(self):
+        pts = [(random.random(), random.random()) for _ in range(50)]
+        assert sorted(hilbert_order(pts)) == list(range(50))
+
+
+class TestIncrementalDelaunay:
+
+    def test_matches_batch(self):
+        random.seed(7)
+        pts = [(random.random(), random.random()) for _ in range(400)]
+        maillage = IncrementalDelaunay(pts[:100])
+        for debut in range(100, 400, 50):
+            maillage.add_points(pts[debut:debut + 50])
+            attendu = delaunay_triangulation(pts[:debut + 50])
+            assert sorted(maillage.triangles()) == sorted(attendu)
+        assert len(maillage) == 400
+
+    def test_point_far_outside(self):
+        pts = [(0, 0), (1, 0), (0, 1), (1.2, 0.9)]
+        maillage = IncrementalDelaunay(pts)
+        maillage.add_points([(1e7, 1e7)])
+        tous = pts + [(1e7, 1e7)]
+        assert sorted(maillage.triangles()) == sorted(
+            delaunay_triangulation(tous)
+        )
+
+    def test_thin_point_set_covers_hull(self):
+        random.seed(5)
+        pts = [(random.uniform(0, 1000), random.uniform(0, 1e-3))
+               for _ in range(200)]
+        maillage = IncrementalDelaunay()
+        for x, y in pts:
+            maillage.add_point(x, y)
+        tris = maillage.triangles()
+        assert validate_triangulation(pts, tris)
+        assert double_aire_exacte(pts, tris) == double_aire_enveloppe(pts)
+
+    def test_start_empty_and_degenerate(self):
+        maillage = IncrementalDelaunay()
+        assert maillage.triangles() == []
+        assert maillage.add_point(0, 0) is True
+        maillage.add_points([(1, 1), (2, 2)])
+        assert maillage.triangles() == []  # points alignés
+        maillage.add_points([(2, 0)])
+        assert len(maillage.triangles()) == 2
+        assert maillage.add_point(2, 0) is False  # doublon
+        assert len(maillage) == 5
+
+    def test_mesh_and_bytes(self):
+        pts = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+        maillage = IncrementalDelaunay(pts)
+        mesh = maillage.mesh()
+        assert mesh.points == pts
+        assert sorted(mesh) == sorted(maillage.triangles())
+
+        points, triangles = binary_to_triangles(maillage.to_bytes())
+        assert points == pts
+        assert sorted(triangles) == sorted(maillage.triangles())
+
+        # La copie ne suit pas les ajouts suivants
+        maillage.add_points([(0.5, 0.5)])
+        assert len(mesh) == 2
+        assert len(maillage.triangles()) == 4
+
+    def test_float32_coordinates_on_insert(self):
+        # Coordonnées arrondies en float32 dès l'ajout, comme sur le fil
+        pts = [(0.1, 0.2), (1.3, 0.0), (0.0, 1.7)]
+        maillage = IncrementalDelaunay(pts[:2])
+        maillage.add_point(*pts[2])
+
+        arrondis = binary_to_pointset(pointset_to_binary(pts))
+        assert arrondis != pts
+        assert maillage.points() == arrondis
+        assert maillage.mesh().points == arrondis
+        assert binary_to_triangles(maillage.to_bytes())[0] == arrondis
+
+    def test_near_coincident_points_export_valid(self):
+        # Points confondus une fois arrondis en float32 : doublons, et le
+        # maillage exporté reste valide (aucun triangle plat ni retourné)
+        random.seed(20)
+        pts = [(1000 + random.uniform(0, 1e-3), 1000 + random.uniform(0, 1e-3))
+               for _ in range(50)]
+        maillage = IncrementalDelaunay(pts[:25])
+        for x, y in pts[25:]:
+            maillage.add_point(x, y)
+
+        coords, indices = binary_to_triangle_buffers(maillage.to_bytes())
+        assert len(indices)
+        assert validate_triangle_buffers(coords, indices).valid
+        assert len(set(maillage.points())) < len(pts)
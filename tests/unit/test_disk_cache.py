@@ -0,0 +1,69 @@
+import mmap
+import os
+
+from triangulator.disk_cache import DiskTriangulationCache, iter_mmap
+
+
+class TestDiskTriangulationCache:
+
+    def test_put_get(self, tmp_path):
+        cache = DiskTriangulationCache(str(tmp_path))
+        assert cache.get("cle") is None
+
+        cache.put("cle", b"abcdef")
+        contenu = cache.get("cle")
+        assert contenu[:] == b"abcdef"
+        contenu.close()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicted_during_get_leaves_nothing_open(self, tmp_path,
+                                                     monkeypatch):
+        cache = DiskTriangulationCache(str(tmp_path))
+        cache.put("cle", b"abcdef")
+
+        # Entrée évincée par un autre processus pendant la lecture
+        def utime(*args):
+            raise FileNotFoundError
+        projections = []
+        projeter = mmap.mmap
+
+        def mmap_suivi(*args, **kwargs):
+            projections.append(projeter(*args, **kwargs))
+            return projections[-1]
+        monkeypatch.setattr(os, "utime", utime)
+        monkeypatch.setattr(mmap, "mmap", mmap_suivi)
+
+        assert cache.get("cle") is None
+        assert all(p.closed for p in projections)
+        assert cache.stats()["misses"] == 1
+
+    def test_put_chunks_and_iter(self, tmp_path):
+        cache = DiskTriangulationCache(str(tmp_path))
+        cache.put("cle", iter([b"abc", b"def", b"g"]))
+
+        blocs = list(iter_mmap(cache.get("cle"), taille_bloc=2))
+        assert blocs == [b"ab", b"cd", b"ef", b"g"]
+
+    def test_survives_restart(self, tmp_path):
+        DiskTriangulationCache(str(tmp_path)).put("cle", b"123")
+
+        cache = DiskTriangulationCache(str(tmp_path))
+        assert cache.stats()["bytes"] == 3
+        assert cache.get("cle")[:] == b"123"
+
+    def test_size_cap_evicts_oldest(self, tmp_path):
+        cache = DiskTriangulationCache(str(tmp_path), max_bytes=10)
+        cache.put("a", b"1234")
+        os.utime(tmp_path / "a.tri", (0, 0))  # "a" est la plus ancienne
+        cache.put("b", b"1234")
+        cache.put("c", b"1234")
+
+        assert cache.get("a") is None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= 10
+
+    def test_entry_too_large(self, tmp_path):
+        cache = DiskTriangulationCache(str(tmp_path), max_bytes=4)
+        assert cache.put("a", b"12345") is False
+        assert os.listdir(tmp_path) == []
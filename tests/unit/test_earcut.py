@@ -0,0 +1,74 @@
+import math
+import random
+
+import pytest
+
+from triangulator.earcut import earcut_triangulation
+from triangulator.triangles import validate_triangulation
+
+
+def aire_signee(a, b, c):
+    return ((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])) / 2
+
+
+def aire_polygone(points):
+    return abs(sum(
+        points[i - 1][0] * points[i][1] - points[i][0] * points[i - 1][1]
+        for i in range(len(points))
+    )) / 2
+
+
+def etoile(n, graine=0):
+    """Polygone simple en étoile : rayon aléatoire à angles réguliers."""
+    r = random.Random(graine)
+    points = []
+    for k in range(n):
+        rayon = 1 + r.random()
+        angle = 2 * math.pi * k / n
+        points.append((rayon * math.cos(angle), rayon * math.sin(angle)))
+    return points
+
+
+def verifier_pavage(points, triangles, nb_sommets=None):
+    """Triangles directs, non dégénérés, couvrant exactement le polygone."""
+    nb_sommets = len(points) if nb_sommets is None else nb_sommets
+    assert len(triangles) == nb_sommets - 2
+    assert validate_triangulation(points, triangles)
+    assert all(aire_signee(*(points[i] for i in t)) > 0 for t in triangles)
+    total = sum(aire_signee(*(points[i] for i in t)) for t in triangles)
+    assert total == pytest.approx(aire_polygone(points))
+
+
+class TestEarcut:
+
+    def test_triangle(self):
+        assert earcut_triangulation([(0, 0), (1, 0), (0, 1)]) == [(2, 0, 1)]
+
+    def test_both_orientations(self):
+        carre = [(0, 0), (1, 0), (1, 1), (0, 1)]
+        verifier_pavage(carre, earcut_triangulation(carre))
+        verifier_pavage(carre[::-1], earcut_triangulation(carre[::-1]))
+
+    def test_collinear(self):
+        assert earcut_triangulation([(0, 0), (1, 0), (2, 0)]) == []
+        assert earcut_triangulation([(0, 0), (1, 1), (2, 2), (3, 3)]) == []
+
+    def test_concave(self):
+        # Peigne : beaucoup de sommets réflexes
+        points = [(0, 0), (10, 0), (10, 1)]
+        for k in range(9, 0, -1):
+            points += [(k + 0.5, 3), (k, 1)]
+        points.append((0, 1))
+        verifier_pavage(points, earcut_triangulation(points))
+
+    @pytest.mark.parametrize("n", [10, 81, 500])
+    def test_star_polygons(self, n):
+        for graine in range(5):
+            points = etoile(n, graine)
+            verifier_pavage(points, earcut_triangulation(points))
+
+    def test_duplicate_and_collinear_vertices_skipped(self):
+        points = [(0, 0), (1, 0), (1, 0), (2, 0), (2, 2), (0, 2)]
+        triangles = earcut_triangulation(points)
+        assert {i for t in triangles for i in t} == {0, 3, 4, 5}
+        verifier_pavage(points, triangles, nb_sommets=4)
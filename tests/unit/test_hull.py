@@ -0,0 +1,50 @@
+from triangulator.hull import (
+    convex_hull,
+    fast_path_triangulation,
+    is_convex_polygon,
+)
+
+
+class TestConvexHull:
+
+    def test_square_with_inner_point(self):
+        points = [(0,0), (1,0), (0.5,0.5), (1,1), (0,1)]
+        assert convex_hull(points) == [0, 1, 3, 4]
+
+    def test_collinear_edge_points_removed(self):
+        points = [(0,0), (1,0), (2,0), (2,2), (0,2)]
+        assert sorted(convex_hull(points)) == [0, 2, 3, 4]
+
+    def test_all_collinear(self):
+        points = [(0,0), (3,3), (1,1), (2,2)]
+        assert len(convex_hull(points)) == 2
+
+    def test_all_identical(self):
+        assert len(convex_hull([(1,1), (1,1), (1,1)])) == 1
+
+
+class TestFastPath:
+
+    def test_convex_ccw(self):
+        points = [(0,0), (1,0), (1,1), (0,1)]
+        assert is_convex_polygon(points)
+        assert fast_path_triangulation(points) == [(0,1,2), (0,2,3)]
+
+    def test_convex_cw_rotated(self):
+        points = [(1,1), (1,0), (0,0), (0,1)]
+        assert is_convex_polygon(points)
+        assert len(fast_path_triangulation(points)) == 2
+
+    def test_convex_points_out_of_order(self):
+        # Tous sur l'enveloppe, mais le polygone se croise
+        points = [(0,0), (1,1), (1,0), (0,1)]
+        assert not is_convex_polygon(points)
+        assert fast_path_triangulation(points) is None
+
+    def test_collinear_not_consecutive(self):
+        points = [(0,0), (2,0), (1,0), (3,0)]
+        assert fast_path_triangulation(points) == []
+
+    def test_concave(self):
+        points = [(0,0), (2,0), (1,1), (2,2), (0,2)]
+        assert fast_path_triangulation(points) is None
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from triangulator.compute import QueueFullError
+from triangulator.jobs import DONE, FAILED, QUEUED, JobQueue
+
+
+class HorlogeFactice:
+    """Horloge contrôlée par le test."""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def attendre(job, delai=5.0):
+    """Attend la fin d'un travail."""
+    fin = time.monotonic() + delai
+    while job.status not in (DONE, FAILED):
+        assert time.monotonic() < fin, "travail non terminé"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def file():
+    jobs = JobQueue(workers=1, max_pending=4)
+    yield jobs
+    jobs.shutdown()
+
+
+def bloquer(file):
+    """Occupe l'unique thread de `file` jusqu'à `liberer.set()`."""
+    liberer = threading.Event()
+    demarre = threading.Event()
+
+    def travail():
+        demarre.set()
+        liberer.wait()
+
+    job = file.submit(travail)
+    demarre.wait()
+    return job, liberer
+
+
+class TestJobQueue:
+
+    def test_result_and_failure(self, file):
+        ok = file.submit(lambda: 42)
+        ko = file.submit(lambda: 1 / 0)
+        attendre(ok)
+        attendre(ko)
+
+        assert file.get(ok.id).status == DONE
+        assert ok.resultat == 42
+        assert ko.status == FAILED
+        assert isinstance(ko.erreur, ZeroDivisionError)
+        assert file.stats()["completed"] == 1
+        assert file.stats()["failed"] == 1
+
+    def test_smallest_job_first(self, file):
+        occupe, liberer = bloquer(file)
+        ordre = []
+        travaux = [
+            file.submit(lambda c=cout: ordre.append(c), cout=cout)
+            for cout in (1000, 10, 500)
+        ]
+        assert all(job.status == QUEUED for job in travaux)
+
+        liberer.set()
+        for job in travaux:
+            attendre(job)
+        assert ordre == [10, 500, 1000]
+
+    def test_oldest_job_not_starved(self):
+        file = JobQueue(workers=1, starvation_delay=0.0)
+        try:
+            occupe, liberer = bloquer(file)
+            ordre = []
+            travaux = [
+                file.submit(lambda c=cout: ordre.append(c), cout=cout)
+                for cout in (1000, 10)
+            ]
+            liberer.set()
+            for job in travaux:
+                attendre(job)
+        finally:
+            file.shutdown()
+        assert ordre == [1000, 10]
+
+    def test_queue_full(self, file):
+        occupe, liberer = bloquer(file)
+        for _ in range(4):
+            file.submit(lambda: None)
+        with pytest.raises(QueueFullError):
+            file.submit(lambda: None)
+        assert file.stats()["rejected"] == 1
+        liberer.set()
+
+    def test_results_expire(self):
+        horloge = HorlogeFactice()
+        file = JobQueue(workers=1, ttl=10, horloge=horloge)
+        try:
+            job = file.submit(lambda: 42)
+            attendre(job)
+            horloge.t = 5
+            assert file.get(job.id) is job
+            horloge.t = 11
+            assert file.get(job.id) is None
+        finally:
+            file.shutdown()
+        assert file.stats()["expired"] == 1
+
+    def test_unknown_job(self, file):
+        assert file.get("inconnu") is None
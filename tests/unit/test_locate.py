@@ -0,0 +1,59 @@
+import random
+
+from triangulator.locate import PointLocator, locate_points
+from triangulator.mesh import PointSet, TriangleMesh
+from triangulator.triangulation import is_point_in_triangle, simple_triangulation
+
+CARRE = [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+
+class TestPointLocator:
+
+    def test_square(self):
+        loc = PointLocator(CARRE, [(0, 1, 2), (0, 2, 3)])
+        assert len(loc) == 2
+        assert loc.locate(0.9, 0.1) == 0
+        assert loc.locate(0.1, 0.9) == 1
+        assert loc.locate(1.5, 0.5) == -1
+        assert loc.locate(0.5, -0.1) == -1
+
+    def test_boundary_points(self):
+        loc = PointLocator(CARRE, [(0, 1, 2), (0, 2, 3)])
+        assert loc.locate(0, 0) in (0, 1)
+        assert loc.locate(0.5, 0.5) in (0, 1)
+        assert loc.locate(1, 0.5) == 0
+
+    def test_clockwise_and_flat_triangles(self):
+        pts = CARRE + [(2, 0)]
+        loc = PointLocator(pts, [(0, 2, 1), (0, 1, 4), (0, 3, 2)])
+        assert len(loc) == 2
+        assert loc.locate(0.9, 0.1) == 0
+        assert loc.locate(0.1, 0.9) == 2
+
+    def test_compact_types(self):
+        ps = PointSet.from_points(CARRE)
+        mesh = TriangleMesh.from_triangles(ps, [(0, 1, 2), (0, 2, 3)])
+        requetes = PointSet.from_points([(0.9, 0.1), (0.1, 0.9), (5, 5)])
+        assert list(locate_points(ps, mesh, requetes)) == [0, 1, -1]
+
+    def test_empty_mesh(self):
+        loc = PointLocator(CARRE, [])
+        assert list(loc.locate_many([(0.5, 0.5)])) == [-1]
+
+    def test_matches_brute_force(self):
+        random.seed(3)
+        pts = [(random.random(), random.random()) for _ in range(300)]
+        tris = simple_triangulation(pts, method="delaunay")
+        requetes = [(random.uniform(-0.2, 1.2), random.uniform(-0.2, 1.2))
+                    for _ in range(500)]
+
+        resultats = PointLocator(pts, tris).locate_many(requetes)
+        for (x, y), t in zip(requetes, resultats):
+            contenants = [
+                k for k, (a, b, c) in enumerate(tris)
+                if is_point_in_triangle((x, y), pts[a], pts[b], pts[c])
+            ]
+            if contenants:
+                assert t in contenants
+            else:
+                assert t == -1
@@ -0,0 +1,102 @@
+from array import array
+import sys
+
+import pytest
+
+from triangulator.mesh import PointSet, TriangleMesh
+from triangulator.serialisation import (
+    iter_triangles_binary,
+    pointset_to_binary,
+    triangles_to_binary,
+)
+from triangulator.triangles import validate_triangulation
+from triangulator.triangulation import simple_triangulation
+
+POINTS = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+TRIANGLES = [(0, 1, 2), (0, 2, 3)]
+
+
+class TestPointSet:
+
+    def test_sequence_interface(self):
+        ps = PointSet.from_points(POINTS)
+        assert len(ps) == 4
+        assert ps[1] == (1.0, 0.0)
+        assert ps[-1] == (0.0, 1.0)
+        assert list(ps) == POINTS
+        assert ps == POINTS
+        assert (1.0, 1.0) in ps
+        with pytest.raises(IndexError):
+            ps[4]
+
+    def test_slices(self):
+        ps = PointSet.from_points(POINTS)
+        assert ps[1:3] == POINTS[1:3]
+        assert ps[::2] == POINTS[::2]
+        assert ps[::-1] == POINTS[::-1]
+
+    def test_storage_is_float32(self):
+        ps = PointSet.from_points(POINTS)
+        assert isinstance(ps.coords, array)
+        assert ps.coords.typecode == "f"
+        assert not hasattr(ps, "__dict__")
+
+    def test_odd_coords(self):
+        with pytest.raises(ValueError):
+            PointSet([1.0, 2.0, 3.0])
+
+    @pytest.mark.skipif(sys.byteorder != "little", reason="vue little-endian")
+    def test_from_bytes_zero_copy(self):
+        data = bytearray(pointset_to_binary(POINTS))
+        ps = PointSet.from_bytes(data)
+        assert isinstance(ps.coords, memoryview)
+        assert ps == POINTS
+        # Le PointSet voit les modifications du tampon d'origine
+        data[4:8] = array("f", [5.0]).tobytes()
+        assert ps[0] == (5.0, 0.0)
+
+    def test_round_trip(self):
+        ps = PointSet.from_points(POINTS)
+        assert ps.to_bytes() == pointset_to_binary(POINTS)
+        assert pointset_to_binary(ps) == pointset_to_binary(POINTS)
+        assert PointSet.from_bytes(ps.to_bytes()) == ps
+
+
+class TestTriangleMesh:
+
+    def test_sequence_interface(self):
+        mesh = TriangleMesh.from_triangles(POINTS, TRIANGLES)
+        assert len(mesh) == 2
+        assert mesh[1] == (0, 2, 3)
+        assert list(mesh) == TRIANGLES
+        assert mesh == TRIANGLES
+        assert mesh[1:] == TRIANGLES[1:]
+        assert mesh.points == POINTS
+        assert mesh.indices.typecode == "I"
+
+    def test_codecs(self):
+        mesh = TriangleMesh.from_triangles(POINTS, TRIANGLES)
+        attendu = triangles_to_binary(POINTS, TRIANGLES)
+        assert mesh.to_bytes() == attendu
+        assert triangles_to_binary(mesh.points, mesh) == attendu
+        assert b"".join(
+            iter_triangles_binary(mesh.points, mesh, taille_bloc=8)
+        ) == attendu
+        assert TriangleMesh.from_bytes(attendu) == mesh
+
+    def test_bad_indices(self):
+        with pytest.raises(ValueError):
+            TriangleMesh(POINTS, [0, 1])
+
+
+class TestEngineIntegration:
+
+    def test_triangulation_of_pointset(self):
+        ps = PointSet.from_points([(0, 0), (2, 0), (1, 1), (2, 2), (0, 2)])
+        for method, attendu in (("ear_clipping", 3), ("earcut", 3),
+                                ("delaunay", 4)):
+            tris = simple_triangulation(ps, method=method)
+            assert len(tris) == attendu
+            assert validate_triangulation(
+                ps, TriangleMesh.from_triangles(ps, tris)
+            )
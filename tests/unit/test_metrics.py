@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from triangulator.metrics import MetricsRegistry
+
+
+class TestMetrics:
+
+    def test_counter_with_labels(self):
+        registre = MetricsRegistry()
+        erreurs = registre.counter("app_errors_total", "Erreurs.", ("branch",))
+        erreurs.inc(("psm",))
+        erreurs.inc(("psm",))
+        erreurs.inc(("decode",))
+
+        texte = registre.render()
+        assert "# HELP app_errors_total Erreurs." in texte
+        assert "# TYPE app_errors_total counter" in texte
+        assert 'app_errors_total{branch="psm"} 2' in texte
+        assert 'app_errors_total{branch="decode"} 1' in texte
+
+    def test_histogram_cumulative_buckets(self):
+        registre = MetricsRegistry()
+        tailles = registre.histogram("app_points", "Points.", buckets=(10, 100))
+        for valeur in (5, 10, 50, 1000):
+            tailles.observe(valeur)
+
+        lignes = registre.render().splitlines()
+        assert 'app_points_bucket{le="10"} 2' in lignes
+        assert 'app_points_bucket{le="100"} 3' in lignes
+        assert 'app_points_bucket{le="+Inf"} 4' in lignes
+        assert "app_points_sum 1065" in lignes
+        assert "app_points_count 4" in lignes
+
+    def test_histogram_timer(self):
+        registre = MetricsRegistry()
+        etapes = registre.histogram("app_stage_seconds", "Étapes.", ("stage",))
+        with etapes.time(("fetch",)):
+            pass
+        assert etapes.count(("fetch",)) == 1
+        assert 'app_stage_seconds_bucket{stage="fetch",le="0.001"} 1' \
+            in registre.render()
+
+    def test_gauge_inc_dec_and_callback(self):
+        registre = MetricsRegistry()
+        en_cours = registre.gauge("app_in_flight", "En cours.", ("route",))
+        en_cours.inc(("a",))
+        en_cours.inc(("a",))
+        en_cours.dec(("a",))
+        registre.gauge("app_pending", "En attente.", fonction=lambda: 7)
+
+        texte = registre.render()
+        assert 'app_in_flight{route="a"} 1' in texte
+        assert "app_pending 7" in texte
+
+    def test_label_escaping(self):
+        registre = MetricsRegistry()
+        compteur = registre.counter("app_total", "Total.", ("id",))
+        compteur.inc(('a"b\\c',))
+        assert 'app_total{id="a\\"b\\\\c"} 1' in registre.render()
+
+    def test_errors(self):
+        registre = MetricsRegistry()
+        compteur = registre.counter("app_total", "Total.", ("branch",))
+        with pytest.raises(ValueError):
+            compteur.inc()
+        with pytest.raises(ValueError):
+            registre.gauge("app_total", "Doublon.")
+
+    def test_concurrent_increments(self):
+        registre = MetricsRegistry()
+        compteur = registre.counter("app_total", "Total.")
+
+        def travail():
+            for _ in range(1000):
+                compteur.inc()
+
+        threads = [threading.Thread(target=travail) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert compteur.get() == 8000
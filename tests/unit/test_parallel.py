@@ -0,0 +1,100 @@
+from array import array
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from triangulator.delaunay import delaunay_triangulation
+from triangulator.parallel import (
+    _octets_vers_indices,
+    _trianguler_bande,
+    parallel_delaunay,
+)
+from triangulator.triangles import triangle_area, validate_triangulation
+
+
+def normaliser(triangles):
+    """Triangles comparables : rotation commençant au plus petit indice."""
+    resultat = set()
+    for t in triangles:
+        k = t.index(min(t))
+        resultat.add(tuple(t[k:]) + tuple(t[:k]))
+    return resultat
+
+
+def aire_totale(points, triangles):
+    return sum(triangle_area(points[a], points[b], points[c])
+               for a, b, c in triangles)
+
+
+@pytest.fixture
+def pool():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+class TestParallelDelaunay:
+
+    def test_random_points_same_as_single_core(self, pool):
+        random.seed(21)
+        points = [(random.random(), random.random()) for _ in range(2000)]
+
+        triangles = parallel_delaunay(points, workers=4, executor=pool,
+                                      min_points_bande=100)
+
+        assert len(triangles) == len(set(triangles))
+        assert normaliser(triangles) == normaliser(delaunay_triangulation(points))
+        assert validate_triangulation(points, triangles)
+
+    def test_grid_covers_hull(self, pool):
+        # Points cocycliques : les diagonales peuvent différer du mono-cœur,
+        # mais le maillage recouvre exactement le carré.
+        points = [(float(i), float(j)) for i in range(30) for j in range(30)]
+
+        triangles = parallel_delaunay(points, workers=3, executor=pool,
+                                      min_points_bande=100)
+
+        assert len(triangles) == 2 * 29 * 29
+        assert validate_triangulation(points, triangles)
+        assert aire_totale(points, triangles) == pytest.approx(29.0 * 29.0)
+
+    def test_duplicate_points(self, pool):
+        random.seed(3)
+        base = [(random.randint(0, 40) / 40, random.randint(0, 40) / 40)
+                for _ in range(1500)]
+        points = base + base[:500]
+
+        triangles = parallel_delaunay(points, workers=4, executor=pool,
+                                      min_points_bande=100)
+
+        assert validate_triangulation(points, triangles)
+        assert aire_totale(points, triangles) == pytest.approx(
+            aire_totale(points, delaunay_triangulation(points))
+        )
+
+    def test_small_input_falls_back_to_single_core(self):
+        points = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        assert parallel_delaunay(points, workers=8) == \
+            delaunay_triangulation(points)
+
+    def test_process_pool(self):
+        random.seed(5)
+        points = [(random.random(), random.random()) for _ in range(600)]
+
+        triangles = parallel_delaunay(points, workers=2, min_points_bande=100)
+
+        assert normaliser(triangles) == normaliser(delaunay_triangulation(points))
+
+    def test_near_flat_triangle_goes_to_seam(self):
+        # Orientation exacte non nulle, mais 2 * (bx * cy - by * cx) vaut
+        # 0.0 en flottants : pas de centre, triangle laissé à la couture
+        points = [(0.0, 0.0), (1 + 2 ** -52, 1.0), (1.0, 1 - 2 ** -53)]
+        assert delaunay_triangulation(points) == [(0, 1, 2)]
+        data = array("d", [v for p in points for v in p]).tobytes()
+
+        definitifs, couture, _ = _trianguler_bande(
+            data, -math.inf, math.inf, 0.0
+        )
+        assert definitifs == b""
+        assert list(_octets_vers_indices(couture)) == [0, 1, 2]
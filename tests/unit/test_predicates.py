@@ -0,0 +1,60 @@
+from fractions import Fraction
+
+from triangulator.predicates import incircle, orient2d
+from triangulator.triangles import are_points_collinear
+
+
+def signe(v):
+    return (v > 0) - (v < 0)
+
+
+def orient_exact(ax, ay, bx, by, cx, cy):
+    ax, ay, bx, by, cx, cy = map(Fraction, (ax, ay, bx, by, cx, cy))
+    return signe((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+class TestOrient2d:
+
+    def test_simple_cases(self):
+        assert orient2d(0, 0, 1, 0, 0, 1) > 0
+        assert orient2d(0, 0, 0, 1, 1, 0) < 0
+        assert orient2d(0, 0, 1, 1, 2, 2) == 0
+
+    def test_near_collinear_grid(self):
+        # Grille de points à quelques ulps de la droite y = x : le calcul
+        # naïf se trompe souvent de signe, le prédicat jamais
+        for i in range(64):
+            for j in range(64):
+                px = 0.5 + i * 2.0 ** -53
+                py = 0.5 + j * 2.0 ** -53
+                attendu = orient_exact(px, py, 12.0, 12.0, 24.0, 24.0)
+                assert signe(orient2d(px, py, 12.0, 12.0, 24.0, 24.0)) \
+                    == attendu
+
+    def test_tiny_non_zero(self):
+        assert orient2d(0.0, 0.0, 1.0, 1e-300, 2.0, 0.0) < 0
+
+
+class TestIncircle:
+
+    def test_simple_cases(self):
+        assert incircle(0, 0, 1, 0, 0, 1, 0.5, 0.5) > 0
+        assert incircle(0, 0, 1, 0, 0, 1, 2, 2) < 0
+
+    def test_cocircular(self):
+        assert incircle(0, 0, 1, 0, 0, 1, 1, 1) == 0
+        assert incircle(1, 0, 0, 1, -1, 0, 0, -1) == 0
+
+    def test_near_cocircular(self):
+        d = 1.0 + 2.0 ** -52
+        assert incircle(0, 0, 1, 0, 0, 1, d, 1) < 0
+        assert incircle(0, 0, 1, 0, 0, 1, 1 - 2.0 ** -53, 1) > 0
+
+
+class TestCollinear:
+
+    def test_exact_with_zero_epsilon(self):
+        assert are_points_collinear((0, 0), (1, 1e-12), (2, 0),
+                                    epsilon=0.0) is False
+        # Tolérance par défaut inchangée
+        assert are_points_collinear((0, 0), (1, 1e-12), (2, 0)) is True
@@ -0,0 +1,58 @@
+import os
+import pstats
+
+from triangulator.profiling import ProfileStore, server_timing_header
+
+
+def travail(n):
+    return sum(range(n))
+
+
+class TestServerTiming:
+
+    def test_format(self):
+        valeur = server_timing_header([("fetch_pointset", 0.0125),
+                                       ("total", 0.5)])
+        assert valeur == "fetch_pointset;dur=12.500, total;dur=500.000"
+
+    def test_invalid_characters_replaced(self):
+        assert server_timing_header([("a b;c", 0.001)]) == "a_b_c;dur=1.000"
+
+
+class TestProfileStore:
+
+    def test_profile_saved_with_key(self, tmp_path):
+        store = ProfileStore(str(tmp_path / "profils"))
+        resultat, nom = store.profile("delaunay-abc", travail, 1000)
+
+        assert resultat == sum(range(1000))
+        assert nom.endswith("-delaunay-abc.prof")
+        stats = pstats.Stats(str(tmp_path / "profils" / nom))
+        assert any(fonction[2] == "travail" for fonction in stats.stats)
+
+    def test_profile_kept_on_error(self, tmp_path):
+        store = ProfileStore(str(tmp_path))
+
+        def echec():
+            raise ValueError("boom")
+
+        try:
+            store.profile("cle", echec)
+        except ValueError:
+            pass
+        assert len(store.files()) == 1
+
+    def test_bounded_directory(self, tmp_path):
+        store = ProfileStore(str(tmp_path), max_files=3)
+        noms = [store.profile(f"cle{i}", travail, 10)[1] for i in range(5)]
+
+        assert [os.path.basename(c) for c in store.files()] == noms[2:]
+        assert not [n for n in os.listdir(tmp_path) if n.endswith(".tmp")]
+
+    def test_sampling(self, tmp_path):
+        tirages = iter([0.05, 0.5])
+        store = ProfileStore(str(tmp_path), sample_rate=0.1,
+                             aleatoire=lambda: next(tirages))
+        assert store.sampled()
+        assert not store.sampled()
+        assert ProfileStore(str(tmp_path)).sampled()
@@ -1,9 +1,29 @@
 import pytest
+from array import array
+import io
+
 from triangulator.serialisation import (
     pointset_to_binary,
     binary_to_pointset,
     triangles_to_binary,
     binary_to_triangles,
+    binary_to_coords,
+    coords_to_binary,
+    binary_to_triangle_buffers,
+    triangle_buffers_to_binary,
+    iter_triangles_binary,
+    triangles_binary_size,
+    read_pointset_stream,
+    PointSetTooLargeError,
+    pack_pointset_into,
+    iter_triangle_buffers_binary,
+    frame_header,
+    locations_to_binary,
+    binary_to_locations,
+    frame_to_binary,
+    binary_to_frames,
+    triangle_buffers_to_compact_binary,
+    typed_triangle_buffers,
 )
 
 
@@ -38,3 +58,227 @@ class TestSerialisationReal:
     def test_invalid_binary_triangles(self):
         with pytest.raises(Exception):
             binary_to_triangles(b"\x05\x00\x00\x99")
+
+
+class TestSerialisationBuffers:
+
+    def test_coords_roundtrip(self):
+        data = pointset_to_binary([(0.0, 1.0), (2.5, -3.75)])
+        coords = binary_to_coords(data)
+        assert list(coords) == [0.0, 1.0, 2.5, -3.75]
+        assert coords_to_binary(coords) == data
+
+    def test_coords_from_array(self):
+        coords = array("f", [0.0, 1.0, 2.5, -3.75])
+        assert coords_to_binary(coords) == pointset_to_binary(
+            [(0.0, 1.0), (2.5, -3.75)]
+        )
+
+    def test_triangle_buffers_roundtrip(self):
+        data = triangles_to_binary([(0, 0), (1, 0), (0, 1)], [(0, 1, 2)])
+        coords, indices = binary_to_triangle_buffers(data)
+        assert list(indices) == [0, 1, 2]
+        assert triangle_buffers_to_binary(coords, indices) == data
+
+    def test_same_errors_as_list_api(self):
+        with pytest.raises(ValueError, match="trop courtes"):
+            binary_to_coords(b"\x00\x01")
+        with pytest.raises(ValueError, match="incomplètes"):
+            binary_to_coords(b"\x02\x00\x00\x00" + b"\x00" * 8)
+        with pytest.raises(ValueError, match="triangles"):
+            binary_to_triangle_buffers(b"\x00" * 4 + b"\x01\x00\x00\x00")
+
+
+class TestSerialisationStream:
+
+    def test_stream_matches_triangles_to_binary(self):
+        points = [(float(i), float(-i)) for i in range(100)]
+        triangles = [(i, i + 1, i + 2) for i in range(98)]
+
+        blocs = list(iter_triangles_binary(points, triangles, taille_bloc=64))
+
+        assert b"".join(blocs) == triangles_to_binary(points, triangles)
+        assert max(len(b) for b in blocs) <= 64
+
+    def test_stream_empty(self):
+        data = b"".join(iter_triangles_binary([], []))
+        assert data == triangles_to_binary([], [])
+
+    def test_stream_from_buffers(self):
+        points = [(float(i), float(-i)) for i in range(100)]
+        triangles = [(i, i + 1, i + 2) for i in range(98)]
+        data = triangles_to_binary(points, triangles)
+        coords, indices = binary_to_triangle_buffers(data)
+
+        blocs = list(iter_triangle_buffers_binary(coords, indices,
+                                                  taille_bloc=64))
+
+        assert b"".join(blocs) == data
+        assert max(len(b) for b in blocs) <= 64
+
+    def test_typed_buffers(self):
+        coords, indices = binary_to_triangle_buffers(
+            triangles_to_binary([(0, 0), (1, 0), (0, 1)], [(0, 1, 2)])
+        )
+        assert typed_triangle_buffers(coords, indices) == (coords, indices)
+
+        coords, indices = typed_triangle_buffers([0.0, 0.0, 1.0, 0.0],
+                                                 [0, 1, 1])
+        assert (coords.typecode, indices.typecode) == ("f", "I")
+
+        for coords, indices in (([0.0], []), ([], [0, 1]), ([], [0, 1, -1]),
+                                ([], [0, 1, 2 ** 40]), (["x", 0.0], [])):
+            with pytest.raises(ValueError):
+                typed_triangle_buffers(coords, indices)
+
+    def test_pack_pointset_into(self):
+        data = pointset_to_binary([(0.5, 1.5), (2.0, -1.0)])
+        tampon = bytearray(64)
+        assert pack_pointset_into(tampon, binary_to_coords(data)) == len(data)
+        assert bytes(tampon[:len(data)]) == data
+
+    def test_binary_size(self):
+        points = [(0, 0), (1, 0), (0, 1)]
+        triangles = [(0, 1, 2)]
+        data = triangles_to_binary(points, triangles)
+        assert triangles_binary_size(3, 1) == len(data)
+
+
+class TestSerialisationReadStream:
+
+    def test_read_stream_small_blocks(self):
+        points = [(float(i), 0.5) for i in range(50)]
+        flux = io.BytesIO(pointset_to_binary(points))
+
+        coords = read_pointset_stream(flux, taille_bloc=24)
+
+        assert list(coords) == [v for p in points for v in p]
+
+    def test_read_stream_too_many_points(self):
+        # 50M points annoncés, aucun octet de coordonnées envoyé
+        flux = io.BytesIO((50_000_000).to_bytes(4, "little"))
+        with pytest.raises(PointSetTooLargeError):
+            read_pointset_stream(flux, max_points=1000)
+
+    def test_read_stream_too_many_bytes(self):
+        flux = io.BytesIO(pointset_to_binary([(0, 0), (1, 1)]))
+        with pytest.raises(PointSetTooLargeError):
+            read_pointset_stream(flux, max_bytes=12)
+
+    def test_read_stream_truncated(self):
+        data = pointset_to_binary([(0, 0), (1, 1)])
+        with pytest.raises(ValueError, match="incomplètes"):
+            read_pointset_stream(io.BytesIO(data[:-3]))
+        with pytest.raises(ValueError, match="trop courtes"):
+            read_pointset_stream(io.BytesIO(b"\x01"))
+
+
+class TestSerialisationFrames:
+
+    def test_frames_roundtrip(self):
+        triangles = triangles_to_binary([(0, 0), (1, 0), (0, 1)], [(0, 1, 2)])
+        data = (
+            frame_to_binary("a", 200, triangles)
+            + frame_to_binary("pointset-é", 503, "Erreur PSM".encode("utf-8"))
+        )
+
+        assert binary_to_frames(data) == [
+            ("a", 200, triangles),
+            ("pointset-é", 503, "Erreur PSM".encode("utf-8")),
+        ]
+
+    def test_frame_header_then_payload(self):
+        assert (frame_header("x", 200, 3) + b"abc"
+                == frame_to_binary("x", 200, b"abc"))
+
+    def test_frames_truncated(self):
+        data = frame_to_binary("a", 200, b"abcdef")
+        for coupe in (1, 4, len(data) - 1):
+            with pytest.raises(ValueError, match="tronquée"):
+                binary_to_frames(data[:coupe])
+
+
+class TestSerialisationLocations:
+
+    def test_locations_roundtrip(self):
+        data = locations_to_binary(array("i", [3, -1, 0]))
+        assert len(data) == 4 + 3 * 4
+        assert list(binary_to_locations(data)) == [3, -1, 0]
+        assert locations_to_binary([3, -1, 0]) == data
+
+    def test_locations_truncated(self):
+        with pytest.raises(ValueError):
+            binary_to_locations(locations_to_binary([1, 2])[:-1])
+
+
+def normaliser(triangles):
+    """Triangles comparables : rotation commençant au plus petit indice."""
+    resultat = []
+    for t in triangles:
+        k = t.index(min(t))
+        resultat.append(tuple(t[k:]) + tuple(t[:k]))
+    return sorted(resultat)
+
+
+class TestSerialisationCompact:
+
+    # Carré 4 x 4 triangulé en damier : 18 triangles
+    POINTS = [(float(i), float(j)) for j in range(4) for i in range(4)]
+    TRIANGLES = [
+        t for j in range(3) for i in range(3)
+        for t in ((4 * j + i, 4 * j + i + 1, 4 * j + i + 5),
+                  (4 * j + i, 4 * j + i + 5, 4 * j + i + 4))
+    ]
+
+    def buffers(self):
+        coords = array("f", [v for p in self.POINTS for v in p])
+        indices = array("I", [i for t in self.TRIANGLES for i in t])
+        return coords, indices
+
+    @pytest.mark.parametrize("indices_format", ["uint32", "uint16", "varint"])
+    def test_roundtrip_same_order(self, indices_format):
+        data = triangle_buffers_to_compact_binary(*self.buffers(),
+                                                  indices_format)
+        points, triangles = binary_to_triangles(data, indices_format)
+        assert points == self.POINTS
+        assert triangles == self.TRIANGLES
+
+    def test_strip_roundtrip(self):
+        data = triangle_buffers_to_compact_binary(*self.buffers(), "strip")
+        points, triangles = binary_to_triangles(data, "strip")
+        assert points == self.POINTS
+        assert normaliser(triangles) == normaliser(self.TRIANGLES)
+
+    def test_uint32_is_default_format(self):
+        assert (triangle_buffers_to_compact_binary(*self.buffers(), "uint32")
+                == triangles_to_binary(self.POINTS, self.TRIANGLES))
+
+    def test_sizes(self):
+        taille = {
+            f: len(triangle_buffers_to_compact_binary(*self.buffers(), f))
+            - (4 + 16 * 8 + 4)
+            for f in ("uint32", "uint16", "varint", "strip")
+        }
+        assert taille["uint32"] == 18 * 12
+        assert taille["uint16"] == 18 * 6
+        assert taille["varint"] == 18 * 3
+        assert taille["strip"] < taille["varint"]
+
+    def test_uint16_limit(self):
+        coords = array("f", bytes(8 * 0x10000))
+        with pytest.raises(ValueError):
+            triangle_buffers_to_compact_binary(coords, array("I"), "uint16")
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            triangle_buffers_to_compact_binary(*self.buffers(), "zip")
+        with pytest.raises(ValueError):
+            binary_to_triangles(b"\x00" * 8, "zip")
+
+    @pytest.mark.parametrize("indices_format", ["uint16", "varint", "strip"])
+    def test_truncated(self, indices_format):
+        data = triangle_buffers_to_compact_binary(*self.buffers(),
+                                                  indices_format)
+        for coupe in (4 + 16 * 8 + 2, len(data) - 1):
+            with pytest.raises(ValueError):
+                binary_to_triangles(data[:coupe], indices_format)
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from triangulator.singleflight import SingleFlight
+
+
+def lancer(n, cible):
+    """Lance n threads sur `cible` et attend leur fin."""
+    threads = [threading.Thread(target=cible) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_result(self):
+        sf = SingleFlight()
+        appels = []
+        resultats = []
+
+        def travail():
+            appels.append(1)
+            time.sleep(0.1)
+            return 42
+
+        lancer(8, lambda: resultats.append(sf.do("cle", travail)))
+
+        assert len(appels) == 1
+        assert [r for r, _ in resultats] == [42] * 8
+        assert sum(partage for _, partage in resultats) == 7
+        assert sf.in_flight() == 0
+
+    def test_error_propagates_to_all_waiters(self):
+        sf = SingleFlight()
+        erreurs = []
+
+        def travail():
+            time.sleep(0.1)
+            raise ValueError("échec")
+
+        def appelant():
+            try:
+                sf.do("cle", travail)
+            except ValueError as e:
+                erreurs.append(e)
+
+        lancer(5, appelant)
+        assert len(erreurs) == 5
+
+    def test_sequential_calls_rerun(self):
+        sf = SingleFlight()
+        assert sf.do("cle", lambda: 1) == (1, False)
+        assert sf.do("cle", lambda: 2) == (2, False)
+
+        with pytest.raises(KeyError):
+            sf.do("autre", lambda: {}["absent"])
+        assert sf.in_flight() == 0
@@ -0,0 +1,44 @@
+import random
+
+from triangulator.delaunay import delaunay_triangulation
+from triangulator.strips import stripify, unstrip
+
+
+def normaliser(triangles):
+    """Triangles comparables : rotation commençant au plus petit indice."""
+    resultat = []
+    for t in triangles:
+        k = t.index(min(t))
+        resultat.append(tuple(t[k:]) + tuple(t[:k]))
+    return sorted(resultat)
+
+
+def a_plat(triangles):
+    return [i for t in triangles for i in t]
+
+
+class TestStripify:
+
+    def test_empty(self):
+        assert stripify([]) == []
+        assert unstrip([]) == []
+
+    def test_single_triangle(self):
+        assert stripify([0, 1, 2]) == [[0, 1, 2]]
+
+    def test_square_is_one_strip(self):
+        triangles = [(0, 1, 2), (0, 2, 3)]
+        bandes = stripify(a_plat(triangles))
+        assert len(bandes) == 1 and len(bandes[0]) == 4
+        assert normaliser(unstrip(bandes)) == normaliser(triangles)
+
+    def test_delaunay_mesh_covered_once_same_orientation(self):
+        random.seed(25)
+        points = [(random.random(), random.random()) for _ in range(2000)]
+        triangles = delaunay_triangulation(points)
+
+        bandes = stripify(a_plat(triangles))
+
+        assert normaliser(unstrip(bandes)) == normaliser(triangles)
+        # Moins de 2 indices par triangle (3 sans bandes)
+        assert sum(map(len, bandes)) < 2 * len(triangles)
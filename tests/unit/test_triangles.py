@@ -1,6 +1,8 @@
+from triangulator.mesh import PointSet, TriangleMesh
 from triangulator.triangles import (
     triangle_area,
     are_points_collinear,
+    validate_triangle_buffers,
     validate_triangle_indices,
     validate_triangulation,
 )
@@ -25,3 +27,67 @@ class TestTrianglesReal:
         pts = [(0,0), (1,0), (0,1)]
         tris = [(0,1,2)]
         assert validate_triangulation(pts, tris) is True
+
+    def test_validate_triangulation_failures(self):
+        pts = [(0,0), (1,0), (0,1), (2,0)]
+        assert validate_triangulation(pts, [(0,1,5)]) is False
+        assert validate_triangulation(pts, [(0,1,1)]) is False
+        assert validate_triangulation(pts, [(0,1,3)]) is False  # alignés
+
+    def test_validate_triangulation_mesh(self):
+        ps = PointSet.from_points([(0,0), (1,0), (1,1), (0,1)])
+        mesh = TriangleMesh.from_triangles(ps, [(0,1,2), (0,2,3)])
+        assert validate_triangulation(ps, mesh) is True
+
+
+class TestValidationReport:
+
+    COORDS = [0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 1.0, 2.0, 0.0]
+
+    def test_valid_mesh(self):
+        rapport = validate_triangle_buffers(self.COORDS, [0, 1, 2, 0, 2, 3])
+        assert rapport.valid
+        assert rapport.orientation == 1
+        assert rapport.nb_triangles == 2
+
+    def test_each_check(self):
+        indices = [
+            0, 1, 2,   # 0 : correct
+            0, 2, 3,   # 1 : correct
+            2, 3, 0,   # 2 : doublon de 1 (rotation)
+            0, 3, 2,   # 3 : doublon de 1, orientation inversée
+            0, 0, 1,   # 4 : indice répété (donc dégénéré)
+            0, 1, 4,   # 5 : points alignés
+            0, 1, 9,   # 6 : hors bornes
+        ]
+        rapport = validate_triangle_buffers(self.COORDS, indices)
+        assert not rapport.valid
+        assert rapport.out_of_bounds == [6]
+        assert rapport.repeated_indices == [4]
+        assert rapport.degenerate == [4, 5]
+        assert rapport.orientation == 1
+        assert rapport.flipped == [3]
+        assert rapport.duplicates == [2, 3]
+
+    def test_clockwise_majority(self):
+        indices = [0, 2, 1, 0, 3, 2, 0, 1, 2]
+        rapport = validate_triangle_buffers(self.COORDS, indices)
+        assert rapport.orientation == -1
+        assert rapport.flipped == [2]
+
+    def test_to_dict(self):
+        rapport = validate_triangle_buffers(self.COORDS, [0, 1, 9])
+        d = rapport.to_dict()
+        assert d["valid"] is False
+        assert d["out_of_bounds"] == [0]
+
+    def test_empty(self):
+        assert validate_triangle_buffers(self.COORDS, []).valid
+
+    def test_near_flat_is_exact(self):
+        coords = [0.5, 0.5, 12.0, 12.0, 24.0, 24.0,
+                  0.5 + 2.0 ** -53, 0.5]
+        rapport = validate_triangle_buffers(coords, [0, 1, 2, 3, 1, 2],
+                                            epsilon=0.0)
+        assert rapport.degenerate == [0]
+        assert rapport.orientation == -1
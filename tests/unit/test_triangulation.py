@@ -1,3 +1,5 @@
+import pytest
+
 from triangulator.triangulation import (
     simple_triangulation,
     bounding_triangle,
@@ -17,6 +19,16 @@ class TestTriangulationReal:
         tris = simple_triangulation(points)
         assert tris == []  # aucun triangle possible
 
+    def test_collinear_not_consecutive(self):
+        points = [(0,0), (2,0), (1,0), (3,0)]
+        for method in ("ear_clipping", "earcut", "delaunay"):
+            assert simple_triangulation(points, method=method) == []
+
+    def test_convex_fan(self):
+        points = [(0,0), (2,0), (3,1), (2,2), (0,2)]
+        tris = simple_triangulation(points)
+        assert tris == [(0,1,2), (0,2,3), (0,3,4)]
+
     def test_square(self):
         points = [(0,0), (1,0), (1,1), (0,1)]
         tris = simple_triangulation(points)
@@ -33,3 +45,26 @@ class TestTriangulationReal:
         assert isinstance(a, tuple)
         assert isinstance(b, tuple)
         assert isinstance(c, tuple)
+
+    def test_delaunay_method(self):
+        points = [(0,0), (1,0), (1,1), (0,1), (0.5,0.4)]
+        tris = simple_triangulation(points, method="delaunay")
+        assert len(tris) == 4
+
+    def test_delaunay_parallel_method(self):
+        points = [(0,0), (1,0), (1,1), (0,1), (0.5,0.4)]
+        tris = simple_triangulation(points, method="delaunay_parallel")
+        assert len(tris) == 4
+
+    def test_delaunay_parallel_collinear(self):
+        points = [(0,0), (1,1), (2,2)]
+        assert simple_triangulation(points, method="delaunay_parallel") == []
+
+    def test_earcut_method(self):
+        points = [(0,0), (2,0), (1,1), (2,2), (0,2)]
+        tris = simple_triangulation(points, method="earcut")
+        assert len(tris) == 3
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            simple_triangulation([(0,0), (1,0), (0,1)], method="inconnue")